@@ -0,0 +1,116 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Tryb kompilacji w tle - niski priorytet dla hostów obsługujących ruch produkcyjny
+"""
+import os
+import shutil
+import subprocess
+from typing import List, Optional
+
+from hardware_detector import HardwareDetector
+from logger_config import get_logger
+
+
+# Część rdzeni i pamięci dostępna dla kompilacji w tle
+BACKGROUND_CPU_SHARE = 0.5
+BACKGROUND_MEMORY_SHARE = 0.5
+
+# Nowe zadania startują tylko, gdy obciążenie hosta jest niższe niż ta część rdzeni
+BACKGROUND_LOAD_SHARE = 0.75
+
+
+class BackgroundBuildPolicy:
+    """Klasa opakowująca kompilację w nice/ionice i przejściową grupę cgroup systemd"""
+
+    def __init__(self, cores: Optional[int] = None, detector: HardwareDetector = None):
+        self.logger = get_logger()
+        self.detector = detector or HardwareDetector()
+        self.cores = cores or os.cpu_count() or 1
+        self._scope_command = None
+
+    def get_jobs(self) -> int:
+        """Ograniczona liczba równoległych zadań kompilacji"""
+        return max(1, int(self.cores * BACKGROUND_CPU_SHARE))
+
+    def get_load_limit(self) -> float:
+        """Limit obciążenia dla make/ninja -l (nowe zadania czekają przy wyższym load average)"""
+        logical_cores = os.cpu_count() or 1
+        return max(1.0, round(logical_cores * BACKGROUND_LOAD_SHARE, 1))
+
+    def get_native_tool_args(self) -> List[str]:
+        """Argumenty dla make/ninja po 'cmake --build ... --' (oba rozumieją -l)"""
+        return ['-l', str(self.get_load_limit())]
+
+    def _get_memory_limit(self) -> str:
+        """Limit pamięci dla cgroup, np. '3072M' (część limitu kontenera, jeśli jest niższy niż RAM)"""
+        limit_mb = int(self.detector.get_memory_status()['total'] * BACKGROUND_MEMORY_SHARE / 1024**2)
+        return f"{limit_mb}M"
+
+    def _find_scope_command(self) -> List[str]:
+        """
+        Zwraca prefiks systemd-run tworzący przejściowy scope z limitami CPU i pamięci
+
+        Root używa menedżera systemowego, zwykły użytkownik - sesji --user.
+        Pusta lista, gdy systemd-run nie jest dostępny lub nie działa.
+        """
+        if self._scope_command is not None:
+            return self._scope_command
+
+        self._scope_command = []
+        if not shutil.which('systemd-run'):
+            return self._scope_command
+
+        scope = ['systemd-run', '--scope', '--quiet', '--collect']
+        if os.geteuid() != 0:
+            scope.insert(1, '--user')
+        try:
+            result = subprocess.run(scope + ['--', 'true'], capture_output=True, text=True, timeout=15)
+        except Exception as e:
+            self.logger.debug(f"systemd-run niedostępny: {e}")
+            return self._scope_command
+
+        if result.returncode == 0:
+            self._scope_command = scope + [
+                '-p', f'CPUQuota={self.get_jobs() * 100}%',
+                '-p', f'MemoryMax={self._get_memory_limit()}',
+                '-p', 'IOWeight=10',
+                '--',
+            ]
+        else:
+            self.logger.debug(f"systemd-run --scope nie działa: {result.stderr.strip()}")
+        return self._scope_command
+
+    def wrap_command(self, cmd: List[str]) -> List[str]:
+        """Dodaje do polecenia prefiksy cgroup, ionice i nice (dziedziczone przez kompilatory)"""
+        prefix = list(self._find_scope_command())
+        if shutil.which('ionice'):
+            prefix += ['ionice', '-c', '3']
+        if shutil.which('nice'):
+            prefix += ['nice', '-n', '19']
+        return prefix + cmd
+
+    def describe(self) -> str:
+        """Opis zastosowanych ograniczeń do wyświetlenia użytkownikowi"""
+        parts = [f"-j {self.get_jobs()}", f"load average < {self.get_load_limit()}"]
+        if shutil.which('nice'):
+            parts.append("nice 19")
+        if shutil.which('ionice'):
+            parts.append("ionice idle")
+        if self._find_scope_command():
+            parts.append(f"cgroup: CPU {self.get_jobs() * 100}%, RAM {self._get_memory_limit()}")
+        return ', '.join(parts)
+
+
+if __name__ == "__main__":
+    policy = BackgroundBuildPolicy()
+    print("=== Kompilacja w tle ===")
+    print(f"Ograniczenia: {policy.describe()}")
+    print(f"Polecenie: {' '.join(policy.wrap_command(['cmake', '--build', 'build', '-j', str(policy.get_jobs())] + ['--'] + policy.get_native_tool_args()))}")
@@ -0,0 +1,129 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Historia kompilacji - porównywanie czasów między kolejnymi buildami
+"""
+import json
+import os
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logger_config import get_logger
+
+
+# Katalog danych instalatora (można zmienić zmienną środowiskową)
+DATA_DIR = Path(os.environ.get('LLAMACPP_INSTALLER_HOME', Path.home() / ".llamacpp_installer"))
+HISTORY_FILE = "build_history.json"
+MAX_ENTRIES = 100
+MAX_STAGE_SAMPLES = 5  # Ostatnie czasy etapu brane do mediany
+
+
+class BuildHistory:
+    """Klasa przechowująca wyniki kompilacji i preferencje dla klas sprzętu"""
+
+    def __init__(self, path: Path = None):
+        self.logger = get_logger()
+        self.path = Path(path) if path else DATA_DIR / HISTORY_FILE
+
+    def _load(self) -> Dict[str, any]:
+        """Wczytuje historię (pusta struktura, gdy plik nie istnieje lub jest uszkodzony)"""
+        try:
+            data = json.loads(self.path.read_text())
+            if isinstance(data, dict):
+                data.setdefault('builds', [])
+                data.setdefault('preferences', {})
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Nie można wczytać historii kompilacji {self.path}: {e}")
+        return {'builds': [], 'preferences': {}}
+
+    def _save(self, data: Dict[str, any]):
+        """Zapisuje historię atomowo (plik tymczasowy + rename)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+            temp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"Nie można zapisać historii kompilacji {self.path}: {e}")
+
+    def record_build(self, entry: Dict[str, any]):
+        """Dopisuje wynik kompilacji (najstarsze wpisy są usuwane)"""
+        data = self._load()
+        entry = dict(entry)
+        entry.setdefault('timestamp', datetime.now().isoformat(timespec='seconds'))
+        data['builds'] = (data['builds'] + [entry])[-MAX_ENTRIES:]
+        self._save(data)
+
+    def get_builds(self, **match) -> List[Dict[str, any]]:
+        """Zwraca wpisy (od najstarszego), których pola są równe podanym wartościom"""
+        return [
+            build for build in self._load()['builds']
+            if all(build.get(key) == value for key, value in match.items())
+        ]
+
+    def find_previous(self, **match) -> Optional[Dict[str, any]]:
+        """Zwraca najnowszy wpis pasujący do kryteriów"""
+        builds = self.get_builds(**match)
+        return builds[-1] if builds else None
+
+    def record_stage_time(self, hardware_type: str, cores: int, stage: str, seconds: float):
+        """Zapisuje czas etapu instalacji dla profilu i liczby rdzeni"""
+        data = self._load()
+        key = f"{hardware_type}/{cores}"
+        times = data.setdefault('stage_times', {}).setdefault(key, {})
+        times[stage] = (times.get(stage, []) + [round(seconds, 2)])[-MAX_STAGE_SAMPLES:]
+        self._save(data)
+
+    def get_stage_times(self, hardware_type: str, cores: int) -> Dict[str, Tuple[float, int]]:
+        """
+        Mediany czasów etapów dla profilu
+
+        Returns:
+            Słownik etap -> (sekundy, liczba rdzeni pomiaru); pomiary dla tej samej
+            liczby rdzeni mają pierwszeństwo przed najbliższą inną liczbą rdzeni
+        """
+        stage_times = self._load().get('stage_times', {})
+        measured = []
+        for key, times in stage_times.items():
+            profile, _, key_cores = key.rpartition('/')
+            if profile == hardware_type and key_cores.isdigit():
+                measured.append((abs(int(key_cores) - cores), int(key_cores), times))
+
+        result = {}
+        for _, key_cores, times in sorted(measured, key=lambda item: item[0]):
+            for stage, samples in times.items():
+                if stage not in result and samples:
+                    result[stage] = (statistics.median(samples), key_cores)
+        return result
+
+    def get_preference(self, hardware_class: str, key: str) -> Optional[any]:
+        """Zwraca zapamiętaną preferencję dla klasy sprzętu"""
+        return self._load()['preferences'].get(hardware_class, {}).get(key)
+
+    def set_preference(self, hardware_class: str, key: str, value: any):
+        """Zapamiętuje preferencję dla klasy sprzętu"""
+        data = self._load()
+        data['preferences'].setdefault(hardware_class, {})[key] = value
+        self._save(data)
+
+
+if __name__ == "__main__":
+    history = BuildHistory()
+    print(f"=== Historia kompilacji: {history.path} ===")
+    for build in history.get_builds()[-10:]:
+        print(f"  {build.get('timestamp')} {build.get('hardware_type')}: "
+              f"build {build.get('build_seconds')} s, link {build.get('link_seconds')} s "
+              f"({build.get('linker')})")
+    print(f"Preferencje: {history._load()['preferences']}")
@@ -0,0 +1,206 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Wybór lokalizacji drzewa kompilacji na podstawie szybkości zapisu i wolnego miejsca
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from logger_config import get_logger
+
+
+# Szacowany rozmiar drzewa kompilacji llama.cpp (obiekty, testy, biblioteki)
+BUILD_TREE_SIZE_GB = 2.0
+
+# Pamięć, która musi zostać wolna przy kompilacji w tmpfs
+RAM_RESERVE_GB = 1.5
+
+# Punkty montowania nośników zewnętrznych (np. dysk SSD na USB)
+EXTERNAL_MOUNT_PREFIXES = ('/media/', '/run/media/', '/mnt/')
+
+SEQUENTIAL_PROBE_MB = 32
+RANDOM_PROBE_WRITES = 256
+RANDOM_PROBE_BLOCK = 4096
+RANDOM_PROBE_FILE_MB = 16
+
+# Lokalizacja musi być wyraźnie szybsza od katalogu instalacji, żeby ją wybrać
+MIN_SPEEDUP = 1.5
+
+
+class BuildLocationPlanner:
+    """Klasa mierząca szybkość zapisu lokalizacji i wybierająca miejsce kompilacji"""
+
+    def __init__(self, install_dir: Path, mounts_path: str = '/proc/mounts'):
+        self.logger = get_logger()
+        self.install_dir = Path(install_dir)
+        self.mounts_path = mounts_path
+
+    def _read_mounts(self) -> List[Dict[str, str]]:
+        """Zwraca punkty montowania: device, mountpoint, fstype"""
+        mounts = []
+        try:
+            with open(self.mounts_path, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 3:
+                        # Spacje w ścieżkach są kodowane jako \040
+                        mounts.append({
+                            'device': parts[0],
+                            'mountpoint': parts[1].replace('\\040', ' '),
+                            'fstype': parts[2],
+                        })
+        except Exception as e:
+            self.logger.debug(f"Nie można odczytać {self.mounts_path}: {e}")
+        return mounts
+
+    def _get_fstype(self, path: Path) -> str:
+        """Zwraca typ systemu plików dla ścieżki (najdłuższy pasujący punkt montowania)"""
+        path = str(Path(path).resolve())
+        best = ('', '')
+        for mount in self._read_mounts():
+            mountpoint = mount['mountpoint'].rstrip('/') or '/'
+            if (path == mountpoint or path.startswith(mountpoint.rstrip('/') + '/')) and len(mountpoint) > len(best[0]):
+                best = (mountpoint, mount['fstype'])
+        return best[1]
+
+    def get_candidates(self) -> List[Path]:
+        """Lista kandydatów: katalog instalacji, /tmp, /dev/shm i nośniki zewnętrzne"""
+        candidates = [self.install_dir, Path(tempfile.gettempdir()), Path('/dev/shm')]
+        for mount in self._read_mounts():
+            if mount['mountpoint'].startswith(EXTERNAL_MOUNT_PREFIXES):
+                candidates.append(Path(mount['mountpoint']))
+
+        result = []
+        seen = set()
+        for candidate in candidates:
+            if candidate.is_dir() and os.access(str(candidate), os.W_OK) and candidate.resolve() not in seen:
+                seen.add(candidate.resolve())
+                result.append(candidate)
+        return result
+
+    def probe_write_speed(self, path: Path) -> Optional[Dict[str, float]]:
+        """
+        Mierzy zapis sekwencyjny (MB/s) i losowy blokami 4 KB (MB/s) z fsync
+
+        Returns:
+            Słownik z kluczami 'sequential_mbps', 'random_mbps' lub None przy błędzie
+        """
+        block = os.urandom(1024 * 1024)
+        try:
+            with tempfile.TemporaryDirectory(dir=str(path), prefix='.llamacpp-probe-') as probe_dir:
+                probe_file = Path(probe_dir) / "probe.bin"
+
+                start = time.perf_counter()
+                with open(probe_file, 'wb') as f:
+                    for _ in range(SEQUENTIAL_PROBE_MB):
+                        f.write(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+                sequential_seconds = time.perf_counter() - start
+
+                small_block = block[:RANDOM_PROBE_BLOCK]
+                max_offset = RANDOM_PROBE_FILE_MB * 1024 * 1024 - RANDOM_PROBE_BLOCK
+                start = time.perf_counter()
+                with open(probe_file, 'r+b') as f:
+                    for _ in range(RANDOM_PROBE_WRITES):
+                        f.seek(random.randrange(0, max_offset, RANDOM_PROBE_BLOCK))
+                        f.write(small_block)
+                    f.flush()
+                    os.fsync(f.fileno())
+                random_seconds = time.perf_counter() - start
+        except Exception as e:
+            self.logger.debug(f"Test zapisu w {path} nie powiódł się: {e}")
+            return None
+
+        random_mb = RANDOM_PROBE_WRITES * RANDOM_PROBE_BLOCK / (1024 * 1024)
+        return {
+            'sequential_mbps': SEQUENTIAL_PROBE_MB / max(sequential_seconds, 1e-6),
+            'random_mbps': random_mb / max(random_seconds, 1e-6),
+        }
+
+    def evaluate(self, path: Path) -> Dict[str, any]:
+        """Ocenia lokalizację: szybkość zapisu, wolne miejsce i (dla tmpfs) wolną pamięć"""
+        fstype = self._get_fstype(path)
+        tmpfs = fstype in ('tmpfs', 'ramfs')
+        free_gb = shutil.disk_usage(str(path)).free / 1024**3
+        available_ram_gb = psutil.virtual_memory().available / 1024**3
+
+        fits = free_gb >= BUILD_TREE_SIZE_GB
+        reason = '' if fits else f"za mało miejsca ({free_gb:.1f} GB)"
+        if fits and tmpfs and available_ram_gb - BUILD_TREE_SIZE_GB < RAM_RESERVE_GB:
+            fits = False
+            reason = f"za mało wolnej pamięci dla tmpfs ({available_ram_gb:.1f} GB)"
+
+        speed = self.probe_write_speed(path) if fits else None
+        if fits and speed is None:
+            fits = False
+            reason = "test zapisu nie powiódł się"
+
+        # Kompilacja zapisuje głównie małe pliki obiektowe - zapis losowy ma większą wagę
+        score = 0.3 * speed['sequential_mbps'] + 0.7 * speed['random_mbps'] if speed else 0.0
+
+        result = {
+            'path': path,
+            'fstype': fstype,
+            'tmpfs': tmpfs,
+            'free_gb': round(free_gb, 1),
+            'fits': fits,
+            'reason': reason,
+            'score': score,
+        }
+        if speed:
+            result.update({key: round(value, 1) for key, value in speed.items()})
+        self.logger.debug(f"Lokalizacja kompilacji {path}: {result}")
+        return result
+
+    def plan(self) -> Dict[str, any]:
+        """
+        Wybiera najszybszą lokalizację, w której mieści się drzewo kompilacji
+
+        Returns:
+            Słownik z kluczami 'path' (wybrana lokalizacja) i 'candidates' (wyniki pomiarów)
+        """
+        candidates = [self.evaluate(path) for path in self.get_candidates()]
+        fitting = [candidate for candidate in candidates if candidate['fits']]
+
+        install = next((candidate for candidate in candidates if candidate['path'] == self.install_dir), None)
+        best = max(fitting, key=lambda candidate: candidate['score']) if fitting else None
+
+        chosen = self.install_dir
+        if best and (install is None or not install['fits']
+                     or best['score'] >= install['score'] * MIN_SPEEDUP):
+            chosen = best['path']
+
+        self.logger.info(f"Wybrana lokalizacja kompilacji: {chosen}")
+        return {'path': chosen, 'candidates': candidates}
+
+
+if __name__ == "__main__":
+    import sys
+
+    install_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    plan = BuildLocationPlanner(install_dir).plan()
+
+    print(f"=== Lokalizacje kompilacji (wymagane {BUILD_TREE_SIZE_GB} GB) ===")
+    for candidate in plan['candidates']:
+        if candidate['fits']:
+            print(f"  {candidate['path']} ({candidate['fstype']}): "
+                  f"sekwencyjnie {candidate['sequential_mbps']} MB/s, "
+                  f"losowo {candidate['random_mbps']} MB/s, wolne {candidate['free_gb']} GB")
+        else:
+            print(f"  {candidate['path']} ({candidate['fstype']}): pominięto - {candidate['reason']}")
+    print(f"Wybrano: {plan['path']}")
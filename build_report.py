@@ -0,0 +1,420 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Raport kompilacji - najwolniejsze pliki, ścieżka krytyczna i równoległość z .ninja_log lub launcherów czasu
+"""
+import bisect
+import json
+import re
+import shutil
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_trace import read_ninja_log, OBJECT_SUFFIXES
+from logger_config import get_logger
+from optimization_configs import OptimizationConfigs
+from toolchain import LINK_TIMES_FILE, COMPILE_TIMES_FILE, read_link_intervals, read_compile_intervals
+
+
+NINJA_LOG_FILE = ".ninja_log"
+
+# Profil buildu (flagi CMAKE, kompilator, linker) zapisany po kompilacji
+PROFILE_FILE = ".build_profile.json"
+
+# Pliki przenoszone razem z programami, gdy kompilacja odbywa się poza katalogiem instalacji
+TIMING_FILES = (NINJA_LOG_FILE, COMPILE_TIMES_FILE, LINK_TIMES_FILE, PROFILE_FILE)
+
+DEFAULT_TOP = 15
+
+# Tolerancja (s) przy szukaniu zadania, na które czekało następne (rozdzielczość .ninja_log to 1 ms)
+SCHEDULE_TOLERANCE = 0.005
+
+# Domyślne poziomy optymalizacji CMake dla typów buildu (gdy flagi nie zawierają -O)
+DEFAULT_OPT_LEVELS = {'release': '-O3', 'relwithdebinfo': '-O2', 'minsizerel': '-Os', 'debug': '-O0'}
+
+# Obiekty CMake leżą w <katalog>/CMakeFiles/<cel>.dir/, biblioteki to lib<cel>.so[.wersja] lub lib<cel>.a
+TARGET_PATTERN = re.compile(r'CMakeFiles/([^/]+)\.dir/')
+LIBRARY_PATTERN = re.compile(r'^lib(.+?)\.(?:so(?:\.\d+)*|a|dylib)$')
+OPT_LEVEL_PATTERN = re.compile(r'(?:^|\s)(-O[0-3sgz]|-Ofast)(?=\s|$)')
+
+# Wpisy CMakeCache.txt opisujące profil (dla buildów bez PROFILE_FILE)
+CACHE_PROFILE_OPTIONS = (
+    'CMAKE_BUILD_TYPE', 'CMAKE_C_COMPILER', 'CMAKE_C_FLAGS', 'CMAKE_CXX_FLAGS',
+    'CMAKE_C_FLAGS_RELEASE', 'CMAKE_CXX_FLAGS_RELEASE', 'GGML_LTO', 'CMAKE_INTERPROCEDURAL_OPTIMIZATION',
+    'GGML_NATIVE', 'CMAKE_UNITY_BUILD', 'CMAKE_GENERATOR',
+)
+
+# Węzły 'ninja -t graph': "0x..." [label="ścieżka"] oraz krawędzie "0x..." -> "0x..."
+GRAPH_NODE_PATTERN = re.compile(r'^"([^"]+)" \[label="((?:[^"\\]|\\.)*)"(, shape=ellipse)?\]')
+GRAPH_EDGE_PATTERN = re.compile(r'^"([^"]+)" -> "([^"]+)"')
+
+
+def write_build_profile(build_dir: Path, cmake_flags: List[str], toolchain_info: Dict[str, any],
+                        hardware_type: str = None) -> Optional[Path]:
+    """Zapisuje profil buildu obok .ninja_log - do porównań w 'build-report'"""
+    path = Path(build_dir) / PROFILE_FILE
+    profile = {
+        'hardware_type': hardware_type,
+        'flags': list(cmake_flags),
+        'compiler': (toolchain_info.get('compiler_name') if toolchain_info.get('compiler_name') != 'default'
+                     else toolchain_info.get('compiler')),
+        'compiler_version': toolchain_info.get('compiler_version'),
+        'linker': toolchain_info.get('linker'),
+        'lto': toolchain_info.get('lto', False),
+        'generator': toolchain_info.get('generator'),
+        'unity': toolchain_info.get('unity', False),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+    try:
+        path.write_text(json.dumps(profile, indent=2))
+    except OSError as e:
+        get_logger().warning(f"Nie można zapisać profilu buildu {path}: {e}")
+        return None
+    return path
+
+
+def read_build_profile(build_dir: Path) -> Dict[str, any]:
+    """
+    Profil buildu z PROFILE_FILE lub, dla starszych buildów, z CMakeCache.txt
+
+    Returns:
+        Słownik z co najmniej kluczem 'flags' (lista -D<opcja>=<wartość>)
+    """
+    build_dir = Path(build_dir)
+    try:
+        profile = json.loads((build_dir / PROFILE_FILE).read_text())
+        if isinstance(profile, dict) and isinstance(profile.get('flags'), list):
+            return profile
+    except (OSError, ValueError):
+        pass
+
+    flags = []
+    try:
+        lines = (build_dir / "CMakeCache.txt").read_text(errors='replace').splitlines()
+    except OSError:
+        return {'flags': flags}
+    for line in lines:
+        key, separator, value = line.partition('=')
+        option = key.split(':')[0]
+        if separator and option in CACHE_PROFILE_OPTIONS and value:
+            flags.append(f'-D{option}={value}')
+    compiler = OptimizationConfigs.get_option(flags, 'CMAKE_C_COMPILER')
+    return {
+        'flags': flags,
+        'compiler': Path(compiler).name if compiler else None,
+        'generator': OptimizationConfigs.get_option(flags, 'CMAKE_GENERATOR'),
+    }
+
+
+def describe_profile(profile: Dict[str, any]) -> str:
+    """Krótki opis profilu, np. 'gcc 12.2, Release -O3, LTO, native'"""
+    flags = profile.get('flags', [])
+    parts = []
+    if profile.get('compiler') and profile['compiler'] != 'default':
+        compiler = profile['compiler']
+        if profile.get('compiler_version'):
+            compiler += f" {profile['compiler_version']}"
+        parts.append(compiler)
+
+    build_type = OptimizationConfigs.get_option(flags, 'CMAKE_BUILD_TYPE') or ''
+    opt_level = None
+    for option in ('CMAKE_C_FLAGS', 'CMAKE_CXX_FLAGS', f'CMAKE_C_FLAGS_{build_type.upper()}'):
+        matches = OPT_LEVEL_PATTERN.findall(OptimizationConfigs.get_option(flags, option) or '')
+        if matches:
+            opt_level = matches[-1]
+    opt_level = opt_level or DEFAULT_OPT_LEVELS.get(build_type.lower())
+    parts.append(' '.join(part for part in (build_type, opt_level) if part) or 'domyślny typ buildu')
+
+    # Krok zapasowy 'lto' dopisuje GGML_LTO=OFF na koniec flag - flagi mają pierwszeństwo
+    lto_option = OptimizationConfigs.get_option(flags, 'GGML_LTO')
+    lto = lto_option == 'ON' if lto_option is not None else bool(profile.get('lto'))
+    lto = lto or OptimizationConfigs.get_option(flags, 'CMAKE_INTERPROCEDURAL_OPTIMIZATION') == 'ON'
+    parts.append('LTO' if lto else 'bez LTO')
+
+    march = re.search(r'-m(?:arch|cpu)=(\S+)', ' '.join(flags))
+    if march:
+        parts.append(march.group(1))
+    elif OptimizationConfigs.uses_backend_variants(flags):
+        parts.append('warianty CPU')
+    elif OptimizationConfigs.uses_native(flags):
+        parts.append('native')
+    if profile.get('unity') or OptimizationConfigs.get_option(flags, 'CMAKE_UNITY_BUILD') == 'ON':
+        parts.append('unity')
+    return ', '.join(parts)
+
+
+def job_target(output: str) -> str:
+    """Cel CMake zadania: z CMakeFiles/<cel>.dir/ dla obiektów, z nazwy pliku dla programów i bibliotek"""
+    match = TARGET_PATTERN.search(output)
+    if match:
+        return match.group(1)
+    name = Path(output).name
+    match = LIBRARY_PATTERN.match(name)
+    return match.group(1) if match else name
+
+
+def read_build_jobs(build_dir: Path) -> Tuple[List[Tuple[float, float, str]], Optional[str]]:
+    """
+    Zadania ostatniej kompilacji: (start, koniec, wynik) w sekundach od jej początku
+
+    Returns:
+        (zadania, źródło) - źródło to 'ninja', 'launcher' (Makefile z launcherem czasu) lub None
+    """
+    build_dir = Path(build_dir)
+    jobs = read_ninja_log(build_dir / NINJA_LOG_FILE)
+    if jobs:
+        return sorted((start_ms / 1000.0, end_ms / 1000.0, output) for start_ms, end_ms, output in jobs), 'ninja'
+
+    intervals = read_compile_intervals(build_dir)
+    if not intervals:
+        return [], None
+    intervals += read_link_intervals(build_dir)
+    origin = min(start for start, _, _ in intervals)
+    return sorted((start - origin, end - origin, output) for start, end, output in intervals), 'launcher'
+
+
+def unique_jobs(jobs: List[Tuple[float, float, str]]) -> List[Tuple[float, float, str]]:
+    """Zadania bez powtórzeń - wiele wyników jednego zadania (np. biblioteka i jej dowiązania) ma te same czasy"""
+    unique = {}
+    for start, end, output in jobs:
+        key = (start, end) if not output.endswith(OBJECT_SUFFIXES) else (start, end, output)
+        unique.setdefault(key, (start, end, output))
+    return sorted(unique.values())
+
+
+def read_ninja_graph(build_dir: Path) -> Optional[Dict[str, List[str]]]:
+    """
+    Zależności zadań z 'ninja -t graph': wynik -> bezpośrednie wejścia
+
+    Returns:
+        Słownik zależności lub None (brak ninja, build.ninja albo błąd)
+    """
+    build_dir = Path(build_dir)
+    ninja = shutil.which('ninja')
+    if not ninja or not (build_dir / "build.ninja").exists():
+        return None
+    try:
+        result = subprocess.run([ninja, '-C', str(build_dir), '-t', 'graph'],
+                                capture_output=True, text=True, timeout=120)
+    except (OSError, subprocess.SubprocessError) as e:
+        get_logger().debug(f"Nie można odczytać grafu ninja: {e}")
+        return None
+    if result.returncode != 0:
+        get_logger().debug(f"ninja -t graph zakończone kodem {result.returncode}: {result.stderr.strip()}")
+        return None
+
+    # Zadanie z jednym wejściem i wyjściem to krawędź wejście -> wyjście,
+    # pozostałe mają własny węzeł (shape=ellipse) z krawędziami wejść i wyjść
+    labels: Dict[str, str] = {}
+    rules = set()
+    edges: List[Tuple[str, str]] = []
+    for line in result.stdout.splitlines():
+        match = GRAPH_EDGE_PATTERN.match(line)
+        if match:
+            edges.append((match.group(1), match.group(2)))
+            continue
+        match = GRAPH_NODE_PATTERN.match(line)
+        if match:
+            labels[match.group(1)] = match.group(2).replace('\\"', '"')
+            if match.group(3):
+                rules.add(match.group(1))
+
+    rule_inputs: Dict[str, List[str]] = {}
+    rule_outputs: Dict[str, List[str]] = {}
+    inputs: Dict[str, List[str]] = {}
+    for source, target in edges:
+        if target in rules:
+            rule_inputs.setdefault(target, []).append(labels.get(source, source))
+        elif source in rules:
+            rule_outputs.setdefault(source, []).append(labels.get(target, target))
+        else:
+            inputs.setdefault(labels.get(target, target), []).append(labels.get(source, source))
+    for rule, outputs in rule_outputs.items():
+        for output in outputs:
+            inputs.setdefault(output, []).extend(rule_inputs.get(rule, []))
+    return inputs
+
+
+def graph_critical_path(jobs: List[Tuple[float, float, str]],
+                        inputs: Dict[str, List[str]]) -> List[Tuple[str, float]]:
+    """Najdłuższy łańcuch zależnych zadań według grafu ninja: [(wynik, czas)] od pierwszego"""
+    durations = {output: end - start for start, end, output in jobs}
+    best: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def longest(node: str) -> float:
+        # Iteracyjnie - drzewo zależności llama.cpp bywa głębokie przez węzły phony
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in best:
+                stack.pop()
+                continue
+            pending = [dep for dep in inputs.get(current, []) if dep not in best]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            previous = max(inputs.get(current, []), key=lambda dep: best[dep][0], default=None)
+            length = best[previous][0] if previous is not None else 0.0
+            best[current] = (length + durations.get(current, 0.0), previous)
+        return best[node][0]
+
+    end_node = max(durations, key=longest, default=None)
+    path = []
+    node = end_node
+    while node is not None:
+        if node in durations:
+            path.append((node, durations[node]))
+        node = best[node][1]
+    return list(reversed(path))
+
+
+def schedule_critical_path(jobs: List[Tuple[float, float, str]]) -> List[Tuple[str, float]]:
+    """
+    Ścieżka krytyczna oszacowana z harmonogramu (bez grafu zależności)
+
+    Od zadania kończącego się najpóźniej cofamy się do zadania, które skończyło
+    się tuż przed jego startem (na nie najpewniej czekało). Przy pełnym obciążeniu
+    -j wynik jest górnym oszacowaniem - obejmuje też czekanie na wolny slot.
+    """
+    by_end = sorted(jobs, key=lambda job: job[1])
+    ends = [end for _, end, _ in by_end]
+    path = []
+    index = len(by_end) - 1
+    while index >= 0:
+        start, end, output = by_end[index]
+        path.append((output, end - start))
+        index = bisect.bisect_right(ends, start + SCHEDULE_TOLERANCE, 0, index) - 1
+    return list(reversed(path))
+
+
+class BuildReport:
+    """
+    Klasa analizująca czasy zadań zakończonej kompilacji
+
+    Dane pochodzą z .ninja_log (Ninja) albo z .compile_times i .link_times
+    zapisywanych przez launchery czasu (Makefile). Ścieżka krytyczna jest liczona
+    z grafu 'ninja -t graph', a gdy nie jest dostępny - szacowana z harmonogramu.
+    """
+
+    def __init__(self, build_dir: Path):
+        self.logger = get_logger()
+        self.build_dir = Path(build_dir)
+        self.profile = read_build_profile(self.build_dir)
+
+    def analyze(self, top: int = DEFAULT_TOP) -> Optional[Dict[str, any]]:
+        """
+        Analizuje ostatnią kompilację
+
+        Returns:
+            Słownik z wynikami lub None, gdy katalog nie zawiera czasów zadań
+        """
+        all_outputs, source = read_build_jobs(self.build_dir)
+        if not all_outputs:
+            return None
+        jobs = unique_jobs(all_outputs)
+
+        wall = max(end for _, end, _ in jobs) - min(start for start, _, _ in jobs)
+        compile_jobs = [job for job in jobs if job[2].endswith(OBJECT_SUFFIXES)]
+        compile_seconds = sum(end - start for start, end, _ in compile_jobs)
+        cpu_seconds = sum(end - start for start, end, _ in jobs)
+
+        inputs = read_ninja_graph(self.build_dir) if source == 'ninja' else None
+        if inputs:
+            critical_path, method = graph_critical_path(all_outputs, inputs), 'graph'
+        else:
+            critical_path, method = schedule_critical_path(jobs), 'schedule'
+        critical_seconds = sum(seconds for _, seconds in critical_path)
+
+        targets: Dict[str, Dict[str, any]] = {}
+        for start, end, output in jobs:
+            entry = targets.setdefault(job_target(output), {'seconds': 0.0, 'jobs': 0})
+            entry['seconds'] += end - start
+            entry['jobs'] += 1
+
+        slowest = sorted(jobs, key=lambda job: job[1] - job[0], reverse=True)[:top]
+        report = {
+            'build_dir': str(self.build_dir),
+            'profile': describe_profile(self.profile),
+            'source': source,
+            'jobs': len(jobs),
+            'compile_jobs': len(compile_jobs),
+            'wall_seconds': round(wall, 2),
+            'cpu_seconds': round(cpu_seconds, 2),
+            'compile_seconds': round(compile_seconds, 2),
+            'link_seconds': round(cpu_seconds - compile_seconds, 2),
+            'parallelism': round(cpu_seconds / wall, 2) if wall > 0 else 1.0,
+            'critical_path_seconds': round(critical_seconds, 2),
+            'critical_path_method': method,
+            'critical_path': [{'output': output, 'seconds': round(seconds, 2)} for output, seconds in critical_path],
+            # Maksymalna równoległość przy nieskończonej liczbie rdzeni
+            'parallelism_limit': round(cpu_seconds / critical_seconds, 2) if critical_seconds > 0 else None,
+            'slowest': [
+                {'output': output, 'target': job_target(output), 'seconds': round(end - start, 2),
+                 'share': round((end - start) / cpu_seconds * 100, 1) if cpu_seconds else 0.0}
+                for start, end, output in slowest
+            ],
+            'targets': [
+                {'target': name, 'seconds': round(entry['seconds'], 2), 'jobs': entry['jobs'],
+                 'share': round(entry['seconds'] / cpu_seconds * 100, 1) if cpu_seconds else 0.0}
+                for name, entry in sorted(targets.items(), key=lambda item: item[1]['seconds'], reverse=True)
+            ],
+        }
+        self.logger.debug(f"Raport kompilacji {self.build_dir}: {report['jobs']} zadań, "
+                          f"{report['wall_seconds']} s, równoległość {report['parallelism']}")
+        return report
+
+
+def find_build_dirs(install_dir: Path) -> List[Path]:
+    """Katalogi build* w <install_dir>/llama.cpp z zapisanymi czasami zadań"""
+    source_dir = Path(install_dir) / "llama.cpp"
+    if not source_dir.is_dir():
+        return []
+    return sorted(
+        path for path in source_dir.glob("build*")
+        if path.is_dir() and ((path / NINJA_LOG_FILE).exists() or (path / COMPILE_TIMES_FILE).exists())
+    )
+
+
+def preserve_timing_files(build_dir: Path, final_dir: Path):
+    """Kopiuje pliki czasów i profilu do katalogu docelowego (build poza katalogiem instalacji)"""
+    for name in TIMING_FILES:
+        source = Path(build_dir) / name
+        if source.exists():
+            shutil.copy2(str(source), str(Path(final_dir) / name))
+
+
+def compare_targets(reports: List[Dict[str, any]], count: int = 10) -> List[Tuple[str, List[Optional[float]]]]:
+    """Cele najdłużej kompilowane w którymkolwiek profilu: [(cel, [czas w kolejnych raportach])]"""
+    seconds: Dict[str, List[Optional[float]]] = {}
+    for index, report in enumerate(reports):
+        for entry in report['targets']:
+            seconds.setdefault(entry['target'], [None] * len(reports))[index] = entry['seconds']
+    ranked = sorted(seconds.items(), key=lambda item: max(value or 0.0 for value in item[1]), reverse=True)
+    return ranked[:count]
+
+
+if __name__ == "__main__":
+    import sys
+
+    directories = [Path(arg) for arg in sys.argv[1:]] or find_build_dirs(Path.cwd())
+    for directory in directories:
+        report = BuildReport(directory).analyze(top=5)
+        print(f"=== {directory} ({describe_profile(read_build_profile(directory))}) ===")
+        if report is None:
+            print("  Brak czasów zadań (.ninja_log lub .compile_times)")
+            continue
+        print(f"  Zadania: {report['jobs']}, czas: {report['wall_seconds']} s, CPU: {report['cpu_seconds']} s, "
+              f"równoległość: {report['parallelism']}")
+        print(f"  Ścieżka krytyczna ({report['critical_path_method']}): {report['critical_path_seconds']} s")
+        for entry in report['slowest']:
+            print(f"  {entry['seconds']:8.2f} s  {entry['output']}")
@@ -0,0 +1,231 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Telemetria kompilacji - CPU, obciążenie, pamięć drzewa procesów, swap i I/O dysku
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from hardware_detector import HardwareDetector
+from logger_config import get_logger
+
+
+TELEMETRY_FILE_PREFIX = "build_telemetry"
+DEFAULT_INTERVAL = 1.0
+
+
+class BuildTelemetry:
+    """
+    Klasa próbkująca zużycie zasobów podczas 'cmake --build'
+
+    Co interval sekund zapisuje: wykorzystanie rdzeni, obciążenie (load average),
+    łączny RSS drzewa procesów kompilacji, ruch swap i I/O dysku. Na końcu
+    zwraca podsumowanie (szczyt pamięci, średnie wykorzystanie rdzeni, czas
+    z aktywnym swapem) - dane do doboru -j i profilu dla małych urządzeń.
+    W kontenerze wolna pamięć i wykorzystanie rdzeni uwzględniają limity cgroup.
+    """
+
+    def __init__(self, pid: int, interval: float = DEFAULT_INTERVAL, detector: HardwareDetector = None):
+        self.logger = get_logger()
+        self.detector = detector or HardwareDetector()
+        self.cpu_count = self.detector.get_effective_cpu_count()
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict[str, any]] = []
+        self.start = time.time()
+        self._running = False
+        self._previous_swap = None
+        self._previous_disk = None
+
+    def _tree_rss(self) -> int:
+        """Łączny RSS procesu budowania i wszystkich potomków w bajtach"""
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    @staticmethod
+    def _delta(current, previous, field: str) -> int:
+        if current is None or previous is None:
+            return 0
+        return max(getattr(current, field) - getattr(previous, field), 0)
+
+    @staticmethod
+    def _allowed_cpu_percent(per_cpu: List[float]) -> List[float]:
+        """Wykorzystanie tylko rdzeni, na których proces może działać (afinicja/cpuset)"""
+        try:
+            allowed = os.sched_getaffinity(0)
+        except (AttributeError, OSError):
+            return per_cpu
+        selected = [value for index, value in enumerate(per_cpu) if index in allowed]
+        return selected or per_cpu
+
+    def sample(self) -> Dict[str, any]:
+        """Jedna próbka (wykorzystanie CPU liczone od poprzedniej próbki)"""
+        now = time.time()
+        per_cpu = self._allowed_cpu_percent(psutil.cpu_percent(percpu=True))
+        busy_cores = sum(per_cpu) / 100.0
+        swap = psutil.swap_memory()
+        try:
+            disk = psutil.disk_io_counters()
+        except Exception:
+            disk = None
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            load = None
+
+        sample = {
+            'time': round(now - self.start, 2),
+            # Względem dostępnych CPU (limit czasu CPU cgroup może być niższy niż liczba rdzeni)
+            'cpu_percent': round(min(100.0, busy_cores / self.cpu_count * 100.0), 1),
+            'busy_cores': round(busy_cores, 2),
+            'load': round(load, 2) if load is not None else None,
+            'tree_rss_bytes': self._tree_rss(),
+            'available_bytes': self.detector.get_memory_status()['available'],
+            'swap_used_bytes': swap.used,
+            'swap_in_bytes': self._delta(swap, self._previous_swap, 'sin'),
+            'swap_out_bytes': self._delta(swap, self._previous_swap, 'sout'),
+            'disk_read_bytes': self._delta(disk, self._previous_disk, 'read_bytes'),
+            'disk_write_bytes': self._delta(disk, self._previous_disk, 'write_bytes'),
+        }
+        self._previous_swap = swap
+        self._previous_disk = disk
+        self.samples.append(sample)
+        return sample
+
+    @property
+    def latest(self) -> Optional[Dict[str, any]]:
+        return self.samples[-1] if self.samples else None
+
+    async def run(self):
+        """Pętla próbkowania do wywołania stop()"""
+        self._running = True
+        # Pierwsze wywołania ustalają punkt odniesienia dla CPU, swap i dysku
+        psutil.cpu_percent(percpu=True)
+        self._previous_swap = psutil.swap_memory()
+        try:
+            self._previous_disk = psutil.disk_io_counters()
+        except Exception:
+            self._previous_disk = None
+        while self._running:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.debug(f"Błąd próbkowania telemetrii: {e}")
+
+    def stop(self):
+        self._running = False
+
+    def get_summary(self) -> Dict[str, any]:
+        """Podsumowanie: szczyt pamięci, średnie wykorzystanie rdzeni, swap, dysk"""
+        if not self.samples:
+            return {}
+        loads = [sample['load'] for sample in self.samples if sample['load'] is not None]
+        swapping = [sample for sample in self.samples if sample['swap_in_bytes'] or sample['swap_out_bytes']]
+        return {
+            'samples': len(self.samples),
+            'seconds': self.samples[-1]['time'],
+            'peak_rss_mb': round(max(sample['tree_rss_bytes'] for sample in self.samples) / 1024**2, 1),
+            'min_available_mb': round(min(sample['available_bytes'] for sample in self.samples) / 1024**2, 1),
+            'avg_cpu_percent': round(sum(sample['cpu_percent'] for sample in self.samples) / len(self.samples), 1),
+            'avg_busy_cores': round(sum(sample['busy_cores'] for sample in self.samples) / len(self.samples), 2),
+            'peak_load': max(loads) if loads else None,
+            'swap_seconds': round(len(swapping) * self.interval, 1),
+            'swap_in_mb': round(sum(sample['swap_in_bytes'] for sample in self.samples) / 1024**2, 1),
+            'swap_out_mb': round(sum(sample['swap_out_bytes'] for sample in self.samples) / 1024**2, 1),
+            'disk_read_mb': round(sum(sample['disk_read_bytes'] for sample in self.samples) / 1024**2, 1),
+            'disk_write_mb': round(sum(sample['disk_write_bytes'] for sample in self.samples) / 1024**2, 1),
+        }
+
+    @staticmethod
+    def format_summary(summary: Dict[str, any]) -> List[str]:
+        """Linie podsumowania do wyświetlenia"""
+        if not summary:
+            return []
+        lines = [
+            f"Szczyt pamięci kompilacji: {summary['peak_rss_mb']:.0f} MB "
+            f"(najmniej wolnej pamięci: {summary['min_available_mb']:.0f} MB)",
+            f"Średnie wykorzystanie rdzeni: {summary['avg_cpu_percent']:.0f}% "
+            f"(średnio zajętych rdzeni: {summary['avg_busy_cores']:.1f})",
+        ]
+        if summary['peak_load'] is not None:
+            lines.append(f"Maksymalne obciążenie (load): {summary['peak_load']:.1f}")
+        lines.append(f"Swap aktywny przez {summary['swap_seconds']:.0f} s "
+                     f"(wczytano {summary['swap_in_mb']:.0f} MB, zapisano {summary['swap_out_mb']:.0f} MB)")
+        lines.append(f"Dysk: odczyt {summary['disk_read_mb']:.0f} MB, zapis {summary['disk_write_mb']:.0f} MB")
+        return lines
+
+    @staticmethod
+    def format_sample(sample: Optional[Dict[str, any]], interval: float = DEFAULT_INTERVAL) -> str:
+        """Jedna linia stanu dla panelu na żywo"""
+        if not sample:
+            return "Telemetria: brak danych"
+        swap_rate = (sample['swap_in_bytes'] + sample['swap_out_bytes']) / 1024**2 / interval
+        return (f"CPU {sample['cpu_percent']:.0f}% ({sample['busy_cores']:.1f} rdz.) | "
+                f"pamięć kompilacji {sample['tree_rss_bytes'] / 1024**2:.0f} MB | "
+                f"wolna {sample['available_bytes'] / 1024**2:.0f} MB | "
+                f"swap {swap_rate:.1f} MB/s | "
+                f"dysk R {sample['disk_read_bytes'] / 1024**2 / interval:.1f} "
+                f"W {sample['disk_write_bytes'] / 1024**2 / interval:.1f} MB/s")
+
+    def write(self, log_dir: Path) -> Optional[Path]:
+        """Zapisuje surowe próbki i podsumowanie do log_dir/build_telemetry_<czas>.json"""
+        timestamp = datetime.fromtimestamp(self.start).strftime('%Y%m%d_%H%M%S')
+        path = Path(log_dir) / f"{TELEMETRY_FILE_PREFIX}_{timestamp}.json"
+        memory = self.detector.get_memory_status()
+        data = {
+            'start': datetime.fromtimestamp(self.start).isoformat(timespec='seconds'),
+            'interval': self.interval,
+            'cpu_count': self.cpu_count,
+            'memory_total_bytes': memory['total'],
+            'cgroup_memory_limit': memory['limited'],
+            'summary': self.get_summary(),
+            'samples': self.samples,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(data, indent=1))
+        except OSError as e:
+            self.logger.warning(f"Nie można zapisać telemetrii {path}: {e}")
+            return None
+        return path
+
+
+if __name__ == "__main__":
+    async def demo():
+        process = await asyncio.create_subprocess_exec('sh', '-c', 'for i in 1 2 3; do sleep 1; done')
+        telemetry = BuildTelemetry(process.pid, interval=0.5)
+        task = asyncio.ensure_future(telemetry.run())
+        await process.wait()
+        telemetry.stop()
+        await task
+        print("=== Telemetria kompilacji (demo) ===")
+        print(BuildTelemetry.format_sample(telemetry.latest, telemetry.interval))
+        for line in BuildTelemetry.format_summary(telemetry.get_summary()):
+            print(line)
+
+    asyncio.run(demo())
@@ -0,0 +1,225 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Oś czasu instalacji w formacie Chrome trace (chrome://tracing, ui.perfetto.dev)
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logger_config import get_logger
+
+
+TRACE_FILE_PREFIX = "build_trace"
+
+# Wątki (tory) na osi czasu: etapy instalatora, linkowania i zadania ninja
+STAGE_TID_BASE = 1
+LINK_TID_BASE = 50
+JOB_TID_BASE = 100
+
+# Wyniki ninja bez tych rozszerzeń to programy i biblioteki (linkowanie)
+OBJECT_SUFFIXES = ('.o', '.obj')
+
+
+def read_ninja_log(ninja_log: Path) -> List[Tuple[int, int, str]]:
+    """
+    Zadania ostatniego uruchomienia ninja z .ninja_log: (start ms, koniec ms, wynik)
+
+    Ninja dopisuje zadania w kolejności zakończenia, więc spadek czasu końca
+    oznacza początek kolejnego uruchomienia.
+    """
+    runs = [[]]
+    last_end = -1
+    try:
+        lines = Path(ninja_log).read_text(errors='replace').splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        parts = line.split('\t')
+        if len(parts) < 4:
+            continue
+        try:
+            start, end = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        if end < last_end:
+            runs.append([])
+        last_end = end
+        runs[-1].append((start, end, parts[3]))
+    return runs[-1]
+
+
+class BuildTrace:
+    """
+    Klasa zbierająca przedziały czasu etapów instalacji i zadań kompilacji
+
+    Nakładające się etapy (np. równoległe klonowanie i sprawdzanie zależności)
+    dostają osobne tory, żeby przeglądarka trace nie zagnieżdżała ich błędnie.
+    Czasy są w sekundach od epoki, więc łączą się z .link_times i .ninja_log.
+    """
+
+    def __init__(self):
+        self.logger = get_logger()
+        self.start = time.time()
+        self.events: List[Dict[str, any]] = []
+        self._open: Dict[str, Dict[str, any]] = {}
+        self._busy_lanes = set()
+        self._lock = threading.Lock()
+
+    def _micros(self, timestamp: float) -> int:
+        return int((timestamp - self.start) * 1e6)
+
+    def add_span(self, name: str, start: float, end: float, category: str = 'stage',
+                 tid: int = STAGE_TID_BASE, args: Dict[str, any] = None):
+        """Dodaje zakończony przedział (czasy w sekundach od epoki)"""
+        event = {
+            'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+            'ts': self._micros(start), 'dur': max(int((end - start) * 1e6), 0),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    def begin(self, name: str, category: str = 'stage', **args):
+        """Rozpoczyna przedział etapu (ponowne begin tej samej nazwy kończy poprzedni)"""
+        if name in self._open:
+            self.end(name, status='ponowiony')
+        with self._lock:
+            lane = STAGE_TID_BASE
+            while lane in self._busy_lanes:
+                lane += 1
+            self._busy_lanes.add(lane)
+        self._open[name] = {'start': time.time(), 'category': category, 'tid': lane, 'args': args}
+
+    def end(self, name: str, status: str = 'ok', **args):
+        """Kończy przedział etapu"""
+        span = self._open.pop(name, None)
+        if span is None:
+            return
+        with self._lock:
+            self._busy_lanes.discard(span['tid'])
+        self.add_span(name, span['start'], time.time(), span['category'], span['tid'],
+                      dict(span['args'], status=status, **args))
+
+    def add_counter(self, name: str, timestamp: float, values: Dict[str, float]):
+        """Dodaje próbkę licznika (np. CPU, pamięć) - wykres pod osią czasu"""
+        with self._lock:
+            self.events.append({'name': name, 'cat': 'telemetry', 'ph': 'C', 'pid': os.getpid(),
+                                'tid': 0, 'ts': self._micros(timestamp), 'args': values})
+
+    def add_link_intervals(self, intervals: List[Tuple[float, float, str]], since: float = None):
+        """Dodaje linkowania z launchera linkera (start, koniec, cel)"""
+        lanes: List[float] = []
+        for start, end, target in sorted(intervals):
+            if since is not None and start < since:
+                continue
+            lane = next((index for index, lane_end in enumerate(lanes) if lane_end <= start), None)
+            if lane is None:
+                lane = len(lanes)
+                lanes.append(end)
+            lanes[lane] = end
+            self.add_span(f"link {Path(target).name}", start, end, 'link', LINK_TID_BASE + lane,
+                          {'target': target})
+
+    def add_ninja_log(self, ninja_log: Path, build_start: float) -> int:
+        """
+        Dodaje zadania ninja z ostatniego uruchomienia
+
+        Args:
+            ninja_log: ścieżka do .ninja_log w katalogu build
+            build_start: czas startu 'cmake --build' (sekundy od epoki) - początek osi ninja
+
+        Returns:
+            Liczba dodanych zadań
+        """
+        jobs = read_ninja_log(ninja_log)
+        lanes: List[int] = []
+        for start_ms, end_ms, output in sorted(jobs):
+            # Tory jak w ninja: zadanie trafia do pierwszego wolnego "slotu -j"
+            lane = next((index for index, lane_end in enumerate(lanes) if lane_end <= start_ms), None)
+            if lane is None:
+                lane = len(lanes)
+                lanes.append(end_ms)
+            lanes[lane] = end_ms
+            category = 'compile' if output.endswith(OBJECT_SUFFIXES) else 'link'
+            self.add_span(Path(output).name, build_start + start_ms / 1000.0, build_start + end_ms / 1000.0,
+                          category, JOB_TID_BASE + lane, {'output': output})
+        return len(jobs)
+
+    def _metadata(self) -> List[Dict[str, any]]:
+        """Nazwy procesu i torów widoczne w przeglądarce trace"""
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'llama.cpp installer'}}]
+        for tid in sorted({event['tid'] for event in self.events if event['ph'] == 'X'}):
+            if tid >= JOB_TID_BASE:
+                name = f"ninja slot {tid - JOB_TID_BASE + 1}"
+            elif tid >= LINK_TID_BASE:
+                name = f"linkowanie {tid - LINK_TID_BASE + 1}"
+            else:
+                name = f"etapy {tid}"
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        return events
+
+    def write(self, log_dir: Path) -> Optional[Path]:
+        """
+        Zapisuje trace do log_dir/build_trace_<czas>.json (niezakończone etapy jako przerwane)
+
+        Returns:
+            Ścieżka pliku lub None przy błędzie zapisu
+        """
+        for name in list(self._open):
+            self.end(name, status='przerwany')
+
+        timestamp = datetime.fromtimestamp(self.start).strftime('%Y%m%d_%H%M%S')
+        path = Path(log_dir) / f"{TRACE_FILE_PREFIX}_{timestamp}.json"
+        trace = {
+            'traceEvents': self._metadata() + sorted(self.events, key=lambda event: event['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {'start': datetime.fromtimestamp(self.start).isoformat(timespec='seconds')},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(trace))
+        except OSError as e:
+            self.logger.warning(f"Nie można zapisać osi czasu {path}: {e}")
+            return None
+        self.logger.info(f"Oś czasu instalacji: {path}")
+        return path
+
+    def get_summary(self) -> List[Tuple[str, float]]:
+        """Etapy i ich łączny czas w sekundach (od najdłuższego)"""
+        totals: Dict[str, float] = {}
+        for event in self.events:
+            if event['cat'] == 'stage':
+                totals[event['name']] = totals.get(event['name'], 0.0) + event['dur'] / 1e6
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    trace = BuildTrace()
+    trace.begin('detection')
+    time.sleep(0.05)
+    trace.end('detection')
+    if len(sys.argv) > 1:
+        count = trace.add_ninja_log(Path(sys.argv[1]) / '.ninja_log', trace.start)
+        print(f"Zadania ninja: {count}")
+    print("=== Oś czasu (demo) ===")
+    for name, seconds in trace.get_summary():
+        print(f"  {name}: {seconds:.2f} s")
+    print(f"Zapisano: {trace.write(Path('logs'))}")
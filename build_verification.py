@@ -0,0 +1,366 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Weryfikacja zbudowanych plików wykonywalnych llama.cpp na bieżącym CPU
+"""
+import json
+import os
+import re
+import shutil
+import signal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from logger_config import get_logger
+from microarch import GGML_OPTION_CPU_FLAGS, MicroarchResolver
+from optimization_configs import OptimizationConfigs
+from process_manager import ProcessManager
+
+
+# Grupy opcji ISA sprawdzane przy bisekcji, od najbardziej zaawansowanych
+ISA_BISECT_OPTIONS = [
+    ('AVX512', ['GGML_AVX512', 'GGML_AVX512_VBMI', 'GGML_AVX512_VNNI', 'GGML_AVX512_BF16',
+                'GGML_AMX_TILE', 'GGML_AMX_INT8']),
+    ('AVX2', ['GGML_AVX2', 'GGML_AVX_VNNI']),
+    ('BMI2', ['GGML_BMI2']),
+    ('FMA', ['GGML_FMA']),
+    ('F16C', ['GGML_F16C']),
+]
+
+# Opcje CMAKE -> nazwa cechy w wyjściu system_info llama.cpp
+SYSTEM_INFO_ISA_FEATURES = {
+    'GGML_AVX': 'AVX',
+    'GGML_AVX2': 'AVX2',
+    'GGML_FMA': 'FMA',
+    'GGML_F16C': 'F16C',
+    'GGML_BMI2': 'BMI2',
+    'GGML_AVX_VNNI': 'AVX_VNNI',
+    'GGML_AVX512': 'AVX512',
+    'GGML_AVX512_VBMI': 'AVX512_VBMI',
+    'GGML_AVX512_VNNI': 'AVX512_VNNI',
+    'GGML_AVX512_BF16': 'AVX512_BF16',
+    'GGML_AMX_INT8': 'AMX_INT8',
+}
+
+# Cechy sprawdzane dla GGML_NATIVE - starsze kompilatory mogą nie włączyć
+# nowszych rozszerzeń (AMX, AVX-VNNI) mimo ich obecności na CPU
+NATIVE_CHECKED_FEATURES = ['AVX', 'AVX2', 'FMA', 'F16C', 'AVX512']
+
+SYSTEM_INFO_LIBRARY_FEATURES = {
+    'GGML_BLAS': 'BLAS',
+    'GGML_OPENMP': 'OPENMP',
+}
+
+# Szybkie testy ctest dla backendu CPU (bez pobierania modeli)
+CTEST_CPU_SUBSET = r'^test-(quantize-fns|rope|barrier|sampling|backend-ops)$'
+
+SYSTEM_INFO_FEATURE_RE = re.compile(r'\b([A-Z][A-Z0-9_]*) = (\d+)')
+SYSTEM_INFO_BACKEND_RE = re.compile(r'\|\s*([A-Za-z][\w-]*) : ')
+
+
+def parse_system_info(output: str) -> Dict[str, int]:
+    """
+    Parsuje linię system_info llama.cpp, np. '| CPU : AVX2 = 1 | OPENMP = 1 |'
+
+    Zarejestrowane backendy (np. 'BLAS : ...') są zwracane jako cecha o wartości 1.
+    """
+    features = {}
+    for line in output.splitlines():
+        if 'system' not in line.lower() or '|' not in line:
+            continue
+        for name, value in SYSTEM_INFO_FEATURE_RE.findall(line):
+            features[name] = int(value)
+        for backend in SYSTEM_INFO_BACKEND_RE.findall(line):
+            features.setdefault(backend.upper(), 1)
+    return features
+
+
+def explicit_isa_flags(cmake_flags: List[str], cpu_flags: List[str]) -> List[str]:
+    """
+    Zamienia GGML_NATIVE i -march/-mtune/-mcpu na jawne opcje GGML_* hosta
+
+    Dzięki temu bisekcja może wyłączać pojedyncze rozszerzenia ISA,
+    których kompilator nie włączy już pośrednio przez -march. Nieustawione
+    opcje dostają wartość z flag hosta także przy GGML_NATIVE=OFF (np. build
+    z --march) - inaczej ggml włączyłby je domyślnie (AVX2, FMA, F16C...).
+    """
+    result = []
+    for flag in cmake_flags:
+        for prefix in ('-DCMAKE_C_FLAGS=', '-DCMAKE_CXX_FLAGS='):
+            if flag.startswith(prefix):
+                tokens = [
+                    token for token in flag[len(prefix):].split()
+                    if not token.startswith(('-march=', '-mtune=', '-mcpu='))
+                ]
+                flag = prefix + ' '.join(tokens)
+        result.append(flag)
+
+    if OptimizationConfigs.get_option(result, 'GGML_NATIVE') != 'OFF':
+        result = OptimizationConfigs.set_option(result, 'GGML_NATIVE', 'OFF')
+    for option, required in GGML_OPTION_CPU_FLAGS.items():
+        if OptimizationConfigs.get_option(result, option) is None:
+            enabled = all(flag in cpu_flags for flag in required)
+            result = OptimizationConfigs.set_option(result, option, 'ON' if enabled else 'OFF')
+
+    return result
+
+
+def disable_isa_groups(cmake_flags: List[str], groups: List[tuple]) -> List[str]:
+    """Wyłącza wszystkie opcje GGML_* z podanych grup ISA_BISECT_OPTIONS"""
+    result = list(cmake_flags)
+    for _, options in groups:
+        for option in options:
+            result = OptimizationConfigs.set_option(result, option, 'OFF')
+    return result
+
+
+class BuildVerifier:
+    """Klasa uruchamiająca testy dymne zbudowanych plików wykonywalnych"""
+
+    def __init__(self, build_dir: Path, timeout: int = 120, process_manager: ProcessManager = None):
+        self.logger = get_logger()
+        self.build_dir = Path(build_dir)
+        self.timeout = timeout
+        # Procesy w grupach menedżera instalatora - anulowanie i wyjście je zabijają
+        self.process_manager = process_manager or ProcessManager()
+
+        self.bin_dir = self.build_dir / "bin"
+        if not self.bin_dir.exists():
+            self.bin_dir = self.build_dir
+
+    def _get_env(self) -> Dict[str, str]:
+        """Środowisko z katalogiem bin w LD_LIBRARY_PATH (buildy z bibliotekami współdzielonymi)"""
+        env = dict(os.environ)
+        env['LD_LIBRARY_PATH'] = f"{self.bin_dir}:{env.get('LD_LIBRARY_PATH', '')}"
+        return env
+
+    def _run(self, cmd: List[str], expect_success: bool = True) -> Dict[str, any]:
+        """Uruchamia polecenie i rozpoznaje zakończenie sygnałem SIGILL"""
+        self.logger.debug(f"Test dymny: {' '.join(cmd)}")
+        try:
+            result = self.process_manager.run_sync(cmd, timeout=self.timeout, cwd=str(self.bin_dir),
+                                                   env=self._get_env())
+            returncode = result['returncode']
+            stdout = result['stdout']
+            output = result['stdout'] + result['stderr']
+            if result['timed_out']:
+                returncode = None
+                stdout = ''
+                output = f"Przekroczono limit czasu ({self.timeout} s)"
+        except Exception as e:
+            returncode = None
+            stdout = ''
+            output = str(e)
+
+        # Kod 132 = 128 + SIGILL, gdy proces uruchamia powłoka
+        sigill = returncode in (-signal.SIGILL, 128 + signal.SIGILL)
+        if sigill:
+            self.logger.error(f"SIGILL podczas uruchamiania: {' '.join(cmd)}")
+        elif returncode != 0 and expect_success:
+            self.logger.warning(f"Test dymny zakończony kodem {returncode}: {' '.join(cmd)}")
+
+        return {
+            'command': ' '.join([Path(cmd[0]).name] + cmd[1:]),
+            'returncode': returncode,
+            'sigill': sigill,
+            'stdout': stdout,
+            'output': output,
+        }
+
+    def _get_op_test_command(self) -> Optional[List[str]]:
+        """Zwraca najmniejszy dostępny test operacji ggml na backendzie CPU"""
+        quantize_test = self.bin_dir / "test-quantize-fns"
+        if quantize_test.exists():
+            return [str(quantize_test)]
+
+        backend_ops_test = self.bin_dir / "test-backend-ops"
+        if backend_ops_test.exists():
+            return [str(backend_ops_test), 'perf', '-o', 'ADD', '-b', 'CPU']
+
+        return None
+
+    def run_self_test(self) -> Dict[str, any]:
+        """
+        Uruchamia 'llama-cli --version' oraz krótki test operacji ggml
+
+        Returns:
+            Słownik z kluczami 'passed', 'sigill' i 'results'
+        """
+        results = []
+
+        cli = self.bin_dir / "llama-cli"
+        if cli.exists():
+            results.append(self._run([str(cli), '--version']))
+        else:
+            self.logger.warning(f"Brak {cli} - pomijam test --version")
+
+        op_test = self._get_op_test_command()
+        if op_test:
+            results.append(self._run(op_test))
+        else:
+            self.logger.warning("Brak testów ggml w buildzie - pomijam test operacji")
+
+        passed = bool(results) and all(result['returncode'] == 0 for result in results)
+        sigill = any(result['sigill'] for result in results)
+        self.logger.info(f"Test dymny buildu {self.build_dir.name}: passed={passed}, sigill={sigill}")
+
+        return {
+            'passed': passed,
+            'sigill': sigill,
+            'results': results,
+        }
+
+    def get_system_info(self) -> Dict[str, int]:
+        """
+        Odczytuje cechy buildu z system_info
+
+        llama-server wypisuje system_info przed wczytaniem modelu, więc
+        wystarczy uruchomić go z nieistniejącym plikiem modelu.
+        """
+        server = self.bin_dir / "llama-server"
+        if not server.exists():
+            self.logger.warning(f"Brak {server} - nie można odczytać system_info")
+            return {}
+
+        result = self._run([str(server), '-m', str(self.build_dir / 'nonexistent.gguf'),
+                            '--host', '127.0.0.1', '--port', '0'], expect_success=False)
+        features = parse_system_info(result['output'])
+        self.logger.debug(f"system_info: {features}")
+        return features
+
+    def get_expected_features(self, cmake_flags: List[str]) -> Dict[str, int]:
+        """Wyznacza cechy system_info, które muszą być aktywne dla danych flag CMAKE"""
+        resolver = MicroarchResolver()
+        expected = {}
+
+        # Buildy z wariantami backendu raportują cechy wczytanego wariantu
+        if (not OptimizationConfigs.uses_backend_variants(cmake_flags)
+                and resolver.machine in ['x86_64', 'amd64']):
+            native = OptimizationConfigs.get_option(cmake_flags, 'GGML_NATIVE') != 'OFF'
+            cpu_flags = resolver.get_cpu_flags() if native else []
+            for option, feature in SYSTEM_INFO_ISA_FEATURES.items():
+                if native:
+                    enabled = feature in NATIVE_CHECKED_FEATURES and all(flag in cpu_flags for flag in GGML_OPTION_CPU_FLAGS[option])
+                else:
+                    enabled = OptimizationConfigs.get_option(cmake_flags, option) == 'ON'
+                if enabled:
+                    expected[feature] = 1
+
+        for option, feature in SYSTEM_INFO_LIBRARY_FEATURES.items():
+            if OptimizationConfigs.get_option(cmake_flags, option) == 'ON':
+                expected[feature] = 1
+
+        return expected
+
+    def check_features(self, cmake_flags: List[str]) -> Dict[str, any]:
+        """
+        Porównuje system_info z flagami CMAKE
+
+        Returns:
+            Słownik z kluczami 'checked', 'features' i 'mismatches'
+        """
+        features = self.get_system_info()
+        if not features:
+            return {'checked': False, 'features': {}, 'mismatches': []}
+
+        expected = self.get_expected_features(cmake_flags)
+        mismatches = [
+            f"{feature}: oczekiwano {value}, system_info: {features.get(feature, 0)}"
+            for feature, value in expected.items()
+            if features.get(feature, 0) != value
+        ]
+        for mismatch in mismatches:
+            self.logger.error(f"Niezgodność cech buildu - {mismatch}")
+
+        return {'checked': True, 'features': features, 'mismatches': mismatches}
+
+    def run_bench(self, model_path: Path, threads: int) -> Optional[Dict[str, float]]:
+        """
+        Krótki pomiar llama-bench na lokalnym modelu
+
+        Returns:
+            Słownik {'pp': tokeny/s przetwarzania promptu, 'tg': tokeny/s generowania} lub None
+        """
+        bench = self.bin_dir / "llama-bench"
+        if not bench.exists():
+            self.logger.warning(f"Brak {bench} - pomijam benchmark")
+            return None
+
+        result = self._run([str(bench), '-m', str(model_path), '-p', '256', '-n', '64',
+                            '-r', '3', '-t', str(threads), '-o', 'json'])
+        if result['returncode'] != 0:
+            self.logger.error(f"llama-bench zakończony błędem:\n{result['output'][-2000:]}")
+            return None
+
+        try:
+            entries = json.loads(result['stdout'])
+        except ValueError as e:
+            self.logger.error(f"Nie można sparsować wyniku llama-bench: {e}")
+            return None
+
+        scores = {}
+        for entry in entries:
+            if entry.get('n_prompt', 0) > 0 and entry.get('n_gen', 0) == 0:
+                scores['pp'] = entry.get('avg_ts', 0.0)
+            elif entry.get('n_gen', 0) > 0 and entry.get('n_prompt', 0) == 0:
+                scores['tg'] = entry.get('avg_ts', 0.0)
+
+        self.logger.info(f"llama-bench {self.build_dir.name}: {scores}")
+        return scores if 'pp' in scores and 'tg' in scores else None
+
+    def run_ctest(self, jobs: int) -> Optional[Dict[str, any]]:
+        """
+        Uruchamia równolegle podzbiór testów ctest dla backendu CPU
+
+        Returns:
+            Słownik z kluczami 'passed', 'returncode', 'output' lub None,
+            gdy build nie zawiera testów
+        """
+        if not shutil.which('ctest') or not (self.build_dir / 'CTestTestfile.cmake').exists():
+            self.logger.info("Build bez testów ctest - pomijam")
+            return None
+
+        cmd = ['ctest', '-R', CTEST_CPU_SUBSET, '-j', str(jobs),
+               '--output-on-failure', '--timeout', str(self.timeout)]
+        self.logger.debug(f"Wykonywanie komendy: {' '.join(cmd)}")
+        result = self.process_manager.run_sync(cmd, timeout=self.timeout * 5, cwd=str(self.build_dir),
+                                               env=self._get_env())
+        returncode = result['returncode']
+        output = result['stdout'] + result['stderr']
+        if result['timed_out']:
+            returncode = None
+            output = "Przekroczono limit czasu ctest"
+
+        if 'No tests were found' in output:
+            self.logger.info("Brak testów CPU w ctest - pomijam")
+            return None
+
+        return {
+            'passed': returncode == 0,
+            'returncode': returncode,
+            'output': output,
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    build_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("llama.cpp/build")
+    report = BuildVerifier(build_dir).run_self_test()
+
+    print(f"=== Test dymny: {build_dir} ===")
+    for result in report['results']:
+        status = "SIGILL" if result['sigill'] else result['returncode']
+        print(f"  {result['command']}: {status}")
+    print(f"Wynik: {'OK' if report['passed'] else 'BŁĄD'}")
+
+    features = BuildVerifier(build_dir).get_system_info()
+    if features:
+        print("system_info: " + ', '.join(f"{name}={value}" for name, value in sorted(features.items())))
@@ -0,0 +1,228 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Watchdog pamięci i temperatury wstrzymujący procesy kompilatora
+"""
+import asyncio
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from hardware_detector import HardwareDetector
+from logger_config import get_logger
+
+
+# Ścieżkę sysfs można podmienić (np. na sztuczną strefę termiczną w testach)
+THERMAL_PATH_ENV = 'LLAMACPP_THERMAL_PATH'
+DEFAULT_THERMAL_PATH = '/sys/class/thermal'
+
+# Procesy wykonujące właściwą pracę (sterowniki gcc/clang tylko czekają na nie)
+COMPILER_PROCESSES = {
+    'cc1', 'cc1plus', 'lto1', 'clang', 'clang++', 'ld', 'ld.bfd', 'ld.gold', 'ld.lld',
+    'mold', 'as',
+}
+
+TEMP_HIGH_C = 80.0
+TEMP_RESUME_C = 70.0
+
+# Próg pamięci: 10% RAM, w granicach 300 MB - 1 GB; wznawianie przy dwukrotności
+MEMORY_LOW_SHARE = 0.1
+MEMORY_LOW_MIN_MB = 300
+MEMORY_LOW_MAX_MB = 1024
+
+# Najdłuższe wstrzymanie procesu - wstrzymany proces trzyma pamięć, więc sama
+# pamięć może nigdy nie wzrosnąć do progu wznowienia
+MAX_PAUSE_SECONDS = 60.0
+
+
+class BuildWatchdog:
+    """
+    Klasa próbkująca wolną pamięć i temperaturę podczas 'cmake --build'
+
+    Przy braku pamięci lub przegrzaniu wstrzymuje (SIGSTOP) najmłodsze procesy
+    kompilatora, zmniejszając faktyczną równoległość - make/ninja nie uruchamia
+    nowych zadań, dopóki wstrzymane się nie zakończą. Po ustąpieniu problemu
+    wznawia je (SIGCONT) po jednym na próbkę. Gdy nie został żaden aktywny
+    proces kompilatora (np. linkowanie czeka na wstrzymane obiekty) albo proces
+    jest wstrzymany dłużej niż max_pause, jest wznawiany bez względu na progi.
+    """
+
+    def __init__(self, pid: int, thermal_path: str = None, interval: float = 2.0,
+                 memory_low_mb: int = None, temp_high: float = TEMP_HIGH_C,
+                 temp_resume: float = TEMP_RESUME_C, max_pause: float = MAX_PAUSE_SECONDS,
+                 detector: HardwareDetector = None):
+        self.logger = get_logger()
+        self.detector = detector or HardwareDetector()
+        self.pid = pid
+        self.thermal_path = Path(thermal_path or os.environ.get(THERMAL_PATH_ENV, DEFAULT_THERMAL_PATH))
+        self.interval = interval
+        self.temp_high = temp_high
+        self.temp_resume = temp_resume
+        self.max_pause = max_pause
+
+        if memory_low_mb is None:
+            total_mb = self.detector.get_memory_status()['total'] / 1024**2
+            memory_low_mb = min(MEMORY_LOW_MAX_MB, max(MEMORY_LOW_MIN_MB, int(total_mb * MEMORY_LOW_SHARE)))
+        self.memory_low_mb = memory_low_mb
+        self.memory_resume_mb = memory_low_mb * 2
+
+        self.paused: List[psutil.Process] = []
+        self._paused_at: Dict[int, float] = {}
+        self.events: List[Dict[str, any]] = []
+        self._running = False
+
+    def read_temperature(self) -> Optional[float]:
+        """Najwyższa temperatura stref termicznych w °C (None, gdy brak odczytu)"""
+        temperatures = []
+        for temp_file in self.thermal_path.glob('thermal_zone*/temp'):
+            try:
+                value = int(temp_file.read_text().strip()) / 1000.0
+            except (OSError, ValueError):
+                continue
+            if 0 < value < 150:  # Pomijaj strefy z nieprawidłowymi odczytami
+                temperatures.append(value)
+        return max(temperatures) if temperatures else None
+
+    def read_available_memory_mb(self) -> float:
+        """Dostępna pamięć w MB (w kontenerze: limit cgroup minus zużycie grupy)"""
+        return self.detector.get_memory_status()['available'] / 1024**2
+
+    def _get_compiler_processes(self) -> List[psutil.Process]:
+        """Aktywne procesy kompilatora pod procesem budowania, od najmłodszego"""
+        try:
+            children = psutil.Process(self.pid).children(recursive=True)
+        except psutil.Error:
+            return []
+
+        paused_pids = {process.pid for process in self.paused}
+        processes = []
+        for child in children:
+            try:
+                if child.name() in COMPILER_PROCESSES and child.pid not in paused_pids:
+                    processes.append((child.create_time(), child))
+            except psutil.Error:
+                continue
+        return [process for _, process in sorted(processes, key=lambda item: item[0], reverse=True)]
+
+    def _record(self, action: str, reason: str, count: int):
+        """Zapisuje zdarzenie throttlingu w logu instalacji"""
+        event = {'time': time.time(), 'action': action, 'reason': reason, 'processes': count}
+        self.events.append(event)
+        log = self.logger.warning if action == 'wstrzymano' else self.logger.info
+        log(f"Watchdog kompilacji: {action} {count} proc. ({reason})")
+
+    def _pause(self, processes: List[psutil.Process], reason: str):
+        paused = 0
+        for process in processes:
+            try:
+                process.send_signal(signal.SIGSTOP)
+                self.paused.append(process)
+                self._paused_at[process.pid] = time.monotonic()
+                paused += 1
+            except psutil.Error:
+                continue
+        if paused:
+            self._record('wstrzymano', reason, paused)
+
+    def _resume(self, count: int, reason: str):
+        resumed = 0
+        while self.paused and resumed < count:
+            # Najstarsze wstrzymane procesy są najbliżej zakończenia
+            process = self.paused.pop()
+            if self._continue(process):
+                resumed += 1
+        if resumed:
+            self._record('wznowiono', reason, resumed)
+
+    def _continue(self, process: psutil.Process) -> bool:
+        """Wysyła SIGCONT (proces musi być już usunięty z self.paused)"""
+        self._paused_at.pop(process.pid, None)
+        try:
+            process.send_signal(signal.SIGCONT)
+        except psutil.Error:
+            return False
+        return True
+
+    def _resume_expired(self) -> int:
+        """Wznawia procesy wstrzymane dłużej niż max_pause; zwraca liczbę wznowionych"""
+        now = time.monotonic()
+        expired = [process for process in self.paused
+                   if now - self._paused_at.get(process.pid, now) >= self.max_pause]
+        if not expired:
+            return 0
+        self.paused = [process for process in self.paused if process not in expired]
+        resumed = sum(1 for process in expired if self._continue(process))
+        if resumed:
+            self._record('wznowiono', f"wstrzymane dłużej niż {self.max_pause:.0f} s", resumed)
+        return resumed
+
+    def check(self):
+        """Jedna próbka: wstrzymuje lub wznawia procesy kompilatora"""
+        self.paused = [process for process in self.paused if process.is_running()]
+        self._paused_at = {process.pid: self._paused_at[process.pid]
+                           for process in self.paused if process.pid in self._paused_at}
+        if self._resume_expired():
+            # Wznowione procesy dostają co najmniej jeden interwał pracy przed kolejnym wstrzymaniem
+            return
+        available_mb = self.read_available_memory_mb()
+        temperature = self.read_temperature()
+        active = self._get_compiler_processes()
+
+        if self.paused and not active:
+            # Wstrzymane procesy trzymają pamięć - bez wznowienia kompilacja stanęłaby na dobre
+            self._resume(1, "brak aktywnych procesów kompilatora")
+        elif available_mb < self.memory_low_mb and len(active) > 1:
+            # Zostaw jeden proces, żeby kompilacja posuwała się naprzód
+            self._pause(active[:-1], f"wolna pamięć {available_mb:.0f} MB < {self.memory_low_mb} MB")
+        elif temperature is not None and temperature > self.temp_high and len(active) > 1:
+            # Przy przegrzaniu zmniejszaj równoległość stopniowo - o połowę
+            self._pause(active[:len(active) // 2], f"temperatura {temperature:.1f}°C > {self.temp_high}°C")
+        elif self.paused and available_mb > self.memory_resume_mb and (
+                temperature is None or temperature < self.temp_resume):
+            temperature_info = f", {temperature:.1f}°C" if temperature is not None else ""
+            self._resume(1, f"wolna pamięć {available_mb:.0f} MB{temperature_info}")
+
+    async def run(self):
+        """Pętla próbkowania do wywołania stop()"""
+        self._running = True
+        self.logger.debug(f"Watchdog kompilacji: próg pamięci {self.memory_low_mb} MB, "
+                          f"temperatura {self.temp_high}°C, sysfs {self.thermal_path}")
+        try:
+            while self._running:
+                try:
+                    self.check()
+                except Exception as e:
+                    self.logger.debug(f"Błąd próbkowania watchdoga: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            self.resume_all()
+
+    def stop(self):
+        """Kończy próbkowanie i wznawia wszystkie wstrzymane procesy"""
+        self._running = False
+        self.resume_all()
+
+    def resume_all(self):
+        """Wznawia wszystkie wstrzymane procesy (np. przy przerwaniu kompilacji)"""
+        if self.paused:
+            self._resume(len(self.paused), "koniec kompilacji")
+
+
+if __name__ == "__main__":
+    watchdog = BuildWatchdog(os.getpid())
+    print("=== Watchdog kompilacji ===")
+    print(f"Strefy termiczne: {watchdog.thermal_path}")
+    temperature = watchdog.read_temperature()
+    print(f"Temperatura: {f'{temperature:.1f}°C' if temperature is not None else 'brak odczytu'}")
+    print(f"Wolna pamięć: {watchdog.read_available_memory_mb():.0f} MB (próg {watchdog.memory_low_mb} MB)")
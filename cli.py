@@ -13,14 +13,17 @@ Interfejs CLI z użyciem typer
 import typer
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import time
 from rich.console import Console
 from rich.table import Table
 
 from hardware_detector import HardwareDetector
 from optimization_configs import OptimizationConfigs
+from microarch import MicroarchResolver
+from toolchain import ToolchainDetector
 from llama_installer import LlamaInstaller
+from build_report import BuildReport, find_build_dirs, compare_targets, DEFAULT_TOP
 from translations import set_language, t
 from logger_config import setup_logging, get_logger, get_installer_logger
 from __version__ import __version__, PROJECT_NAME, PROJECT_AUTHOR, PROJECT_URL
@@ -94,6 +97,11 @@ def main_callback(
 
 @app.command("detect")
 def detect_hardware(
+    install_dir: Optional[str] = typer.Option(
+        None,
+        "--dir", "-d",
+        help="installation directory to query the runtime CPU backend variant / katalog instalacji do sprawdzenia wariantu backendu CPU"
+    ),
     language: str = typer.Option(
         "pl",
         "--lang", "-l",
@@ -144,11 +152,51 @@ def detect_hardware(
     table.add_row(t("ram_memory"), f"{info['memory_gb']} GB")
     table.add_row(t("physical_cores"), str(info['cpu_info']['physical_cores']))
     table.add_row(t("logical_cores"), str(info['cpu_info']['logical_cores']))
+    if info['cpu_info']['host_logical_cores'] != info['cpu_info']['logical_cores']:
+        table.add_row(t("host_cores"), f"{info['cpu_info']['host_physical_cores']} / "
+                                       f"{info['cpu_info']['host_logical_cores']}")
+    
+    limits = info['cgroup_limits']
+    if limits['cpu_quota'] or limits['cpuset_cpus'] or limits['memory_bytes']:
+        parts = []
+        if limits['cpu_quota']:
+            parts.append(f"CPU quota {limits['cpu_quota']:g}")
+        if limits['cpuset_cpus']:
+            parts.append(f"cpuset {limits['cpuset_cpus']}")
+        if limits['memory_bytes']:
+            parts.append(f"{t('memory_limit')} {limits['memory_bytes'] / 1024**3:.1f} GB")
+        table.add_row(f"{t('cgroup_limits')} (v{limits['version']})", ', '.join(parts))
+    
+    virtualization = info['virtualization']
+    table.add_row(t("virtualization"), ', '.join(filter(None, [
+        f"VM: {virtualization['vm']}" if virtualization['vm'] else None,
+        f"{t('container')}: {virtualization['container']}" if virtualization['container'] else None,
+    ])) or t("none"))
     
     if info['hardware_type'] == 'x86_linux':
         table.add_row(t("avx_support"), str(info['cpu_info']['has_avx']))
         table.add_row(t("avx2_support"), str(info['cpu_info']['has_avx2']))
     
+    microarch = MicroarchResolver().resolve()
+    if microarch:
+        table.add_row(t("microarchitecture"), f"{microarch['detected']} → {microarch['name']}")
+        table.add_row(t("microarch_flags"), microarch['flags'])
+    else:
+        table.add_row(t("microarchitecture"), t("microarch_unknown"))
+    
+    compilers = ToolchainDetector().detect_compilers()
+    if compilers:
+        table.add_row(t("compilers"), ', '.join(f"{compiler['name']} ({compiler['version']})" for compiler in compilers))
+    
+    # Wariant backendu CPU dla buildów portable_max (GGML_CPU_ALL_VARIANTS)
+    predicted_variant = MicroarchResolver().select_cpu_backend_variant()
+    if predicted_variant:
+        table.add_row(t("cpu_variant_predicted"), predicted_variant)
+    if install_dir:
+        runtime_variant = LlamaInstaller(install_dir).detect_runtime_cpu_variant()
+        if runtime_variant:
+            table.add_row(t("cpu_variant_runtime"), runtime_variant)
+    
     console.print(table)
     
     console.print(f"\n[bold green]{t('suggested_optimizations')}:[/bold green]")
@@ -180,7 +228,8 @@ def list_configurations(
     
     configs = [
         'dynamic', 'rpi5_8gb', 'rpi5_16gb', 'rpi5_4gb', 'rpi4', 'rpi_other',
-        'termux', 'x86_linux', 'x86_linux_old', 'x86_linux_minimal', 'no_optimization'
+        'termux', 'x86_linux', 'x86_linux_old', 'x86_linux_minimal', 'portable_max',
+        'no_optimization'
     ]
     
     for config in configs:
@@ -223,6 +272,46 @@ def install_llama(
         "--auto/--no-auto",
         help="automatic hardware detection / automatyczne wykrywanie sprzętu"
     ),
+    march: Optional[str] = typer.Option(
+        None,
+        "--march", "-m",
+        help="explicit -march/-mcpu instead of GGML_NATIVE ('auto' or e.g. znver4, cortex-a76) / jawne -march/-mcpu zamiast GGML_NATIVE ('auto' lub np. znver4, cortex-a76)"
+    ),
+    build_name: str = typer.Option(
+        "build",
+        "--build-name", "-b",
+        help="build directory name; e.g. build-avx512 adds a variant next to existing builds / nazwa katalogu buildu; np. build-avx512 dodaje wariant obok istniejących buildów"
+    ),
+    compiler: Optional[str] = typer.Option(
+        None,
+        "--compiler",
+        help="compiler (gcc, clang, clang-18, ...) or 'compare' to benchmark GCC vs Clang / kompilator (gcc, clang, clang-18, ...) lub 'compare' do porównania GCC i Clang"
+    ),
+    bench_model: Optional[str] = typer.Option(
+        None,
+        "--bench-model",
+        help="local GGUF model for llama-bench in --compiler compare / lokalny model GGUF dla llama-bench w --compiler compare"
+    ),
+    build_location: str = typer.Option(
+        "install",
+        "--build-location",
+        help="where to build: install, auto (fastest of install dir, /tmp, /dev/shm, USB drives) or a path / gdzie kompilować: install, auto (najszybsza z: katalog instalacji, /tmp, /dev/shm, dyski USB) lub ścieżka"
+    ),
+    background: bool = typer.Option(
+        False,
+        "--background",
+        help="low-impact build: nice/ionice, cgroup limits, fewer jobs, load-average cap / kompilacja w tle: nice/ionice, limity cgroup, mniej zadań, limit obciążenia"
+    ),
+    unity: bool = typer.Option(
+        False,
+        "--unity/--no-unity",
+        help="unity (jumbo) build for non-kernel sources / unity (jumbo) build dla plików poza kernelami"
+    ),
+    restart: bool = typer.Option(
+        False,
+        "--restart",
+        help="ignore checkpoints of an interrupted install and start clean / pomiń punkty kontrolne przerwanej instalacji i zacznij od nowa"
+    ),
     language: str = typer.Option(
         "pl",
         "--lang", "-l",
@@ -251,6 +340,12 @@ def install_llama(
         llama-installer install                           # Auto-detect / Automatyczne wykrywanie
         llama-installer install --hardware rpi5_8gb      # Specific hardware / Określony sprzęt
         llama-installer install --config my_flags.txt    # Custom config / Własna konfiguracja
+        llama-installer install --march auto             # Explicit -march / Jawne -march
+        llama-installer install --hardware x86_linux_old --build-name build-avx  # Variant build / Wariant buildu
+        llama-installer install --compiler compare --bench-model model.gguf   # GCC vs Clang
+        llama-installer install --unity                  # Unity build / Unity build
+        llama-installer install --build-location auto    # Fastest storage / Najszybszy nośnik
+        llama-installer install --background             # Low-impact build / Kompilacja w tle
     """
     set_language(language)
     
@@ -296,6 +391,14 @@ def install_llama(
     logger.info(f"- install_dir: {install_dir}")
     logger.info(f"- custom_config: {custom_config}")
     logger.info(f"- auto_detect: {auto_detect}")
+    logger.info(f"- march: {march}")
+    logger.info(f"- build_name: {build_name}")
+    logger.info(f"- compiler: {compiler}")
+    logger.info(f"- bench_model: {bench_model}")
+    logger.info(f"- unity: {unity}")
+    logger.info(f"- build_location: {build_location}")
+    logger.info(f"- background: {background}")
+    logger.info(f"- restart: {restart}")
     logger.info(f"- language: {language}")
     
     # Loguj wykrywanie sprzętu jeśli było automatyczne
@@ -308,6 +411,29 @@ def install_llama(
         logger.error(f"Plik konfiguracji nie istnieje: {custom_config}")
         raise typer.Exit(1)
     
+    # Sprawdź jawnie podaną mikroarchitekturę (np. do kompilacji krzyżowej)
+    if not build_name.startswith("build"):
+        console.print(f"[red]{t('invalid_build_name', build_name=build_name)}[/red]")
+        raise typer.Exit(1)
+    
+    if march and march != 'auto' and not MicroarchResolver().is_supported(march):
+        console.print(f"[red]{t('march_not_supported', march=march)}[/red]")
+        logger.error(f"Nieobsługiwana mikroarchitektura: {march}")
+        raise typer.Exit(1)
+    
+    if build_location not in ('install', 'auto') and not Path(build_location).is_dir():
+        console.print(f"[red]{t('build_location_not_exists', location=build_location)}[/red]")
+        raise typer.Exit(1)
+    
+    if compiler == 'compare' and not (bench_model and Path(bench_model).exists()):
+        console.print(f"[red]{t('bench_model_required')}[/red]")
+        raise typer.Exit(1)
+    
+    if compiler and compiler != 'compare' and not ToolchainDetector().find_compiler(compiler):
+        console.print(f"[red]{t('compiler_not_found', compiler=compiler)}[/red]")
+        logger.error(f"Nie znaleziono kompilatora: {compiler}")
+        raise typer.Exit(1)
+    
     # Loguj rozpoczęcie instalacji
     logger_config.log_installation_start(install_dir)
     logger.info(f"Instalacja dla typu sprzętu: {hardware_type}")
@@ -326,7 +452,9 @@ def install_llama(
     
     async def run_install():
         try:
-            success = await installer.install_full(hardware_type, custom_config)
+            success = await installer.install_full(hardware_type, custom_config, march, build_name,
+                                                   compiler, bench_model, unity, build_location,
+                                                   background, restart)
             
             # Oblicz czas instalacji
             duration = time.time() - start_time
@@ -349,6 +477,136 @@ def install_llama(
     asyncio.run(run_install())
 
 
+@app.command("build-report")
+def report_build(
+    build_dirs: Optional[List[str]] = typer.Argument(
+        None,
+        help="build directories to compare (default: all llama.cpp/build* with timings) / katalogi buildów do porównania (domyślnie: wszystkie llama.cpp/build* z czasami)"
+    ),
+    install_dir: Optional[str] = typer.Option(
+        None,
+        "--dir", "-d",
+        help="installation directory / katalog instalacji"
+    ),
+    top: int = typer.Option(
+        DEFAULT_TOP,
+        "--top", "-n",
+        help="number of slowest files and targets to list / liczba najwolniejszych plików i celów"
+    ),
+    language: str = typer.Option(
+        "pl",
+        "--lang", "-l",
+        help="interface language (pl/en) / język interfejsu (pl/en)"
+    ),
+    debug: bool = typer.Option(
+        False,
+        "--debug",
+        help="Enable debug logging / Włącz logowanie debug"
+    )
+):
+    """
+    Show compile hotspots of finished builds and compare build profiles.
+    
+    Pokazuje najwolniejsze elementy zakończonych kompilacji i porównuje profile buildów.
+    
+    Reads .ninja_log (Ninja) or the compile/link timing launchers (Makefile)
+    and lists the slowest translation units and CMake targets, the critical
+    path length and the achieved parallelism. Several build directories
+    (e.g. build with LTO and build-nolto) are compared side by side.
+    
+    Czyta .ninja_log (Ninja) lub launchery czasu kompilacji i linkowania
+    (Makefile) i wypisuje najwolniejsze pliki i cele CMake, długość ścieżki
+    krytycznej i osiągniętą równoległość. Kilka katalogów buildu (np. build
+    z LTO i build-nolto) jest porównywanych obok siebie.
+    
+    Examples / Przykłady:
+        llama-installer build-report --dir ~/llama
+        llama-installer build-report ~/llama/llama.cpp/build ~/llama/llama.cpp/build-o2 --top 20
+    """
+    set_language(language)
+    
+    log_level = "DEBUG" if debug else "INFO"
+    setup_logging(log_level=log_level)
+    logger = get_logger()
+    logger.info("Uruchomiono komendę 'build-report' z CLI")
+    
+    if build_dirs:
+        directories = [Path(directory).expanduser() for directory in build_dirs]
+    else:
+        search_dir = Path(install_dir).expanduser() if install_dir else Path.cwd()
+        directories = find_build_dirs(search_dir)
+        if not directories:
+            console.print(f"[yellow]{t('no_build_timings_found', directory=search_dir)}[/yellow]")
+            raise typer.Exit(1)
+    
+    reports = []
+    for directory in directories:
+        report = BuildReport(directory).analyze(top=top)
+        if report is None:
+            console.print(f"[yellow]{t('no_build_timings', build_dir=directory)}[/yellow]")
+            continue
+        reports.append(report)
+        
+        console.print(f"\n[bold cyan]{directory}[/bold cyan] ({report['profile']})")
+        method = t('critical_path_graph' if report['critical_path_method'] == 'graph' else 'critical_path_schedule')
+        summary = Table(show_header=False, box=None)
+        summary.add_column(style="cyan")
+        summary.add_column(style="green")
+        summary.add_row(t("report_jobs"), f"{report['jobs']} ({t('report_compile_jobs', count=report['compile_jobs'])})")
+        summary.add_row(t("report_wall_time"), f"{report['wall_seconds']:.1f} s")
+        summary.add_row(t("report_job_time"), f"{report['cpu_seconds']:.1f} s "
+                                              f"({t('report_compile_link', compile=report['compile_seconds'], link=report['link_seconds'])})")
+        summary.add_row(t("report_parallelism"), f"{report['parallelism']:.2f}")
+        summary.add_row(t("report_critical_path"), f"{report['critical_path_seconds']:.1f} s ({method})")
+        if report['parallelism_limit']:
+            summary.add_row(t("report_parallelism_limit"), f"{report['parallelism_limit']:.2f}")
+        console.print(summary)
+        
+        table = Table(title=t("slowest_units"))
+        table.add_column(t("report_seconds"), justify="right", style="green")
+        table.add_column(t("report_share"), justify="right")
+        table.add_column(t("report_target"), style="cyan")
+        table.add_column(t("report_file"))
+        for entry in report['slowest']:
+            table.add_row(f"{entry['seconds']:.1f}", f"{entry['share']:.1f}%", entry['target'], entry['output'])
+        console.print(table)
+        
+        table = Table(title=t("slowest_targets"))
+        table.add_column(t("report_target"), style="cyan")
+        table.add_column(t("report_seconds"), justify="right", style="green")
+        table.add_column(t("report_share"), justify="right")
+        table.add_column(t("report_jobs"), justify="right")
+        for entry in report['targets'][:top]:
+            table.add_row(entry['target'], f"{entry['seconds']:.1f}", f"{entry['share']:.1f}%", str(entry['jobs']))
+        console.print(table)
+        
+        console.print(f"{t('report_critical_path')}:")
+        for entry in report['critical_path']:
+            console.print(f"  {entry['seconds']:8.1f} s  {entry['output']}")
+    
+    if not reports:
+        raise typer.Exit(1)
+    
+    # Porównanie profili: miary całego buildu i cele kompilowane najdłużej
+    if len(reports) > 1:
+        table = Table(title=t("profile_comparison"))
+        table.add_column(t("report_metric"), style="cyan")
+        for report in reports:
+            table.add_column(f"{Path(report['build_dir']).name}\n{report['profile']}", justify="right")
+        for key, label, template in (('wall_seconds', 'report_wall_time', '{:.1f} s'),
+                                     ('cpu_seconds', 'report_job_time', '{:.1f} s'),
+                                     ('parallelism', 'report_parallelism', '{:.2f}'),
+                                     ('critical_path_seconds', 'report_critical_path', '{:.1f} s')):
+            table.add_row(t(label), *[template.format(report[key]) for report in reports])
+        table.add_section()
+        for target, seconds in compare_targets(reports, count=top):
+            table.add_row(target, *[f"{value:.1f} s" if value is not None else "-" for value in seconds])
+        console.print()
+        console.print(table)
+    
+    logger.info(f"Raport kompilacji: {len(reports)} buildów")
+
+
 @app.command("gui")
 def launch_gui(
     language: str = typer.Option(
@@ -10,20 +10,47 @@ LinkedIn: https://linkedin.com/in/Fibogacci
 
 Moduł do wykrywania sprzętu i systemu
 """
+import math
 import platform
+import shutil
 import subprocess
 import os
 import psutil
+from pathlib import Path
 from typing import Dict, Optional, Tuple
 from logger_config import get_logger
 
 
+# Limity cgroup v1 powyżej tej wartości oznaczają "bez limitu" (PAGE_COUNTER_MAX)
+CGROUP_V1_UNLIMITED = 1 << 60
+
+# Producenci/produkty z DMI wskazujące na maszynę wirtualną
+DMI_HYPERVISORS = {
+    'qemu': 'qemu',
+    'kvm': 'kvm',
+    'vmware': 'vmware',
+    'virtualbox': 'oracle',
+    'innotek': 'oracle',
+    'xen': 'xen',
+    'bochs': 'bochs',
+    'parallels': 'parallels',
+    'amazon ec2': 'amazon',
+    'google compute engine': 'google',
+    'virtual machine': 'microsoft',  # Hyper-V / Azure
+}
+
+
 class HardwareDetector:
     """Klasa do wykrywania rodzaju sprzętu i systemu"""
     
-    def __init__(self):
+    def __init__(self, cgroup_root: str = '/sys/fs/cgroup', proc_path: str = '/proc'):
         self.logger = get_logger()
+        self.cgroup_root = Path(cgroup_root)
+        self.proc_path = Path(proc_path)
         self.system_info = self._get_system_info()
+        self._cgroup_limits = None
+        self._memory_cgroup = None
+        self._virtualization = None
         self.logger.debug("Zainicjalizowano HardwareDetector")
     
     def _get_system_info(self) -> Dict[str, str]:
@@ -91,10 +118,293 @@ class HardwareDetector:
             self.logger.debug("To nie jest Termux")
         return is_termux
     
+    @staticmethod
+    def _parse_cpu_list(cpu_list: str) -> int:
+        """Liczy procesory w liście cpuset, np. '0-3,8,10-11' -> 7"""
+        count = 0
+        for part in cpu_list.strip().split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = part.split('-', 1)
+                count += int(end) - int(start) + 1
+            else:
+                count += 1
+        return count
+
+    @staticmethod
+    def _read_value(path: Path) -> Optional[str]:
+        """Odczytuje plik cgroup (None, gdy nie istnieje lub jest pusty)"""
+        try:
+            value = path.read_text().strip()
+            return value or None
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _get_cgroup_paths(self) -> Dict[str, str]:
+        """Mapuje kontrolery cgroup na ścieżki procesu z /proc/self/cgroup ('' = cgroup v2)"""
+        paths = {}
+        try:
+            with open(self.proc_path / 'self' / 'cgroup', 'r') as f:
+                for line in f:
+                    parts = line.strip().split(':', 2)
+                    if len(parts) != 3:
+                        continue
+                    for controller in parts[1].split(','):
+                        paths[controller] = parts[2]
+        except OSError:
+            pass
+        return paths
+
+    def _cgroup_dirs(self, mount: Path, cgroup_path: str):
+        """
+        Katalogi cgroup od grupy procesu do korzenia hierarchii
+
+        W kontenerze z własną przestrzenią nazw cgroup ścieżka z /proc/self/cgroup
+        nie musi istnieć pod punktem montowania - wtedy zostaje sam korzeń.
+        Limity rodziców też obowiązują, więc sprawdzamy całą ścieżkę.
+        """
+        dirs = []
+        relative = Path(cgroup_path.lstrip('/')) if cgroup_path else Path('.')
+        while True:
+            candidate = mount / relative
+            if candidate.is_dir():
+                dirs.append(candidate)
+            if str(relative) in ('.', ''):
+                break
+            relative = relative.parent
+        return dirs
+
+    def _update_memory_limit(self, limits: Dict[str, any], limit: int, directory: Path):
+        """Zapamiętuje najniższy limit pamięci i grupę, z której pochodzi (do odczytu zużycia)"""
+        if limits['memory_bytes'] is None or limit < limits['memory_bytes']:
+            limits['memory_bytes'] = limit
+            self._memory_cgroup = (limits['version'], directory)
+
+    def _read_cgroup_v2(self, cgroup_path: str) -> Dict[str, any]:
+        """Limity z cgroup v2: cpu.max, cpuset.cpus.effective, memory.max"""
+        limits = {'version': 2, 'cpu_quota': None, 'cpuset_cpus': None, 'memory_bytes': None}
+        for directory in self._cgroup_dirs(self.cgroup_root, cgroup_path):
+            cpu_max = self._read_value(directory / 'cpu.max')
+            if cpu_max:
+                quota, _, period = cpu_max.partition(' ')
+                if quota != 'max' and period:
+                    value = int(quota) / int(period)
+                    limits['cpu_quota'] = min(filter(None, [limits['cpu_quota'], value]))
+
+            cpuset = self._read_value(directory / 'cpuset.cpus.effective')
+            if cpuset and limits['cpuset_cpus'] is None:
+                # Najgłębsza grupa ma już efektywny zbiór (uwzględnia rodziców)
+                limits['cpuset_cpus'] = self._parse_cpu_list(cpuset)
+
+            memory_max = self._read_value(directory / 'memory.max')
+            if memory_max and memory_max != 'max':
+                self._update_memory_limit(limits, int(memory_max), directory)
+        return limits
+
+    def _read_cgroup_v1(self, paths: Dict[str, str]) -> Dict[str, any]:
+        """Limity z cgroup v1: cpu.cfs_quota_us/cfs_period_us, cpuset.cpus, memory.limit_in_bytes"""
+        limits = {'version': 1, 'cpu_quota': None, 'cpuset_cpus': None, 'memory_bytes': None}
+
+        for mount_name in ('cpu,cpuacct', 'cpu'):
+            mount = self.cgroup_root / mount_name
+            if not mount.is_dir():
+                continue
+            for directory in self._cgroup_dirs(mount, paths.get('cpu', '')):
+                quota = self._read_value(directory / 'cpu.cfs_quota_us')
+                period = self._read_value(directory / 'cpu.cfs_period_us')
+                if quota and period and int(quota) > 0 and int(period) > 0:
+                    value = int(quota) / int(period)
+                    limits['cpu_quota'] = min(filter(None, [limits['cpu_quota'], value]))
+            break
+
+        for directory in self._cgroup_dirs(self.cgroup_root / 'cpuset', paths.get('cpuset', '')):
+            cpuset = (self._read_value(directory / 'cpuset.effective_cpus')
+                      or self._read_value(directory / 'cpuset.cpus'))
+            if cpuset:
+                limits['cpuset_cpus'] = self._parse_cpu_list(cpuset)
+                break
+
+        for directory in self._cgroup_dirs(self.cgroup_root / 'memory', paths.get('memory', '')):
+            limit = self._read_value(directory / 'memory.limit_in_bytes')
+            if limit and 0 < int(limit) < CGROUP_V1_UNLIMITED:
+                self._update_memory_limit(limits, int(limit), directory)
+        return limits
+
+    def get_cgroup_limits(self) -> Dict[str, any]:
+        """
+        Zwraca limity CPU i pamięci kontenera/grupy cgroup (v1 lub v2)
+
+        Returns:
+            Słownik z kluczami 'version' (1, 2 lub None), 'cpu_quota' (liczba CPU z
+            limitu czasu procesora), 'cpuset_cpus' (liczba dozwolonych CPU),
+            'memory_bytes' (limit pamięci); None oznacza brak limitu
+        """
+        if self._cgroup_limits is not None:
+            return self._cgroup_limits
+
+        limits = {'version': None, 'cpu_quota': None, 'cpuset_cpus': None, 'memory_bytes': None}
+        if self.system_info['system'] == 'Linux':
+            try:
+                paths = self._get_cgroup_paths()
+                if (self.cgroup_root / 'cgroup.controllers').exists():
+                    limits = self._read_cgroup_v2(paths.get('', '/'))
+                elif paths:
+                    limits = self._read_cgroup_v1(paths)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Błąd odczytu limitów cgroup: {e}")
+
+        self.logger.debug(f"Limity cgroup: {limits}")
+        self._cgroup_limits = limits
+        return limits
+
+    def _read_cgroup_memory_usage(self) -> Optional[int]:
+        """
+        Zużycie pamięci grupy z najniższym limitem (memory.current / memory.usage_in_bytes)
+
+        Nieaktywne strony cache plików (inactive_file) jądro odzyska przed OOM,
+        więc nie liczymy ich jako zajętych.
+        """
+        if self._memory_cgroup is None:
+            return None
+        version, directory = self._memory_cgroup
+        usage_file, inactive_key = (('memory.current', 'inactive_file') if version == 2
+                                    else ('memory.usage_in_bytes', 'total_inactive_file'))
+        usage = self._read_value(directory / usage_file)
+        if usage is None:
+            return None
+        inactive = 0
+        stat = self._read_value(directory / 'memory.stat') or ''
+        for line in stat.splitlines():
+            key, _, value = line.partition(' ')
+            if key == inactive_key:
+                inactive = int(value)
+                break
+        return max(0, int(usage) - inactive)
+
+    def get_memory_status(self) -> Dict[str, int]:
+        """
+        Całkowita i dostępna pamięć w bajtach z uwzględnieniem limitu cgroup
+
+        Przy limicie cgroup dostępna pamięć to limit minus bieżące zużycie grupy
+        (ale nie więcej niż wolna pamięć hosta) - w kontenerze psutil pokazuje RAM hosta.
+
+        Returns:
+            Słownik z kluczami 'total', 'available' i 'limited' (czy obowiązuje limit cgroup)
+        """
+        memory = psutil.virtual_memory()
+        status = {'total': memory.total, 'available': memory.available, 'limited': False}
+        limit = self.get_cgroup_limits()['memory_bytes']
+        if not limit or limit >= memory.total:
+            return status
+
+        status.update(total=limit, limited=True)
+        try:
+            usage = self._read_cgroup_memory_usage()
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Błąd odczytu zużycia pamięci cgroup: {e}")
+            usage = None
+        if usage is not None:
+            status['available'] = min(memory.available, max(0, limit - usage))
+        return status
+
+    def _get_effective_cpus(self) -> Optional[int]:
+        """Liczba CPU dostępnych dla procesu (afinicja, cpuset, limit czasu CPU) lub None"""
+        candidates = []
+        if hasattr(os, 'sched_getaffinity'):
+            try:
+                candidates.append(len(os.sched_getaffinity(0)))
+            except OSError:
+                pass
+
+        limits = self.get_cgroup_limits()
+        if limits['cpuset_cpus']:
+            candidates.append(limits['cpuset_cpus'])
+        if limits['cpu_quota']:
+            # Limit 2.5 CPU pozwala na 3 zadania, ale nie mniej niż 1
+            candidates.append(max(1, math.ceil(limits['cpu_quota'])))
+        return min(candidates) if candidates else None
+
+    def get_effective_cpu_count(self) -> int:
+        """Liczba CPU dostępnych dla procesu (afinicja i limity cgroup), co najmniej 1"""
+        return self._get_effective_cpus() or psutil.cpu_count() or 1
+
+    def get_virtualization(self) -> Dict[str, Optional[str]]:
+        """
+        Wykrywa maszynę wirtualną i kontener
+
+        Returns:
+            Słownik z kluczami 'vm' (np. 'kvm', 'vmware') i 'container' (np. 'docker'),
+            None gdy nie wykryto
+        """
+        if self._virtualization is not None:
+            return self._virtualization
+
+        result = {'vm': None, 'container': None}
+        if self.system_info['system'] != 'Linux':
+            self._virtualization = result
+            return result
+
+        if shutil.which('systemd-detect-virt'):
+            for option, key in (('--vm', 'vm'), ('--container', 'container')):
+                try:
+                    detected = subprocess.run(['systemd-detect-virt', option],
+                                              capture_output=True, text=True, timeout=5)
+                    value = detected.stdout.strip()
+                    if value and value != 'none':
+                        result[key] = value
+                except Exception as e:
+                    self.logger.debug(f"systemd-detect-virt {option} nie działa: {e}")
+
+        if result['container'] is None:
+            if os.path.exists('/.dockerenv'):
+                result['container'] = 'docker'
+            elif os.path.exists('/run/.containerenv'):
+                result['container'] = 'podman'
+            else:
+                cgroup = self._read_value(self.proc_path / '1' / 'cgroup') or ''
+                for name in ('kubepods', 'docker', 'lxc', 'containerd'):
+                    if name in cgroup:
+                        result['container'] = name
+                        break
+
+        if result['vm'] is None:
+            dmi = ' '.join(filter(None, [
+                self._read_value(Path('/sys/class/dmi/id') / name)
+                for name in ('sys_vendor', 'product_name')
+            ])).lower()
+            for marker, name in DMI_HYPERVISORS.items():
+                if marker in dmi:
+                    result['vm'] = name
+                    break
+
+        if result['vm'] is None and result['container'] is None:
+            # Flaga 'hypervisor' w cpuinfo - gość bez DMI (np. Firecracker); w kontenerze
+            # widać flagi hosta, więc tam nie rozstrzyga
+            try:
+                with open(self.proc_path / 'cpuinfo', 'r') as f:
+                    for line in f:
+                        if line.startswith('flags') and ' hypervisor' in line:
+                            result['vm'] = 'hypervisor'
+                            break
+            except OSError:
+                pass
+
+        if result['vm'] or result['container']:
+            self.logger.info(f"Wirtualizacja: maszyna wirtualna {result['vm'] or '-'}, "
+                             f"kontener {result['container'] or '-'}")
+        self._virtualization = result
+        return result
+
     def _get_memory_gb(self) -> int:
-        """Zwraca ilość pamięci RAM w GB"""
+        """Zwraca ilość pamięci RAM w GB (z uwzględnieniem limitu cgroup kontenera)"""
         try:
             memory_bytes = psutil.virtual_memory().total
+            limit = self.get_cgroup_limits()['memory_bytes']
+            if limit and limit < memory_bytes:
+                self.logger.debug(f"Limit pamięci cgroup: {limit} B (host: {memory_bytes} B)")
+                memory_bytes = limit
             memory_gb = round(memory_bytes / (1024**3))
             return memory_gb
         except:
@@ -121,9 +431,23 @@ class HardwareDetector:
                 except:
                     pass
             
+            # W kontenerze psutil widzi wszystkie CPU hosta - ogranicz do limitów
+            host_physical = cpu_count or cpu_count_logical or 1
+            host_logical = cpu_count_logical or host_physical
+            effective_cpus = self._get_effective_cpus()
+            if effective_cpus and effective_cpus < host_logical:
+                cpu_count_logical = effective_cpus
+                cpu_count = min(host_physical, effective_cpus)
+                self.logger.info(f"Limit CPU kontenera/cgroup: {effective_cpus} z {host_logical}")
+            else:
+                cpu_count = host_physical
+                cpu_count_logical = host_logical
+            
             return {
                 'physical_cores': cpu_count,
                 'logical_cores': cpu_count_logical,
+                'host_physical_cores': host_physical,
+                'host_logical_cores': host_logical,
                 'has_avx': has_avx,
                 'has_avx2': has_avx2
             }
@@ -131,6 +455,8 @@ class HardwareDetector:
             return {
                 'physical_cores': 1,
                 'logical_cores': 1,
+                'host_physical_cores': 1,
+                'host_logical_cores': 1,
                 'has_avx': False,
                 'has_avx2': False
             }
@@ -195,7 +521,9 @@ class HardwareDetector:
             'cpu_info': cpu_info,
             'memory_gb': memory_gb,
             'is_rpi': self._is_raspberry_pi(),
-            'is_termux': self._is_termux()
+            'is_termux': self._is_termux(),
+            'cgroup_limits': self.get_cgroup_limits(),
+            'virtualization': self.get_virtualization()
         }
 
 
@@ -210,6 +538,16 @@ if __name__ == "__main__":
     print(f"Pamięć RAM: {info['memory_gb']} GB")
     print(f"Rdzenie fizyczne: {info['cpu_info']['physical_cores']}")
     print(f"Rdzenie logiczne: {info['cpu_info']['logical_cores']}")
+    if info['cpu_info']['host_logical_cores'] != info['cpu_info']['logical_cores']:
+        print(f"Rdzenie hosta: {info['cpu_info']['host_physical_cores']} fizyczne, "
+              f"{info['cpu_info']['host_logical_cores']} logiczne")
+    limits = info['cgroup_limits']
+    if limits['version']:
+        memory = f"{limits['memory_bytes'] / 1024**3:.1f} GB" if limits['memory_bytes'] else "brak"
+        print(f"Cgroup v{limits['version']}: CPU quota {limits['cpu_quota'] or 'brak'}, "
+              f"cpuset {limits['cpuset_cpus'] or 'brak'}, pamięć {memory}")
+    virtualization = info['virtualization']
+    print(f"Maszyna wirtualna: {virtualization['vm'] or 'nie'}, kontener: {virtualization['container'] or 'nie'}")
     
     if info['hardware_type'] == 'x86_linux':
         print(f"Obsługa AVX: {info['cpu_info']['has_avx']}")
@@ -0,0 +1,167 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Graf etapów instalacji - niezależne etapy (klonowanie, zależności, testy flag) działają równolegle
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from logger_config import get_logger
+
+
+class InstallPipeline:
+    """
+    Klasa uruchamiająca etapy instalacji zgodnie z zależnościami między nimi
+
+    Etap startuje, gdy zakończą się wszystkie etapy, od których zależy. Funkcja etapu
+    dostaje słownik wyników wcześniejszych etapów. Wynik False lub None oznacza błąd -
+    pozostałe etapy są wtedy anulowane.
+    """
+
+    def __init__(self):
+        self.logger = get_logger()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.wall_seconds = 0.0
+        self._start = None
+
+    def add_stage(self, name: str, func: Callable[[Dict[str, Any]], Awaitable[Any]],
+                  depends_on: List[str] = None, description: str = ""):
+        """
+        Dodaje etap
+
+        Args:
+            name: nazwa etapu (klucz w wynikach i czasach)
+            func: funkcja async przyjmująca słownik wyników etapów
+            depends_on: nazwy etapów, które muszą zakończyć się sukcesem wcześniej
+            description: opis wyświetlany przy starcie etapu
+        """
+        for dependency in depends_on or []:
+            if dependency not in self.stages:
+                raise ValueError(f"Nieznany etap zależny: {dependency}")
+        self.stages[name] = {
+            'func': func,
+            'depends_on': list(depends_on or []),
+            'description': description or name,
+        }
+
+    @staticmethod
+    def _failed(result: Any) -> bool:
+        return result is False or result is None
+
+    async def _run_stage(self, name: str, tasks: Dict[str, asyncio.Future],
+                         on_start: Optional[Callable[[str, str], None]]) -> Any:
+        stage = self.stages[name]
+        for dependency in stage['depends_on']:
+            if self._failed(await tasks[dependency]):
+                self.timings[name] = {'status': 'pominięty'}
+                return False
+
+        if on_start:
+            on_start(name, stage['description'])
+        started = time.monotonic()
+        self.timings[name] = {'start': started - self._start, 'status': 'w toku'}
+        try:
+            result = await stage['func'](self.results)
+        except asyncio.CancelledError:
+            self._finish_timing(name, started, 'anulowany')
+            raise
+        except Exception as e:
+            self.logger.error(f"Błąd etapu {name}: {e}")
+            result = False
+
+        self.results[name] = result
+        self._finish_timing(name, started, 'błąd' if self._failed(result) else 'ok')
+        return result
+
+    def _finish_timing(self, name: str, started: float, status: str):
+        finished = time.monotonic()
+        self.timings[name].update({
+            'end': finished - self._start,
+            'seconds': finished - started,
+            'status': status,
+        })
+        self.logger.info(f"Etap {name}: {status} ({finished - started:.1f} s)")
+
+    async def run(self, on_start: Callable[[str, str], None] = None) -> bool:
+        """
+        Uruchamia wszystkie etapy (niezależne równolegle)
+
+        Args:
+            on_start: opcjonalna funkcja wywoływana przy starcie etapu (nazwa, opis)
+
+        Returns:
+            True, gdy wszystkie etapy zakończyły się sukcesem
+        """
+        self._start = time.monotonic()
+        tasks: Dict[str, asyncio.Future] = {}
+        # Etapy są dodawane po swoich zależnościach, więc kolejność słownika wystarcza
+        for name in self.stages:
+            tasks[name] = asyncio.ensure_future(self._run_stage(name, tasks, on_start))
+
+        success = True
+        try:
+            for future in asyncio.as_completed(list(tasks.values())):
+                try:
+                    result = await future
+                except asyncio.CancelledError:
+                    continue
+                if self._failed(result):
+                    success = False
+                    break
+        finally:
+            # Po błędzie nie ma sensu czekać np. na klonowanie repozytorium
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            self.wall_seconds = time.monotonic() - self._start
+
+        return success
+
+    def get_report(self) -> List[str]:
+        """Linie raportu czasów etapów i zysku z równoległego wykonania"""
+        lines = []
+        stage_seconds = 0.0
+        for name, timing in self.timings.items():
+            if 'seconds' not in timing:
+                lines.append(f"{name}: {timing['status']}")
+                continue
+            stage_seconds += timing['seconds']
+            lines.append(f"{name}: {timing['seconds']:.1f} s "
+                         f"({timing['start']:.1f} - {timing['end']:.1f} s, {timing['status']})")
+
+        lines.append(f"Czas całkowity: {self.wall_seconds:.1f} s, suma etapów: {stage_seconds:.1f} s")
+        overlap = stage_seconds - self.wall_seconds
+        all_ok = all(timing['status'] == 'ok' for timing in self.timings.values())
+        if all_ok and overlap > 0.05:
+            lines.append(f"Zysk z równoległych etapów: {overlap:.1f} s")
+        return lines
+
+
+if __name__ == "__main__":
+    async def demo_stage(seconds: float):
+        await asyncio.sleep(seconds)
+        return True
+
+    pipeline = InstallPipeline()
+    pipeline.add_stage('zależności', lambda results: demo_stage(0.2))
+    pipeline.add_stage('pobieranie', lambda results: demo_stage(0.5))
+    pipeline.add_stage('flagi', lambda results: demo_stage(0.4))
+    pipeline.add_stage('kompilacja', lambda results: demo_stage(0.3),
+                       depends_on=['zależności', 'pobieranie', 'flagi'])
+
+    print("=== Graf etapów instalacji (demo) ===")
+    print(f"Sukces: {asyncio.run(pipeline.run(lambda name, description: print(f'-> {description}')))}")
+    for line in pipeline.get_report():
+        print(f"  {line}")
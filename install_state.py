@@ -0,0 +1,156 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Stan instalacji z punktami kontrolnymi - wznawianie przerwanej instalacji
+"""
+import hashlib
+import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from logger_config import get_logger
+
+
+STATE_FILE = ".install_state.json"
+STATE_VERSION = 1
+
+
+class InstallState:
+    """
+    Klasa zapisująca postęp instalacji w katalogu instalacji
+
+    Punkty kontrolne: 'dependencies' (sprawdzone zależności), 'source' (commit
+    pobranego llama.cpp) i 'builds' (odcisk konfiguracji CMake, flagi i zbudowane
+    programy dla każdego katalogu buildu). Po udanej instalacji stan jest oznaczany
+    jako zakończony - kolejne uruchomienie zaczyna od nowa.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.logger = get_logger()
+        self.path = Path(base_dir) / STATE_FILE
+
+    def _load(self) -> Dict[str, any]:
+        """Wczytuje stan (pusty, gdy plik nie istnieje, jest uszkodzony lub z innej wersji)"""
+        try:
+            data = json.loads(self.path.read_text())
+            if isinstance(data, dict) and data.get('version') == STATE_VERSION:
+                data.setdefault('checkpoints', {})
+                data['checkpoints'].setdefault('builds', {})
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Nie można wczytać stanu instalacji {self.path}: {e}")
+        return {'version': STATE_VERSION, 'completed': False, 'checkpoints': {'builds': {}}}
+
+    def _save(self, data: Dict[str, any]):
+        """Zapisuje stan atomowo (plik tymczasowy + rename)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+            temp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"Nie można zapisać stanu instalacji {self.path}: {e}")
+
+    def reset(self):
+        """Usuwa wszystkie punkty kontrolne (czysta instalacja)"""
+        self._save({'version': STATE_VERSION, 'completed': False, 'checkpoints': {'builds': {}}})
+
+    def is_completed(self) -> bool:
+        return self._load().get('completed', False)
+
+    def mark_completed(self, completed: bool = True):
+        data = self._load()
+        data['completed'] = completed
+        self._save(data)
+
+    def get(self, checkpoint: str) -> Optional[Dict[str, any]]:
+        """Zwraca punkt kontrolny 'dependencies' lub 'source'"""
+        return self._load()['checkpoints'].get(checkpoint)
+
+    def set(self, checkpoint: str, **values):
+        """Zapisuje punkt kontrolny (z czasem zapisu)"""
+        data = self._load()
+        values['timestamp'] = datetime.now().isoformat(timespec='seconds')
+        data['checkpoints'][checkpoint] = values
+        data['completed'] = False
+        self._save(data)
+
+    def set_source(self, commit: str):
+        """Nowe źródło unieważnia wszystkie buildy"""
+        data = self._load()
+        data['checkpoints']['source'] = {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        }
+        data['checkpoints']['builds'] = {}
+        data['completed'] = False
+        self._save(data)
+
+    def get_source_commit(self) -> Optional[str]:
+        source = self.get('source')
+        return source.get('commit') if source else None
+
+    def get_build(self, build_name: str) -> Optional[Dict[str, any]]:
+        return self._load()['checkpoints']['builds'].get(build_name)
+
+    def update_build(self, build_name: str, **values):
+        """Uzupełnia punkt kontrolny buildu (konfiguracja, kompilacja, zbudowane programy)"""
+        data = self._load()
+        build = data['checkpoints']['builds'].setdefault(build_name, {})
+        build.update(values)
+        build['timestamp'] = datetime.now().isoformat(timespec='seconds')
+        data['completed'] = False
+        self._save(data)
+
+    def remove_build(self, build_name: str):
+        data = self._load()
+        data['checkpoints']['builds'].pop(build_name, None)
+        self._save(data)
+
+    def get_resumable_build(self, build_name: str, fingerprint: str) -> Optional[Dict[str, any]]:
+        """Punkt kontrolny skonfigurowanego buildu o tym samym odcisku lub None"""
+        build = self.get_build(build_name)
+        if build and build.get('configured') and build.get('fingerprint') == fingerprint:
+            return build
+        return None
+
+    @staticmethod
+    def fingerprint(items: List[str]) -> str:
+        """Odcisk konfiguracji (flagi, generator, commit źródła)"""
+        return hashlib.sha256('\n'.join(items).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def read_commit(source_dir: Path) -> Optional[str]:
+        """Commit HEAD repozytorium llama.cpp lub None"""
+        try:
+            result = subprocess.run(['git', '-C', str(source_dir), 'rev-parse', 'HEAD'],
+                                    capture_output=True, text=True, timeout=30)
+        except Exception:
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+
+if __name__ == "__main__":
+    import sys
+
+    state = InstallState(Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd())
+    data = state._load()
+    print(f"=== Stan instalacji: {state.path} ===")
+    print(f"Zakończona: {'tak' if data['completed'] else 'nie'}")
+    for name, checkpoint in data['checkpoints'].items():
+        if name != 'builds':
+            print(f"  {name}: {checkpoint}")
+    for build_name, build in data['checkpoints']['builds'].items():
+        print(f"  build {build_name}: skonfigurowany {build.get('configured')}, "
+              f"zbudowany {build.get('built')}, programy: {', '.join(build.get('built_targets', []))}")
@@ -11,51 +11,189 @@ LinkedIn: https://linkedin.com/in/Fibogacci
 Główny moduł instalatora llama.cpp
 """
 import os
-import subprocess
+import re
 import asyncio
+import functools
 import shutil
 import tempfile
+import time
+import uuid
 import requests
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 
 from hardware_detector import HardwareDetector
 from optimization_configs import OptimizationConfigs
+from microarch import MicroarchResolver
+from toolchain import (ToolchainDetector, write_link_timer, write_compile_timer, read_link_time,
+                       read_link_intervals)
+from build_history import BuildHistory
+from build_location import BuildLocationPlanner
+from background_build import BackgroundBuildPolicy
+from package_manager import PackageManager
+from install_pipeline import InstallPipeline
+from install_state import InstallState
+from process_manager import ProcessManager, STAGE_TIMEOUTS
+from output_channel import OutputChannel, strip_markup
+from output_capture import OutputCapture
+from progress_model import ProgressModel, parse_progress
+from build_trace import BuildTrace
+from build_telemetry import BuildTelemetry
+from build_report import BuildReport, write_build_profile, preserve_timing_files
+from build_watchdog import BuildWatchdog
+from build_verification import BuildVerifier, ISA_BISECT_OPTIONS, explicit_isa_flags, disable_isa_groups
 from logger_config import setup_logging, get_logger, get_installer_logger
 from translations import t
 
 
+# Plik w katalogu buildu z flagami CPU wymaganymi do jego uruchomienia
+ISA_REQUIREMENTS_FILE = ".isa_requirements"
+
+# Katalog obok usuwanego drzewa - rename jest natychmiastowy, kasowanie idzie w tle
+TRASH_DIR_NAME = ".llamacpp-trash"
+
 class LlamaInstaller:
     """Klasa do instalacji llama.cpp"""
     
     def __init__(self, install_dir: str = None, gui_callback=None):
         self.console = Console()
-        self.detector = HardwareDetector()
-        self.hardware_info = self.detector.get_detailed_info()
+        self.trace = BuildTrace()  # Oś czasu etapów i zadań kompilacji (Chrome trace)
+        # Wykrywanie sprzętu uruchamia podprocesy (systemd-detect-virt, lscpu) - nie w konstruktorze,
+        # tylko w detect_async() albo przy pierwszym użyciu hardware_info
+        self.detector = None
+        self._hardware_info = None
+        self._progress = None
         self.base_dir = Path(install_dir or os.getcwd())
         self.install_dir = self.base_dir / "llama.cpp"
         self.logger = get_logger()
         self.installer_logger = get_installer_logger()
         self.gui_callback = gui_callback  # Callback do wysyłania komunikatów do GUI
+        self.last_build_output = []  # Istotne linie wyjścia ostatniego kroku CMake (klasyfikacja błędów)
+        self.applied_fallbacks = []  # Kroki drabiny zapasowej użyte w ostatniej kompilacji
+        self.toolchain_info = {}  # Linker i tryb LTO ostatniej kompilacji
+        self.cmake_generator = None  # Generator CMake (None = domyślny)
+        self.background_policy = None  # Ograniczenia kompilacji w tle (None = pełna prędkość)
+        self.package_manager = PackageManager()  # Wsadowe sprawdzanie zależności z cache sesji
+        self._cleanup_tasks = []  # Usuwanie katalogów z kosza w tle
+        self.process_manager = ProcessManager()  # Procesy potomne w osobnych grupach (anulowanie, limity czasu)
+        self.install_state = InstallState(self.base_dir)  # Punkty kontrolne do wznawiania instalacji
+        self._state_build = None  # Nazwa buildu zapisywanego w stanie (None = build poza drzewem)
+        self._state_fingerprint = None  # Odcisk konfiguracji bieżącego buildu
+        self.telemetry = None  # Telemetria bieżącej kompilacji (panel na żywo w GUI)
+        
+        # Kanał komunikatów - wyjście narzędzi trafia do odbiorców paczkami, nie linia po linii
+        self.output = OutputChannel()
+        self.output.subscribe(self._write_console)
+        self.output.subscribe(self._write_output_log, interval=1.0, collapse=False, kinds=['build'])
+        if self.gui_callback:
+            self.output.subscribe(self._write_gui, interval=0.1)
+    
+    def detect(self) -> Dict[str, any]:
+        """Wykrywa sprzęt (blokująco) - w pętli zdarzeń używaj detect_async()"""
+        if self._hardware_info is None:
+            self.trace.begin('detection')
+            detector = HardwareDetector()
+            hardware_info = detector.get_detailed_info()
+            self.detector = detector
+            self._hardware_info = hardware_info
+            self.trace.end('detection', hardware_type=hardware_info['hardware_type'])
+        return self._hardware_info
+    
+    async def detect_async(self) -> Dict[str, any]:
+        """Wykrywa sprzęt w puli wątków, nie blokując pętli zdarzeń (GUI)"""
+        return await self._run_blocking(self.detect)
+    
+    @property
+    def detected(self) -> bool:
+        """Sprzęt został już wykryty (odczyt hardware_info nie zablokuje pętli)"""
+        return self._hardware_info is not None
+    
+    @property
+    def hardware_info(self) -> Dict[str, any]:
+        """Informacje o sprzęcie (wykrywane przy pierwszym użyciu, jeśli nie wywołano detect_async)"""
+        return self.detect()
+    
+    @property
+    def progress(self) -> ProgressModel:
+        """Postęp i czas pozostały z wyjścia narzędzi i historii poprzednich instalacji"""
+        if self._progress is None:
+            self._progress = ProgressModel(self.hardware_info['hardware_type'],
+                                           self.hardware_info['cpu_info']['physical_cores'])
+        return self._progress
+    
+    @progress.setter
+    def progress(self, progress: ProgressModel):
+        self._progress = progress
     
     def _print(self, message: str, color: str = None, progress: int = None):
         """Wysyła komunikat zarówno do konsoli jak i GUI"""
-        if color:
-            console_message = f"[{color}]{message}[/{color}]"
-        else:
-            console_message = message
-            
-        self.console.print(console_message)
-        
-        if self.gui_callback:
+        self.output.publish(message, color, progress)
+    
+    def _print_output(self, line: str, color: str = None, progress: int = None):
+        """Wysyła linię wyjścia narzędzia (git, CMake, kompilacja) - buforowaną i zwijaną"""
+        self.output.publish(line, color, progress, kind='build')
+    
+    def begin_progress(self, hardware_type: str):
+        """Nowy model postępu dla instalacji profilu hardware_type"""
+        self.progress = ProgressModel(hardware_type, self.hardware_info['cpu_info']['physical_cores'])
+        eta = self.progress.eta()
+        source = "historia poprzednich instalacji" if self.progress.from_history else "wartości domyślne"
+        self._print(f"Szacowany czas instalacji: {ProgressModel.format_seconds(eta)} ({source})", "cyan",
+                    progress=0)
+    
+    def _begin_stage(self, stage: str, track_progress: bool = True):
+        """Początek etapu: przedział na osi czasu i etap modelu postępu"""
+        self.trace.begin(stage)
+        if track_progress:
+            self.progress.start_stage(stage)
+    
+    def _end_stage(self, stage: str, track_progress: bool = True, record: bool = True):
+        """Udany koniec etapu (record=False - bez zapisu czasu w historii)"""
+        self.trace.end(stage)
+        if track_progress:
+            self.progress.finish_stage(stage, record=record)
+    
+    def write_trace(self) -> Optional[Path]:
+        """Zapisuje oś czasu instalacji obok logów (chrome://tracing, ui.perfetto.dev)"""
+        path = self.trace.write(self.base_dir / "logs")
+        if path:
+            self._print(f"Oś czasu instalacji: {path}", "dim")
+        return path
+    
+    def _print_failure_report(self, capture: OutputCapture):
+        """Pokazuje fragment pierwszego błędu i ostatnie linie wyjścia (UI i log)"""
+        report = capture.get_failure_report()
+        for line in report:
+            self.output.publish(line, 'dim', kind='report')
+        if report:
+            self.logger.error("Raport błędu:\n" + '\n'.join(report))
+    
+    def _new_capture(self, name: str) -> OutputCapture:
+        """Przechwytywanie wyjścia z pełną kopią w katalogu logów instalacji"""
+        return OutputCapture(name, self.base_dir / "logs")
+    
+    def _write_console(self, events: List[dict]):
+        for event in events:
+            if event['kind'] != 'message':
+                # Wyjście narzędzi może zawierać nawiasy kwadratowe - bez interpretacji markup
+                self.console.print(event['message'], style=event['color'], markup=False, highlight=False)
+            elif event['color']:
+                self.console.print(f"[{event['color']}]{event['message']}[/{event['color']}]")
+            else:
+                self.console.print(event['message'])
+    
+    def _write_output_log(self, events: List[dict]):
+        self.installer_logger.log_build_output(event['message'] for event in events)
+    
+    def _write_gui(self, events: List[dict]):
+        for event in events:
             # Usuń markup Rich dla GUI
-            import re
-            clean_message = re.sub(r'\[/?[a-z_]+\]', '', message)
+            clean_message = strip_markup(event['message']) if event['kind'] == 'message' else event['message']
             try:
-                self.gui_callback(clean_message, progress)
+                self.gui_callback(clean_message, event['progress'])
             except TypeError:
                 # Fallback dla starszego callback bez progress
                 self.gui_callback(clean_message)
@@ -85,16 +223,79 @@ class LlamaInstaller:
         
         self.console.print(Panel(panel_content, title="Informacje o sprzęcie", expand=False))
     
+    def cancel(self):
+        """Anuluje instalację - zabija bieżące polecenie (git, cmake, kompilatory) w ciągu sekundy"""
+        self.logger.warning("Anulowanie instalacji")
+        self.process_manager.cancel()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self.process_manager.cancelled
+    
+    @staticmethod
+    def _describe_failure(message: str, result: dict) -> str:
+        """Komunikat błędu polecenia z przyczyną (anulowanie, limit czasu, kod wyjścia)"""
+        if result['cancelled']:
+            return f"{message} - anulowano"
+        if result['timed_out']:
+            return f"{message} - przekroczono limit czasu"
+        return f"{message} - kod wyjścia: {result['returncode']}"
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Uruchamia blokującą funkcję w puli wątków, nie zatrzymując pętli zdarzeń"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    
+    @staticmethod
+    def _delete_trash(target: Path):
+        """Kasuje katalog z kosza i sam kosz, jeśli jest pusty"""
+        shutil.rmtree(target, ignore_errors=True)
+        try:
+            target.parent.rmdir()
+        except OSError:
+            pass  # W koszu są jeszcze inne katalogi
+    
+    async def _remove_tree(self, path: Path):
+        """
+        Usuwa katalog bez blokowania pętli zdarzeń
+        
+        Katalog jest przenoszony do kosza na tym samym systemie plików (rename),
+        a kasowanie wielu GB plików odbywa się w tle - wait_for_cleanup() czeka na koniec.
+        """
+        if not path.exists():
+            return
+        
+        trash_dir = path.parent / TRASH_DIR_NAME
+        target = trash_dir / f"{path.name}-{uuid.uuid4().hex[:8]}"
+        try:
+            trash_dir.mkdir(exist_ok=True)
+            path.rename(target)
+        except OSError as e:
+            self.logger.debug(f"Nie można przenieść {path} do kosza: {e} - usuwam bezpośrednio")
+            await self._run_blocking(shutil.rmtree, path, ignore_errors=True)
+            return
+        
+        self.logger.debug(f"Przeniesiono {path} do kosza {target}")
+        self._cleanup_tasks.append(asyncio.ensure_future(self._run_blocking(self._delete_trash, target)))
+    
+    async def wait_for_cleanup(self):
+        """Czeka na zakończenie usuwania katalogów w tle"""
+        tasks, self._cleanup_tasks = self._cleanup_tasks, []
+        if tasks:
+            self.logger.debug(f"Oczekiwanie na usunięcie {len(tasks)} katalogów z kosza")
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def check_dependencies(self, hardware_type: str) -> Tuple[bool, List[str]]:
         """Sprawdza czy wymagane zależności są zainstalowane"""
         self.logger.info(f"Sprawdzanie zależności dla typu sprzętu: {hardware_type}")
         required_deps = OptimizationConfigs.get_dependencies(hardware_type)
         self.installer_logger.log_dependencies(required_deps)
         
+        status = self.package_manager.check(required_deps)
         missing_deps = []
         
         for dep in required_deps:
-            if not self._check_command_exists(dep):
+            if not status[dep]:
                 missing_deps.append(dep)
                 self.logger.warning(f"Brakująca zależność: {dep}")
             else:
@@ -107,30 +308,6 @@ class LlamaInstaller:
             
         return len(missing_deps) == 0, missing_deps
     
-    def _check_command_exists(self, command: str) -> bool:
-        """Sprawdza czy komenda istnieje w systemie"""
-        # build-essential to pakiet, nie komenda - sprawdź gcc/g++
-        if command == 'build-essential':
-            return shutil.which('gcc') is not None and shutil.which('g++') is not None
-        
-        # Pakiety *-dev nie mają komend - sprawdź przez dpkg
-        dev_packages = {
-            'libopenblas-dev': 'libopenblas-dev',
-            'libomp-dev': 'libomp-dev', 
-            'libvulkan-dev': 'libvulkan-dev'
-        }
-        
-        if command in dev_packages:
-            try:
-                result = subprocess.run(['dpkg', '-l', command], 
-                                      capture_output=True, text=True)
-                return result.returncode == 0 and 'ii' in result.stdout
-            except:
-                return False
-        
-        
-        return shutil.which(command) is not None
-    
     def install_dependencies(self, hardware_type: str) -> bool:
         """Instaluje wymagane zależności"""
         self.logger.info("Rozpoczęcie instalacji zależności")
@@ -148,6 +325,23 @@ class LlamaInstaller:
         else:
             return self._install_linux_dependencies(missing_deps)
     
+    async def check_dependencies_async(self, hardware_type: str) -> Tuple[bool, List[str]]:
+        """check_dependencies w puli wątków (zapytania menedżera pakietów i próbne linkowanie)"""
+        self._begin_stage('dependencies')
+        result = await self._run_blocking(self.check_dependencies, hardware_type)
+        self._end_stage('dependencies')
+        return result
+    
+    async def install_dependencies_async(self, hardware_type: str) -> bool:
+        """install_dependencies w puli wątków (np. 'pkg install' w Termux trwa minuty)"""
+        self._begin_stage('dependencies')
+        result = await self._run_blocking(self.install_dependencies, hardware_type)
+        if result:
+            self._end_stage('dependencies')
+        else:
+            self.trace.end('dependencies', status='błąd')
+        return result
+    
     def _install_termux_dependencies(self, missing_deps: List[str]) -> bool:
         """Instaluje zależności w Termux"""
         self.logger.info(f"Instalacja zależności Termux: {missing_deps}")
@@ -159,24 +353,30 @@ class LlamaInstaller:
             ) as progress:
                 task = progress.add_task("Instalowanie zależności Termux...", total=None)
                 
-                cmd = ['pkg', 'install', '-y'] + missing_deps
+                packages = [package for dep in missing_deps
+                            for package in self.package_manager.get_package_names(dep)]
+                cmd = ['pkg', 'install', '-y'] + packages
                 self.logger.debug(f"Wykonywanie komendy: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = self.process_manager.run_sync(cmd, timeout=STAGE_TIMEOUTS['dependencies'])
                 
                 progress.stop()
                 
-                if result.returncode == 0:
+                if result['timed_out']:
+                    self._print("Przekroczono limit czasu instalacji zależności Termux", "red")
+                    return False
+                if result['returncode'] == 0:
+                    PackageManager.clear_cache()
                     self._print("Zależności Termux zainstalowane pomyślnie", "green")
                     self.logger.info("Zależności Termux zainstalowane pomyślnie")
-                    if result.stdout:
-                        self.logger.debug(f"Stdout: {result.stdout}")
+                    if result['stdout']:
+                        self.logger.debug(f"Stdout: {result['stdout']}")
                     return True
                 else:
-                    self._print(f"Błąd instalacji zależności: {result.stderr}", "red")
-                    self.logger.error(f"Błąd instalacji zależności Termux - kod: {result.returncode}")
-                    self.logger.error(f"Stderr: {result.stderr}")
-                    if result.stdout:
-                        self.logger.debug(f"Stdout: {result.stdout}")
+                    self._print(f"Błąd instalacji zależności: {result['stderr']}", "red")
+                    self.logger.error(f"Błąd instalacji zależności Termux - kod: {result['returncode']}")
+                    self.logger.error(f"Stderr: {result['stderr']}")
+                    if result['stdout']:
+                        self.logger.debug(f"Stdout: {result['stdout']}")
                     return False
                     
         except Exception as e:
@@ -189,20 +389,11 @@ class LlamaInstaller:
         self._print(f"\n{t('dependencies_not_installed')}", "yellow")
         self._print(f"{t('install_dependencies_manually')}\n", "cyan")
         
-        # Wykryj system operacyjny i pokaż odpowiednie komendy
-        if os.path.exists('/etc/apt/sources.list'):
-            # Ubuntu/Debian
-            self._print("sudo apt update", "green")
-            deps_str = ' '.join(missing_deps)
-            self._print(f"sudo apt install -y {deps_str}", "green")
-        elif os.path.exists('/etc/yum.conf'):
-            # CentOS/RHEL/Fedora
-            deps_str = ' '.join(missing_deps)
-            self._print(f"sudo yum install -y {deps_str}", "green")
-        elif os.path.exists('/etc/pacman.conf'):
-            # Arch Linux
-            deps_str = ' '.join(missing_deps)
-            self._print(f"sudo pacman -S --noconfirm {deps_str}", "green")
+        # Polecenia dla wykrytego menedżera pakietów (z natywnymi nazwami pakietów)
+        commands = self.package_manager.get_install_commands(missing_deps)
+        if commands:
+            for command in commands:
+                self._print(command, "green")
         else:
             self._print("Nie wykryto znanego menedżera pakietów", "yellow")
             self._print("Zainstaluj ręcznie następujące pakiety:")
@@ -220,65 +411,112 @@ class LlamaInstaller:
             if self.install_dir.exists():
                 self._print(f"Katalog {self.install_dir} już istnieje, usuwam...", "yellow")
                 self.logger.info(f"Usuwanie istniejącego katalogu: {self.install_dir}")
-                shutil.rmtree(self.install_dir)
+                await self._remove_tree(self.install_dir)
             
+            # --progress: postęp pobierania także bez terminala (model postępu)
             cmd = [
-                'git', 'clone', 
+                'git', 'clone', '--progress',
                 'https://github.com/ggerganov/llama.cpp.git',
                 str(self.install_dir)
             ]
             
             self.logger.debug(f"Wykonywanie komendy: {' '.join(cmd)}")
             self._print("Klonowanie repozytorium z GitHub...")
-            
-            # Asynchroniczne uruchomienie procesu z widocznym wyjściem
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT  # Przekieruj stderr do stdout dla lepszego wyświetlania
-            )
+            self._begin_stage('download')
             
             # Odczytuj i wyświetlaj wyjście w czasie rzeczywistym
-            output_lines = []
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_text = line.decode().strip()
-                if line_text:
-                    # Wyświetl linie z git w czasie rzeczywistym
-                    self._print(f"  {line_text}", "dim")
-                    output_lines.append(line_text)
-                    self.logger.debug(f"Git output: {line_text}")
-            
-            await process.wait()
-            full_output = '\n'.join(output_lines)
-            
-            if process.returncode == 0:
-                self._print(f"Llama.cpp pobrane do {self.install_dir}", "green")
+            capture = self._new_capture('git_clone')
+            
+            def on_line(line_text):
+                # Wyświetl linie z git w czasie rzeczywistym
+                self.progress.update_from_line('download', line_text)
+                self._print_output(f"  {line_text}", "dim", progress=self.progress.percent())
+                capture.append(line_text)
+            
+            # Anulowanie etapu (np. brak zależności) zabija git razem z procesami potomnymi
+            try:
+                result = await self.process_manager.run(cmd, on_line, timeout=STAGE_TIMEOUTS['clone'])
+            finally:
+                capture.close()
+            
+            if result['returncode'] == 0:
+                capture.close(keep=False)
+                self._end_stage('download')
+                self._print(f"Llama.cpp pobrane do {self.install_dir}", "green", progress=self.progress.percent())
                 self.logger.info(f"Pomyślnie pobrano llama.cpp do {self.install_dir}")
-                if full_output:
-                    self.logger.debug(f"Git output: {full_output}")
+                commit = await self._run_blocking(InstallState.read_commit, self.install_dir)
+                if commit:
+                    self.install_state.set_source(commit)
                 return True
             else:
-                self._print(f"Błąd pobierania - kod wyjścia: {process.returncode}", "red")
-                self.logger.error(f"Błąd pobierania llama.cpp - kod: {process.returncode}")
-                if full_output:
-                    self.logger.error(f"Git output: {full_output}")
+                self.trace.end('download', status='błąd')
+                self._print(self._describe_failure("Błąd pobierania", result), "red")
+                self.logger.error(f"Błąd pobierania llama.cpp - kod: {result['returncode']}")
+                self._print_failure_report(capture)
                 return False
-                    
+        
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             self._print(f"Błąd podczas pobierania: {e}", "red")
             self.installer_logger.log_error_with_context(e, "Pobieranie llama.cpp z GitHub")
             return False
     
-    async def compile_llama_cpp(self, hardware_type: str, custom_config: str = None) -> bool:
-        """Kompiluje llama.cpp z odpowiednimi optymalizacjami (asynchronicznie)"""
+    def _resolve_microarch(self, march: str, compiler: str = None) -> Optional[dict]:
+        """Wyznacza flagi mikroarchitektury ('auto' = wykryj z /proc/cpuinfo)"""
+        resolver = MicroarchResolver(compiler)
+        if march == 'auto':
+            return resolver.resolve()
+        return resolver.validate(march)
+    
+    def _get_hardware_class(self, hardware_type: str) -> str:
+        """Klucz klasy sprzętu dla zapamiętanych preferencji (profil + mikroarchitektura)"""
+        microarch = MicroarchResolver().resolve()
+        return f"{hardware_type}:{microarch['name']}" if microarch else hardware_type
+    
+    def _resolve_compiler(self, hardware_type: str, compiler: str = None) -> Optional[dict]:
+        """
+        Wybiera kompilator: jawnie podany lub zwycięzca wcześniejszego porównania
+        
+        Returns:
+            Słownik z ToolchainDetector.detect_compilers() lub None (domyślny kompilator CMake)
+        """
+        detector = ToolchainDetector()
+        if compiler:
+            return detector.find_compiler(compiler)
+        
+        preferred = BuildHistory().get_preference(self._get_hardware_class(hardware_type), 'compiler')
+        if preferred:
+            compiler_info = detector.find_compiler(preferred)
+            if compiler_info:
+                self._print(f"Kompilator z wcześniejszego porównania: {preferred}", "cyan")
+                return compiler_info
+            self.logger.warning(f"Zapamiętany kompilator {preferred} nie jest zainstalowany")
+        return None
+    
+    async def compile_llama_cpp(self, hardware_type: str, custom_config: str = None,
+                                march: str = None, build_name: str = "build",
+                                compiler: str = None, unity: bool = False,
+                                build_location: str = None, background: bool = False,
+                                cmake_flags: List[str] = None, relocatable: bool = False) -> bool:
+        """
+        Kompiluje llama.cpp z odpowiednimi optymalizacjami (asynchronicznie)
+        
+        Args:
+            cmake_flags: flagi profilu wyznaczone wcześniej (np. równolegle z klonowaniem);
+                None - wyznacz z hardware_type/custom_config
+            relocatable: build zostanie przeniesiony (np. zwycięzca porównania kompilatorów),
+                więc RPATH musi być względny
+        """
         self.logger.info(f"Rozpoczęcie kompilacji llama.cpp dla typu sprzętu: {hardware_type}")
         if custom_config:
             self.logger.info(f"Użyta własna konfiguracja: {custom_config}")
+        if march:
+            self.logger.info(f"Żądana mikroarchitektura: {march}")
+        if compiler:
+            self.logger.info(f"Żądany kompilator: {compiler}")
         
+        build_dir = final_dir = None
         try:
             # Sprawdź czy katalog llama.cpp istnieje przed kompilacją
             if not self.install_dir.exists():
@@ -289,32 +527,98 @@ class LlamaInstaller:
             # Nie zmieniamy katalogu roboczego - używamy absolutnych ścieżek
             self.logger.debug(f"Katalog llama.cpp: {self.install_dir}")
             
-            # Utwórz katalog build
-            build_dir = self.install_dir / "build"
-            if build_dir.exists():
-                self.logger.debug("Usuwanie istniejącego katalogu build")
-                shutil.rmtree(build_dir)
+            # Utwórz katalog build (może leżeć poza katalogiem instalacji, np. w tmpfs)
+            final_dir = self.install_dir / build_name
+            build_dir = await self._run_blocking(self._plan_build_dir, build_name, build_location)
             
-            # Utwórz katalog build z lepszą obsługą błędów
-            try:
-                build_dir.mkdir(parents=True, exist_ok=True)
-                self.logger.debug(f"Utworzono katalog build: {build_dir}")
-                
-                # Sprawdź czy katalog naprawdę istnieje
-                if not build_dir.exists():
-                    raise FileNotFoundError(f"Katalog build nie został utworzony: {build_dir}")
-                    
-                # Krótka pauza aby upewnić się że katalog jest dostępny
-                import time
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Błąd tworzenia katalogu build: {e}")
-                self._print(f"Błąd tworzenia katalogu build: {e}", "red")
+            # Pobierz flagi CMAKE (profil 'dynamic' uruchamia testy kompilacji - w puli wątków)
+            if cmake_flags is None:
+                cmake_flags = await self._run_blocking(OptimizationConfigs.get_cmake_flags,
+                                                       hardware_type, custom_config)
+            cmake_flags = list(cmake_flags)
+            
+            # Wybór kompilatora (GCC/Clang)
+            compiler_info = await self._run_blocking(self._resolve_compiler, hardware_type, compiler)
+            if compiler and compiler_info is None:
+                self._print(f"Nie znaleziono kompilatora: {compiler}", "red")
+                return False
+            compiler_cc = compiler_info['cc'] if compiler_info else None
+            if compiler_info:
+                self._print(f"Kompilator: {compiler_info['name']} ({compiler_info['family']} {compiler_info['version']})", "cyan")
+                cmake_flags = OptimizationConfigs.set_option(cmake_flags, 'CMAKE_C_COMPILER', compiler_info['cc'])
+                cmake_flags = OptimizationConfigs.set_option(cmake_flags, 'CMAKE_CXX_COMPILER', compiler_info['cxx'])
+            
+            # Maszyna wirtualna może migrować na host bez instrukcji wykrytych przy kompilacji
+            vm = (self.hardware_info.get('virtualization') or {}).get('vm')
+            if (vm and not march and not custom_config
+                    and self.hardware_info['system_info']['machine'].lower() in ('x86_64', 'amd64')
+                    and OptimizationConfigs.uses_native(cmake_flags)
+                    and not OptimizationConfigs.uses_backend_variants(cmake_flags)):
+                self._print(f"Maszyna wirtualna ({vm}): warianty backendu CPU zamiast GGML_NATIVE", "yellow")
+                self.logger.warning(f"Wykryto maszynę wirtualną {vm} - kompilacja bez GGML_NATIVE")
+                cmake_flags = OptimizationConfigs.apply_backend_variants(cmake_flags)
+            
+            # Jawne flagi -march/-mtune zamiast GGML_NATIVE
+            if march and OptimizationConfigs.uses_backend_variants(cmake_flags):
+                self._print("Pomijam --march: warianty backendu CPU dobierają ISA w czasie działania", "yellow")
+                self.logger.warning("Ignorowanie march dla buildu z GGML_CPU_ALL_VARIANTS")
+            elif march:
+                microarch = await self._run_blocking(self._resolve_microarch, march, compiler_cc)
+                if microarch is None and march != 'auto':
+                    self._print(f"Kompilator nie obsługuje mikroarchitektury: {march}", "red")
+                    return False
+                if microarch:
+                    self._print(f"Mikroarchitektura: {microarch['name']} ({microarch['flags']})", "cyan")
+                    cmake_flags = OptimizationConfigs.apply_microarch(cmake_flags, microarch['flags'],
+                                                                      microarch.get('cpu_flags'))
+            
+            # Najszybszy dostępny linker i równoległe LTO
+            cores = self.hardware_info['cpu_info']['physical_cores']
+            toolchain = ToolchainDetector(compiler_cc)
+            cmake_flags, self.toolchain_info = await self._run_blocking(toolchain.get_cmake_flags, cmake_flags, cores)
+            self.toolchain_info['compiler_name'] = compiler_info['name'] if compiler_info else 'default'
+            self.toolchain_info['compiler_version'] = await self._run_blocking(toolchain.get_compiler_version)
+            
+            # Tryb w tle: nice/ionice, cgroup systemd, mniej zadań i limit load average
+            self.background_policy = BackgroundBuildPolicy(cores, self.detector) if background else None
+            if self.background_policy:
+                description = await self._run_blocking(self.background_policy.describe)
+                self._print(f"Kompilacja w tle: {description}", "cyan")
+            
+            # Ninja zamiast Makefile, opcjonalnie unity build (bez kerneli CPU)
+            self.cmake_generator = toolchain.select_generator()
+            self.toolchain_info['generator'] = (self.cmake_generator
+                                                or os.environ.get('CMAKE_GENERATOR', 'Unix Makefiles'))
+            self._print(f"Generator CMake: {self.toolchain_info['generator']}", "cyan")
+            if unity and not toolchain.supports_unity_exclusion():
+                self._print("Unity build wymaga CMake >= 3.19 - pomijam", "yellow")
+                unity = False
+            
+            # Wznowienie przerwanej kompilacji: ta sama konfiguracja i źródło w tym samym katalogu
+            fingerprint = InstallState.fingerprint(cmake_flags + [
+                f"generator={self.toolchain_info['generator']}", f"unity={unity}",
+                f"source={self.install_state.get_source_commit()}"])
+            resumed = None
+            if build_dir == final_dir and (build_dir / "CMakeCache.txt").exists():
+                resumed = self.install_state.get_resumable_build(build_name, fingerprint)
+            self._state_build = build_name if build_dir == final_dir else None
+            
+            if resumed:
+                self._print(f"Wznawiam kompilację {build_name} - konfiguracja bez zmian "
+                            f"(zbudowane programy: {len(resumed.get('built_targets', []))})", "cyan")
+                self.logger.info(f"Wznowienie buildu {build_name} z punktu kontrolnego {fingerprint}")
+            elif not await self._prepare_build_dir(build_dir):
                 return False
+            else:
+                self.install_state.remove_build(build_name)
+            self._state_fingerprint = fingerprint
+            
+            if unity and not resumed:
+                cmake_flags = cmake_flags + toolchain.get_unity_flags(build_dir)
+            self.toolchain_info['unity'] = unity
+            if self.toolchain_info['linker'] != 'default':
+                self._print(f"Linker: {self.toolchain_info['linker']}", "cyan")
             
-            # Pobierz flagi CMAKE
-            cmake_flags = OptimizationConfigs.get_cmake_flags(hardware_type, custom_config)
             self.installer_logger.log_compilation_flags(cmake_flags)
             
             self._print("Kompilacja z flagami optymalizacji:", "cyan")
@@ -322,149 +626,773 @@ class LlamaInstaller:
                 self._print(f"  {flag}")
             self._print("")  # Pusta linia dla czytelności
             
-            # Konfiguracja CMake
-            self._print("Konfiguracja CMake...")
-            cmake_cmd = ['cmake', '-B', str(build_dir), '-S', str(self.install_dir)] + cmake_flags
-            self.logger.debug(f"Wykonywanie komendy CMake: {' '.join(cmake_cmd)}")
-            self.logger.debug(f"Katalog build: {build_dir} (istnieje: {build_dir.exists()})")
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmake_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT  # Przekieruj stderr do stdout
-            )
-            
-            # Czytaj output w czasie rzeczywistym
-            stdout_lines = []
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                line_text = line.decode().strip()
-                if line_text:
-                    # Filtruj ważne komunikaty CMAKE
-                    if any(keyword in line_text.lower() for keyword in ['found', 'not found', 'enabled', 'disabled', 'configuring', 'generating', 'build files']):
-                        self._print(f"CMAKE: {line_text}")
-                    stdout_lines.append(line_text)
-            
-            await process.wait()
-            
-            if process.returncode != 0:
-                self._print("Błąd konfiguracji CMake", "red")
-                self.logger.error("Błąd konfiguracji CMake")
+            if build_dir != final_dir or relocatable:
+                cmake_flags = cmake_flags + ['-DCMAKE_BUILD_RPATH_USE_ORIGIN=ON']
+            
+            # Pomiar czasu linkowania (launcher linkera, CMake >= 3.21)
+            if toolchain.supports_link_timer() and not resumed:
+                link_timer = write_link_timer(build_dir)
+                cmake_flags = cmake_flags + [f'-DCMAKE_C_LINKER_LAUNCHER={link_timer}',
+                                             f'-DCMAKE_CXX_LINKER_LAUNCHER={link_timer}']
+            
+            # Czasy kompilacji plików dla 'build-report' - Ninja zapisuje je sam w .ninja_log
+            if ('Ninja' not in self.toolchain_info['generator'] and not resumed
+                    and OptimizationConfigs.get_option(cmake_flags, 'CMAKE_CXX_COMPILER_LAUNCHER') is None):
+                compile_timer = write_compile_timer(build_dir)
+                cmake_flags = cmake_flags + [f'-DCMAKE_C_COMPILER_LAUNCHER={compile_timer}',
+                                             f'-DCMAKE_CXX_COMPILER_LAUNCHER={compile_timer}']
+            
+            build_start = time.monotonic()
+            if resumed:
+                # Flagi z punktu kontrolnego zawierają już kroki zapasowe i ścieżki buildu
+                cmake_flags = await self._build_with_fallbacks(build_dir, resumed['flags'], configured=True,
+                                                               fallbacks=resumed.get('fallbacks', []))
+            else:
+                cmake_flags = await self._build_with_fallbacks(build_dir, cmake_flags)
+            if cmake_flags is None:
                 return False
+            await self._run_blocking(self._report_build_times, hardware_type, build_dir,
+                                     time.monotonic() - build_start, build_name)
+            await self._run_blocking(self._report_build_hotspots, build_dir)
             
-            self._print("Konfiguracja CMake zakończona pomyślnie", "green")
+            # Sprawdź czy pliki wykonywalne zostały utworzone
+            main_executable = build_dir / "bin" / "llama-cli"
+            if not main_executable.exists():
+                main_executable = build_dir / "llama-cli"
             
-            # Kompilacja
-            cores = self.hardware_info['cpu_info']['physical_cores']
-            self._print(f"Rozpoczynam kompilację na {cores} rdzeniach...", "cyan")
-            make_cmd = ['cmake', '--build', str(build_dir), '--config', 'Release', '-j', str(cores)]
-            self.logger.debug(f"Wykonywanie komendy kompilacji: {' '.join(make_cmd)}")
-            self.logger.debug(f"Katalog build dla kompilacji: {build_dir} (istnieje: {build_dir.exists()})")
-            
-            process = await asyncio.create_subprocess_exec(
-                *make_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT  # Przekieruj stderr do stdout
-            )
-            
-            # Czytaj output kompilacji w czasie rzeczywistym
-            compile_lines = []
-            compile_progress = 70  # Startowy progress dla kompilacji
-            total_files_estimate = 100  # Estymacja liczby plików do kompilacji
-            compiled_files = 0
-            
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                line_text = line.decode().strip()
-                if line_text:
-                    compile_lines.append(line_text)
-                    
-                    # Szukaj wskaźników postępu
-                    show_line = False
-                    current_progress = compile_progress
-                    
-                    # Aktualizuj postęp na podstawie zawartości linii
-                    if any(keyword in line_text.lower() for keyword in ['building', 'linking', 'compiling']):
-                        compiled_files += 1
-                        # Oblicz postęp (70% -> 90% podczas kompilacji)
-                        progress_increment = min(20, (compiled_files / total_files_estimate) * 20)
-                        current_progress = 70 + progress_increment
-                        show_line = True
-                    elif any(keyword in line_text.lower() for keyword in ['error', 'warning']):
-                        show_line = True
-                    elif '[' in line_text and '%' in line_text:
-                        # Szukaj procentowego postępu w formacie [XX%]
-                        import re
-                        percent_match = re.search(r'\[(\d+)%\]', line_text)
-                        if percent_match:
-                            percent = int(percent_match.group(1))
-                            current_progress = 70 + (percent * 0.2)  # 70% -> 90%
-                            show_line = True
-                    
-                    if show_line:
-                        self._print(f"MAKE: {line_text}", progress=int(current_progress))
+            if main_executable.exists():
+                self._print(f"Główny plik wykonywalny: {main_executable}", "green")
             
-            await process.wait()
+            # Test dymny - build z niedostępnymi instrukcjami kończy się SIGILL
+            self._begin_stage('verify')
+            cmake_flags = await self._verify_build(build_dir, cmake_flags)
+            if cmake_flags is None:
+                self.trace.end('verify', status='błąd')
+                return False
             
-            if process.returncode == 0:
-                self._print("Kompilacja zakończona pomyślnie!", "green")
-                self.logger.info("Kompilacja zakończona pomyślnie")
-                
-                # Sprawdź czy pliki wykonywalne zostały utworzone
-                main_executable = build_dir / "bin" / "llama-cli"
-                if not main_executable.exists():
-                    main_executable = build_dir / "llama-cli"
-                
-                if main_executable.exists():
-                    self._print(f"Główny plik wykonywalny: {main_executable}", "green")
-                
-                return True
-            else:
-                self._print("Błąd kompilacji", "red")
-                self.logger.error("Błąd kompilacji")
+            if not await self._verify_features(build_dir, cmake_flags):
+                self.trace.end('verify', status='błąd')
                 return False
+            self._end_stage('verify')
+            
+            self._write_isa_requirements(build_dir, cmake_flags)
+            write_build_profile(build_dir, cmake_flags, self.toolchain_info, hardware_type)
+            self._update_build_state(verified=True)
+            
+            if build_dir != final_dir:
+                await self._move_build_artifacts(build_dir, final_dir)
+            return True
                     
         except Exception as e:
             self._print(f"Błąd podczas kompilacji: {e}", "red")
             self.installer_logger.log_error_with_context(e, "Kompilacja llama.cpp")
             return False
+        finally:
+            # Drzewo kompilacji poza katalogiem instalacji (np. tmpfs) nie może zostać po błędzie
+            if build_dir is not None and build_dir != final_dir and build_dir.exists():
+                self.logger.info(f"Usuwanie tymczasowego katalogu kompilacji: {build_dir}")
+                await self._remove_tree(build_dir)
     
-    def create_wrapper_scripts(self) -> bool:
-        """Tworzy wygodne skrypty uruchamiające"""
+    async def _prepare_build_dir(self, build_dir: Path) -> bool:
+        """Tworzy pusty katalog build (istniejący jest usuwany w tle)"""
+        if build_dir.exists():
+            self.logger.debug("Usuwanie istniejącego katalogu build")
+            await self._remove_tree(build_dir)
+        
+        try:
+            build_dir.mkdir(parents=True, exist_ok=True)
+            self.logger.debug(f"Utworzono katalog build: {build_dir}")
+        except Exception as e:
+            self.logger.error(f"Błąd tworzenia katalogu build: {e}")
+            self._print(f"Błąd tworzenia katalogu build: {e}", "red")
+            return False
+        return True
+    
+    def _report_telemetry(self, telemetry: BuildTelemetry):
+        """Podsumowanie zasobów kompilacji, surowe próbki w logs/ i liczniki na osi czasu"""
+        if not telemetry.samples:
+            return
+        for sample in telemetry.samples:
+            timestamp = telemetry.start + sample['time']
+            self.trace.add_counter('CPU %', timestamp, {'cpu': sample['cpu_percent']})
+            self.trace.add_counter('Pamięć kompilacji MB', timestamp,
+                                   {'rss': round(sample['tree_rss_bytes'] / 1024**2, 1)})
+        
+        summary = telemetry.get_summary()
+        for line in BuildTelemetry.format_summary(summary):
+            self._print(line, "cyan")
+        path = telemetry.write(self.base_dir / "logs")
+        if summary:
+            self.logger.info(f"Telemetria kompilacji: {summary} (próbki: {path})")
+    
+    def _report_build_hotspots(self, build_dir: Path):
+        """Równoległość, ścieżka krytyczna i najwolniejsze pliki kompilacji (pełny raport: build-report)"""
         try:
-            # Znajdź pliki wykonywalne
-            build_dir = self.install_dir / "build"
-            bin_dir = build_dir / "bin"
+            report = BuildReport(build_dir).analyze(top=3)
+        except Exception as e:
+            self.logger.debug(f"Nie można przeanalizować czasów kompilacji: {e}")
+            return
+        if not report:
+            return
+        self._print(f"Równoległość kompilacji: {report['parallelism']:.1f} "
+                    f"(ścieżka krytyczna {report['critical_path_seconds']:.0f} s z {report['wall_seconds']:.0f} s)",
+                    "cyan")
+        self._print("Najwolniejsze pliki:", "cyan")
+        for entry in report['slowest']:
+            self._print(f"  {entry['seconds']:.1f} s  {entry['output']}")
+        self.logger.info(f"Raport kompilacji: {report['jobs']} zadań, równoległość {report['parallelism']}, "
+                         f"ścieżka krytyczna {report['critical_path_seconds']} s "
+                         f"({report['critical_path_method']})")
+    
+    def _update_build_state(self, **values):
+        """Zapisuje punkt kontrolny bieżącego buildu (tylko dla buildu w katalogu instalacji)"""
+        if self._state_build:
+            self.install_state.update_build(self._state_build, **values)
+    
+    def _report_build_times(self, hardware_type: str, build_dir: Path, build_seconds: float,
+                            build_name: str = "build"):
+        """Wypisuje czas kompilacji i linkowania oraz zysk względem innego linkera"""
+        if 'linker' in self.applied_fallbacks:
+            self.toolchain_info['linker'] = 'default'
+        if 'unity' in self.applied_fallbacks:
+            self.toolchain_info['unity'] = False
+        
+        linker = self.toolchain_info.get('linker', 'default')
+        lto = self.toolchain_info.get('lto', False)
+        link_seconds = read_link_time(build_dir)
+        
+        summary = f"Czas kompilacji: {build_seconds:.1f} s"
+        if link_seconds is not None:
+            summary += f", linkowanie: {link_seconds:.1f} s (linker: {linker}, LTO: {'tak' if lto else 'nie'})"
+        self._print(summary, "cyan")
+        
+        history = BuildHistory()
+        previous = [
+            build for build in history.get_builds(hardware_type=hardware_type, lto=lto)
+            if build.get('linker') != linker and build.get('link_seconds')
+        ]
+        if link_seconds is not None and previous:
+            baseline = previous[-1]
+            gain = baseline['link_seconds'] - link_seconds
+            self._print(f"Linkowanie z {baseline['linker']}: {baseline['link_seconds']:.1f} s -> "
+                        f"zysk {gain:.1f} s ({gain / baseline['link_seconds'] * 100:.0f}%)", "green" if gain > 0 else "yellow")
+        
+        history.record_build({
+            'hardware_type': hardware_type,
+            'build_name': build_name,
+            'compiler': self.toolchain_info.get('compiler'),
+            'compiler_name': self.toolchain_info.get('compiler_name'),
+            'compiler_version': self.toolchain_info.get('compiler_version'),
+            'linker': linker,
+            'lto': lto,
+            'build_seconds': round(build_seconds, 1),
+            'link_seconds': round(link_seconds, 2) if link_seconds is not None else None,
+            'generator': self.toolchain_info.get('generator'),
+            'unity': self.toolchain_info.get('unity', False),
+            'fallbacks': list(self.applied_fallbacks),
+        })
+        
+        # Ostatni czas kompilacji dla każdego trybu (generator, unity) tego profilu
+        modes = {}
+        for build in history.get_builds(hardware_type=hardware_type,
+                                        compiler_name=self.toolchain_info.get('compiler_name')):
+            if build.get('build_seconds'):
+                mode = build.get('generator') or 'Unix Makefiles'
+                if build.get('unity'):
+                    mode += ' + unity'
+                modes[mode] = build['build_seconds']
+        if len(modes) > 1:
+            self._print(f"Czasy kompilacji {hardware_type} według trybu:", "cyan")
+            for mode, seconds in sorted(modes.items(), key=lambda item: item[1]):
+                self._print(f"  {mode}: {seconds:.1f} s")
+            self._print(f"Najszybszy tryb: {min(modes, key=modes.get)}", "green")
+    
+    def _plan_build_dir(self, build_name: str, build_location: str = None) -> Path:
+        """
+        Wyznacza katalog kompilacji
+        
+        Args:
+            build_location: None/'install' - w katalogu llama.cpp, 'auto' - najszybsza
+                lokalizacja z BuildLocationPlanner, inna wartość - podana ścieżka
+        """
+        final_dir = self.install_dir / build_name
+        if not build_location or build_location == 'install':
+            return final_dir
+        
+        if build_location == 'auto':
+            self._print("Pomiar szybkości zapisu lokalizacji kompilacji...", "cyan")
+            plan = BuildLocationPlanner(self.base_dir).plan()
+            for candidate in plan['candidates']:
+                if candidate['fits']:
+                    self._print(f"  {candidate['path']}: {candidate['sequential_mbps']} MB/s sekwencyjnie, "
+                                f"{candidate['random_mbps']} MB/s losowo")
+                else:
+                    self._print(f"  {candidate['path']}: pominięto - {candidate['reason']}")
+            location = plan['path']
+        else:
+            location = Path(build_location)
+        
+        if location.resolve() == self.base_dir.resolve():
+            return final_dir
+        
+        self._print(f"Kompilacja w: {location}", "cyan")
+        # CMAKE_BUILD_RPATH_USE_ORIGIN - pliki działają po przeniesieniu
+        return location / f"llamacpp-{os.getpid()}-{build_name}"
+    
+    async def _move_build_artifacts(self, build_dir: Path, final_dir: Path):
+        """Przenosi pliki wykonywalne, biblioteki i znacznik ISA do katalogu instalacji"""
+        self._print(f"Przenoszenie plików wynikowych do {final_dir}...", "cyan")
+        await self._remove_tree(final_dir)
+        final_dir.mkdir(parents=True)
+        
+        bin_dir = build_dir / "bin"
+        if bin_dir.exists():
+            # Między systemami plików (np. z tmpfs) move kopiuje dane
+            await self._run_blocking(shutil.move, str(bin_dir), str(final_dir / "bin"))
+        marker = build_dir / ISA_REQUIREMENTS_FILE
+        if marker.exists():
+            shutil.copy2(str(marker), str(final_dir / ISA_REQUIREMENTS_FILE))
+        # Czasy zadań i profil dla 'build-report'
+        preserve_timing_files(build_dir, final_dir)
+        
+        await self._remove_tree(build_dir)
+        self.logger.info(f"Przeniesiono pliki z {build_dir} do {final_dir}")
+    
+    async def _build_with_fallbacks(self, build_dir: Path, cmake_flags: List[str], configured: bool = False,
+                                    fallbacks: List[str] = None) -> Optional[List[str]]:
+        """
+        Konfiguruje i kompiluje, schodząc po drabinie konfiguracji zapasowych
+        
+        Po rozpoznanym błędzie (LTO, BLAS, OpenMP, CURL) build jest
+        rekonfigurowany w tym samym katalogu, więc obiekty niezależne od
+        zmienionych opcji nie są kompilowane ponownie.
+        
+        Args:
+            configured: build jest już skonfigurowany tymi flagami (wznowienie)
+            fallbacks: kroki zapasowe zastosowane wcześniej (wznowienie)
+        
+        Returns:
+            Flagi CMAKE udanego buildu lub None
+        """
+        self.applied_fallbacks = list(fallbacks or [])
+        
+        # Czas zapisujemy tylko dla kompilacji od zera (nie wznowionej, nie po kroku zapasowym)
+        record_timing = not configured
+        if configured:
+            self.progress.skip_stage('configure')
+        
+        while True:
+            if ((configured or await self._configure_cmake(build_dir, cmake_flags))
+                    and await self._build_cmake(build_dir, record_timing=record_timing)):
+                break
+            configured = False
+            record_timing = False
+            
+            if self.cancelled:
+                # Przerwany proces wygląda jak błąd kompilacji - nie próbuj konfiguracji zapasowych
+                return None
+            
+            step = OptimizationConfigs.classify_build_failure(cmake_flags, self.last_build_output)
+            if step is None:
+                self.logger.error("Nie rozpoznano przyczyny błędu - brak konfiguracji zapasowej")
+                return None
+            
+            self._print(f"Konfiguracja zapasowa: {step['description']} - ponawiam kompilację", "yellow")
+            self.logger.warning(f"Zastosowano krok zapasowy '{step['name']}': {step['options']}")
+            cmake_flags = OptimizationConfigs.apply_fallback(cmake_flags, step)
+            self.applied_fallbacks.append(step['name'])
+            self.installer_logger.log_compilation_flags(cmake_flags)
+        
+        if self.applied_fallbacks:
+            self._print(f"Użyte konfiguracje zapasowe: {', '.join(self.applied_fallbacks)}", "yellow")
+        return cmake_flags
+    
+    async def _configure_cmake(self, build_dir: Path, cmake_flags: List[str],
+                               track_progress: bool = True) -> bool:
+        """
+        Konfiguruje build CMake (ponowne wywołanie zachowuje skompilowane obiekty)
+        
+        Args:
+            track_progress: licz postęp etapu 'configure' (False np. dla prób bisekcji ISA)
+        """
+        self._print("Konfiguracja CMake...")
+        self._begin_stage('configure', track_progress)
+        cmake_cmd = ['cmake', '-B', str(build_dir), '-S', str(self.install_dir)]
+        if self.cmake_generator:
+            cmake_cmd += ['-G', self.cmake_generator]
+        cmake_cmd += cmake_flags
+        self.logger.debug(f"Wykonywanie komendy CMake: {' '.join(cmake_cmd)}")
+        self.logger.debug(f"Katalog build: {build_dir} (istnieje: {build_dir.exists()})")
+        
+        # Czytaj output w czasie rzeczywistym
+        capture = self._new_capture('cmake_configure')
+        
+        def on_line(line_text):
+            # Filtruj ważne komunikaty CMAKE
+            if any(keyword in line_text.lower() for keyword in ['found', 'not found', 'enabled', 'disabled', 'configuring', 'generating', 'build files']):
+                self._print_output(f"CMAKE: {line_text}")
+            capture.append(line_text)
+        
+        try:
+            result = await self.process_manager.run(cmake_cmd, on_line, timeout=STAGE_TIMEOUTS['configure'])
+        finally:
+            capture.close()
+        self.last_build_output = capture.get_lines()
+        
+        if result['returncode'] != 0:
+            self.trace.end('configure', status='błąd')
+            self._print(self._describe_failure("Błąd konfiguracji CMake", result), "red")
+            self.logger.error("Błąd konfiguracji CMake")
+            self._print_failure_report(capture)
+            return False
+        
+        capture.close(keep=False)
+        self._end_stage('configure', track_progress)
+        self._print("Konfiguracja CMake zakończona pomyślnie", "green", progress=self.progress.percent())
+        self._update_build_state(fingerprint=self._state_fingerprint, configured=True, built=False,
+                                 flags=cmake_flags, fallbacks=list(self.applied_fallbacks))
+        return True
+    
+    async def _build_cmake(self, build_dir: Path, track_progress: bool = True, record_timing: bool = True) -> bool:
+        """
+        Kompiluje skonfigurowany build CMake
+        
+        Args:
+            track_progress: licz postęp etapu 'build' (False np. dla prób bisekcji ISA)
+            record_timing: zapisz czas w historii (False dla kompilacji przyrostowej)
+        """
+        cores = self.hardware_info['cpu_info']['physical_cores']
+        if self.background_policy:
+            cores = self.background_policy.get_jobs()
+        self._print(f"Rozpoczynam kompilację na {cores} rdzeniach...", "cyan")
+        make_cmd = ['cmake', '--build', str(build_dir), '--config', 'Release', '-j', str(cores)]
+        if self.background_policy:
+            make_cmd = self.background_policy.wrap_command(
+                make_cmd + ['--'] + self.background_policy.get_native_tool_args())
+        self.logger.debug(f"Wykonywanie komendy kompilacji: {' '.join(make_cmd)}")
+        self.logger.debug(f"Katalog build dla kompilacji: {build_dir} (istnieje: {build_dir.exists()})")
+        self._begin_stage('build', track_progress)
+        build_started = time.time()
+        if track_progress:
+            if 'build' in self.progress.from_history:
+                eta = ProgressModel.format_seconds(self.progress.stage_remaining('build'))
+                self._print(f"Szacowany czas kompilacji: {eta} (na podstawie poprzednich instalacji)", "cyan")
+        
+        # Czytaj output kompilacji w czasie rzeczywistym
+        capture = self._new_capture('cmake_build')
+        
+        def on_line(line_text):
+            capture.append(line_text)
             
-            if not bin_dir.exists():
-                bin_dir = build_dir
+            # Postęp z wyjścia ninja ([n/N]) lub make ([NN%])
+            show_line = (self.progress.update_from_line('build', line_text) if track_progress
+                         else parse_progress(line_text) is not None)
+            if not show_line:
+                show_line = any(keyword in line_text.lower() for keyword in
+                                ['building', 'linking', 'compiling', 'error', 'warning'])
+            
+            if show_line:
+                self._print_output(f"MAKE: {line_text}", progress=self.progress.percent())
+        
+        # Watchdog pamięci i temperatury (wstrzymuje procesy kompilatora) i telemetria zasobów
+        watchdogs = []
+        samplers = []
+        
+        def on_start(process):
+            watchdog = BuildWatchdog(process.pid, detector=self.detector)
+            watchdogs.append((watchdog, asyncio.ensure_future(watchdog.run())))
+            self.telemetry = BuildTelemetry(process.pid, detector=self.detector)
+            samplers.append((self.telemetry, asyncio.ensure_future(self.telemetry.run())))
+        
+        try:
+            result = await self.process_manager.run(make_cmd, on_line, timeout=STAGE_TIMEOUTS['build'],
+                                                    on_start=on_start)
+        finally:
+            capture.close()
+            for sampler, sampler_task in watchdogs + samplers:
+                sampler.stop()
+                sampler_task.cancel()
+                try:
+                    await sampler_task
+                except asyncio.CancelledError:
+                    pass
+            self.telemetry = None
+        
+        for telemetry, _ in samplers:
+            self._report_telemetry(telemetry)
+        self.last_build_output = capture.get_lines()
+        
+        # Zadania ninja i linkowania tego uruchomienia na osi czasu
+        jobs = self.trace.add_ninja_log(build_dir / ".ninja_log", build_started)
+        self.trace.add_link_intervals(read_link_intervals(build_dir), since=build_started)
+        if jobs:
+            self.logger.debug(f"Oś czasu: {jobs} zadań ninja")
+        
+        bin_dir = build_dir / "bin"
+        built_targets = sorted(path.name for path in bin_dir.iterdir()) if bin_dir.is_dir() else []
+        self._update_build_state(built=result['returncode'] == 0, built_targets=built_targets)
+        
+        pauses = [event for watchdog, _ in watchdogs for event in watchdog.events
+                  if event['action'] == 'wstrzymano']
+        if pauses:
+            self._print(f"Watchdog wstrzymywał kompilację {len(pauses)} raz(y) "
+                        f"(brak pamięci lub przegrzanie) - szczegóły w logu", "yellow")
+        
+        if result['returncode'] != 0:
+            self.trace.end('build', status='błąd')
+            self._print(self._describe_failure("Błąd kompilacji", result), "red")
+            self.logger.error("Błąd kompilacji")
+            self._print_failure_report(capture)
+            return False
+        
+        capture.close(keep=False)
+        self._end_stage('build', track_progress, record=record_timing)
+        self._print("Kompilacja zakończona pomyślnie!", "green", progress=self.progress.percent())
+        self.logger.info("Kompilacja zakończona pomyślnie")
+        return True
+    
+    async def _run_self_test(self, build_dir: Path) -> dict:
+        """Uruchamia test dymny buildu poza pętlą zdarzeń"""
+        verifier = BuildVerifier(build_dir, process_manager=self.process_manager)
+        return await self._run_blocking(verifier.run_self_test)
+    
+    async def _verify_build(self, build_dir: Path, cmake_flags: List[str]) -> Optional[List[str]]:
+        """
+        Uruchamia test dymny; przy SIGILL zawęża flagi ISA bisekcją
+        
+        Returns:
+            Flagi CMAKE działającego buildu lub None
+        """
+        self._print("Test dymny zbudowanych plików...", "cyan")
+        report = await self._run_self_test(build_dir)
+        
+        if report['passed']:
+            self._print("Test dymny zakończony pomyślnie", "green")
+            return cmake_flags
+        
+        if not report['sigill']:
+            # Brak testów ggml lub błąd niezwiązany z ISA - nie blokuj instalacji
+            self._print("Test dymny nie powiódł się (bez SIGILL) - szczegóły w logu", "yellow")
+            for result in report['results']:
+                self.logger.warning(f"{result['command']}: {result['returncode']}\n{result['output'][-2000:]}")
+            return cmake_flags
+        
+        self._print("Build używa instrukcji niedostępnych na tym CPU (SIGILL)", "red")
+        if self.hardware_info['system_info']['machine'].lower() not in ['x86_64', 'amd64']:
+            self._print("Bisekcja flag ISA jest dostępna tylko dla x86 - użyj --march z niższą architekturą", "red")
+            return None
+        
+        return await self._bisect_isa_flags(build_dir, cmake_flags)
+    
+    async def _verify_features(self, build_dir: Path, cmake_flags: List[str]) -> bool:
+        """Sprawdza, czy ścieżki SIMD/BLAS/OpenMP z flag CMAKE są aktywne, i uruchamia testy CPU"""
+        loop = asyncio.get_event_loop()
+        verifier = BuildVerifier(build_dir, process_manager=self.process_manager)
+        
+        self._print("Weryfikacja cech buildu (system_info)...", "cyan")
+        check = await loop.run_in_executor(None, verifier.check_features, cmake_flags)
+        if not check['checked']:
+            self._print("Nie udało się odczytać system_info - pomijam weryfikację cech", "yellow")
+        elif check['mismatches']:
+            self._print("Build nie ma aktywnych funkcji wymaganych przez konfigurację:", "red")
+            for mismatch in check['mismatches']:
+                self._print(f"  {mismatch}", "red")
+            self._print("Sprawdź log CMake (np. brak biblioteki BLAS/OpenMP)", "red")
+            return False
+        else:
+            self._print("Cechy buildu zgodne z konfiguracją", "green")
+        
+        cores = self.hardware_info['cpu_info']['physical_cores']
+        self._print("Testy backendu CPU (ctest)...", "cyan")
+        ctest = await loop.run_in_executor(None, verifier.run_ctest, cores)
+        if ctest is None:
+            self._print("Build bez testów ctest - pomijam", "yellow")
+        elif not ctest['passed']:
+            self._print("Testy backendu CPU zakończone błędem", "red")
+            self.logger.error(f"Wyjście ctest:\n{ctest['output'][-4000:]}")
+            return False
+        else:
+            self._print("Testy backendu CPU zakończone pomyślnie", "green")
+        
+        return True
+    
+    async def _bisect_isa_flags(self, build_dir: Path, cmake_flags: List[str]) -> Optional[List[str]]:
+        """
+        Szuka najmniejszego zestawu wyłączonych grup ISA, przy którym build działa
+        
+        Grupy wyłączane są od najbardziej zaawansowanych (AVX512 -> F16C),
+        każda próba to rekonfiguracja i przyrostowa kompilacja w tym samym katalogu.
+        """
+        cpu_flags = MicroarchResolver().get_cpu_flags()
+        flags = explicit_isa_flags(cmake_flags, cpu_flags)
+        groups = [
+            (name, options) for name, options in ISA_BISECT_OPTIONS
+            if any(OptimizationConfigs.get_option(flags, option) == 'ON' for option in options)
+        ]
+        
+        results = {}
+        if flags == cmake_flags:
+            results[0] = False
+        built = {'k': 0 if flags == cmake_flags else None}
+        
+        async def passes(k: int) -> bool:
+            if k in results:
+                return results[k]
+            disabled = ', '.join(name for name, _ in groups[:k]) or 'brak'
+            self._print(f"Bisekcja ISA: wyłączone grupy: {disabled}", "cyan")
+            trial_flags = disable_isa_groups(flags, groups[:k])
+            ok = (await self._configure_cmake(build_dir, trial_flags, track_progress=False)
+                  and await self._build_cmake(build_dir, track_progress=False))
+            if ok:
+                report = await self._run_self_test(build_dir)
+                ok = not report['sigill']
+            built['k'] = k
+            results[k] = ok
+            return ok
+        
+        if not await passes(len(groups)):
+            self._print("Build kończy się SIGILL nawet bez rozszerzeń AVX/AVX512 - przerywam", "red")
+            self.logger.error(f"Bisekcja ISA nie znalazła działającej konfiguracji: {flags}")
+            return None
+        
+        low, high = 0, len(groups)
+        while low < high:
+            middle = (low + high) // 2
+            if await passes(middle):
+                high = middle
+            else:
+                low = middle + 1
+        
+        final_flags = disable_isa_groups(flags, groups[:low])
+        if built['k'] != low:
+            # Ostatnia próba zbudowała inną konfigurację - odbuduj zwycięską
+            if not (await self._configure_cmake(build_dir, final_flags, track_progress=False)
+                    and await self._build_cmake(build_dir, track_progress=False)):
+                return None
+        
+        disabled_options = [option for _, options in groups[:low] for option in options]
+        if disabled_options:
+            self._print(f"Wyłączone flagi ISA: {', '.join(disabled_options)}", "yellow")
+        self._print("Build działa po dostosowaniu flag ISA", "green")
+        self.logger.info(f"Bisekcja ISA: wyłączono {disabled_options}, flagi: {final_flags}")
+        self.installer_logger.log_compilation_flags(final_flags)
+        return final_flags
+    
+    async def compare_compilers(self, hardware_type: str, bench_model: str, custom_config: str = None,
+                                march: str = None, build_name: str = "build", unity: bool = False,
+                                build_location: str = None, background: bool = False,
+                                cmake_flags: List[str] = None) -> bool:
+        """
+        Buduje llama.cpp najnowszym GCC i Clang, porównuje je llama-bench i zostawia szybszy build
+        
+        Zwycięzca jest zapamiętywany dla klasy sprzętu i używany w kolejnych
+        kompilacjach bez --compiler.
+        """
+        candidates = ToolchainDetector().select_compare_candidates()
+        if len(candidates) < 2:
+            self._print("Do porównania potrzebne są GCC i Clang - kompiluję dostępnym kompilatorem", "yellow")
+            return await self.compile_llama_cpp(hardware_type, custom_config, march, build_name,
+                                                unity=unity, build_location=build_location,
+                                                background=background, cmake_flags=cmake_flags)
+        
+        loop = asyncio.get_event_loop()
+        cores = self.hardware_info['cpu_info']['physical_cores']
+        results = []
+        
+        for candidate in candidates:
+            candidate_build = f"{build_name}-{candidate['name']}"
+            self._print(f"Porównanie kompilatorów: {candidate['name']} {candidate['version']}", "cyan")
+            if not await self.compile_llama_cpp(hardware_type, custom_config, march,
+                                                candidate_build, candidate['name'], unity, build_location,
+                                                background, cmake_flags, relocatable=True):
+                self._print(f"Kompilacja {candidate['name']} nie powiodła się - pomijam", "yellow")
+                continue
+            
+            verifier = BuildVerifier(self.install_dir / candidate_build, timeout=900,
+                                     process_manager=self.process_manager)
+            scores = await loop.run_in_executor(None, verifier.run_bench, bench_model, cores)
+            if scores:
+                self._print(f"{candidate['name']}: przetwarzanie promptu {scores['pp']:.1f} t/s, "
+                            f"generowanie {scores['tg']:.1f} t/s")
+            results.append((candidate, candidate_build, scores))
+        
+        if not results:
+            self._print("Żaden kompilator nie zbudował llama.cpp", "red")
+            return False
+        
+        measured = [result for result in results if result[2]]
+        if measured:
+            # Średnia geometryczna - oba etapy wnioskowania mają równą wagę
+            winner = max(measured, key=lambda result: (result[2]['pp'] * result[2]['tg']) ** 0.5)
+            hardware_class = await self._run_blocking(self._get_hardware_class, hardware_type)
+            history = BuildHistory()
+            history.set_preference(hardware_class, 'compiler', winner[0]['name'])
+            history.set_preference(hardware_class, 'compiler_benchmark', {
+                candidate['name']: dict(scores, version=candidate['version'])
+                for candidate, _, scores in measured
+            })
+            self._print(f"Szybszy kompilator: {winner[0]['name']} (zapamiętany dla {hardware_class})", "green")
+        else:
+            winner = results[0]
+            self._print("Benchmark nie powiódł się - zostawiam pierwszy udany build", "yellow")
+        
+        # Zostaw tylko zwycięski build pod docelową nazwą
+        target_dir = self.install_dir / build_name
+        await self._remove_tree(target_dir)
+        for candidate, candidate_build, _ in results:
+            if candidate_build != winner[1]:
+                await self._remove_tree(self.install_dir / candidate_build)
+        await self._run_blocking(shutil.move, str(self.install_dir / winner[1]), str(target_dir))
+        self.logger.info(f"Build {winner[1]} przeniesiony do {target_dir}")
+        
+        # Przeniesiony katalog ma w CMakeCache ścieżki kandydata - nie nadaje się do wznowienia
+        for _, candidate_build, _ in results:
+            self.install_state.remove_build(candidate_build)
+        self.install_state.remove_build(build_name)
+        return True
+    
+    def _get_bin_dir(self, build_name: str = "build") -> Path:
+        """Zwraca katalog z plikami wykonywalnymi buildu"""
+        build_dir = self.install_dir / build_name
+        bin_dir = build_dir / "bin"
+        if not bin_dir.exists():
+            bin_dir = build_dir
+        return bin_dir
+    
+    def _write_isa_requirements(self, build_dir: Path, cmake_flags: List[str]):
+        """Zapisuje flagi CPU wymagane przez build (używane przez launcher)"""
+        required = MicroarchResolver().get_required_cpu_flags(cmake_flags)
+        (build_dir / ISA_REQUIREMENTS_FILE).write_text(' '.join(required) + '\n')
+        self.logger.info(f"Wymagane flagi CPU dla {build_dir.name}: {required}")
+    
+    def _find_variant_builds(self) -> List[Tuple[str, List[str]]]:
+        """
+        Zwraca buildy zainstalowane obok siebie (build, build-*) z wymaganymi flagami CPU,
+        od najbardziej wymagającego
+        """
+        builds = []
+        for build_dir in sorted(self.install_dir.glob("build*")):
+            if not build_dir.is_dir():
+                continue
+            requirements_file = build_dir / ISA_REQUIREMENTS_FILE
+            if requirements_file.exists():
+                required = requirements_file.read_text().split()
+            else:
+                # Build bez znacznika (starsza instalacja) - tylko jako ostatni wybór
+                required = None
+            builds.append((build_dir.name, required))
+        
+        builds.sort(key=lambda build: -1 if build[1] is None else len(build[1]), reverse=True)
+        return [(name, required or []) for name, required in builds]
+    
+    def detect_runtime_cpu_variant(self) -> Optional[str]:
+        """Sprawdza, który wariant backendu CPU ggml ładuje na tym hoście"""
+        bin_dir = self._get_bin_dir()
+        executable = bin_dir / "llama-cli"
+        if not executable.exists() or not list(bin_dir.glob("libggml-cpu-*.so")):
+            return None
+        
+        env = dict(os.environ)
+        env['LD_LIBRARY_PATH'] = f"{bin_dir}:{env.get('LD_LIBRARY_PATH', '')}"
+        try:
+            result = self.process_manager.run_sync([str(executable), '--version'], timeout=30,
+                                                   cwd=str(bin_dir), env=env)
+        except Exception as e:
+            self.logger.warning(f"Nie można uruchomić {executable}: {e}")
+            return None
+        
+        match = re.search(r'loaded CPU backend from \S*libggml-cpu-([\w.]+)\.so',
+                          result['stdout'] + result['stderr'])
+        if match:
+            self.logger.info(f"Wariant backendu CPU w czasie działania: {match.group(1)}")
+            return match.group(1)
+        return None
+    
+    def _generate_launcher(self, name: str, builds: List[Tuple[str, List[str]]]) -> str:
+        """
+        Generuje launcher wybierający najbardziej wydajny build zgodny z CPU
+
+        Flagi CPU są czytane raz na uruchomienie systemu (cache z boot_id),
+        a wybór buildu używa wyłącznie wbudowanych poleceń powłoki.
+        """
+        candidates = []
+        for build_name, required in builds:
+            rel_bin_dir = self._get_bin_dir(build_name).relative_to(self.install_dir)
+            candidates.append(f"pick {rel_bin_dir} {' '.join(required)}".rstrip())
+        pick_chain = " ||\n   ".join(candidates)
+        
+        return f"""#!/bin/sh
+# Launcher dla {name} - wybiera build zgodny z ISA tego CPU
+cd "$(dirname "$0")" || exit 1
+
+# Flagi CPU z /proc/cpuinfo, zapamiętane do ponownego uruchomienia systemu
+# (katalog użytkownika; plik cudzego właściciela jest ignorowany)
+cache_dir="${{XDG_RUNTIME_DIR:-${{XDG_CACHE_HOME:-$HOME/.cache}}}}"
+cache="$cache_dir/llamacpp-cpuflags"
+boot_id=
+{{ read -r boot_id < /proc/sys/kernel/random/boot_id; }} 2>/dev/null
+cached_boot=
+flags=
+if [ -O "$cache" ] && [ -r "$cache" ]; then
+    read -r cached_boot flags < "$cache"
+fi
+if [ -z "$boot_id" ] || [ "$cached_boot" != "$boot_id" ]; then
+    flags=
+    while IFS= read -r line; do
+        case "$line" in
+            flags*|Features*) flags=${{line#*:}}; break ;;
+        esac
+    done < /proc/cpuinfo
+    if [ -n "$boot_id" ]; then
+        {{ mkdir -p "$cache_dir" && printf '%s %s\\n' "$boot_id" "$flags" > "$cache"; }} 2>/dev/null
+    fi
+fi
+flags=" $flags "
+
+# pick KATALOG_BIN [WYMAGANE_FLAGI...]
+pick() {{
+    bin=$1
+    shift
+    for flag in "$@"; do
+        case "$flags" in
+            *" $flag "*) ;;
+            *) return 1 ;;
+        esac
+    done
+    [ -x "$bin/{name}" ]
+}}
+
+if {pick_chain}; then
+    LD_LIBRARY_PATH="$PWD/$bin${{LD_LIBRARY_PATH:+:$LD_LIBRARY_PATH}}"
+    export LD_LIBRARY_PATH
+    exec "./$bin/{name}" "$@"
+fi
+
+echo "{name}: brak buildu zgodnego z tym CPU (uniknięto SIGILL)" >&2
+exit 132
+"""
+    
+    def create_wrapper_scripts(self) -> bool:
+        """Tworzy launchery wybierające build zgodny z CPU"""
+        self.trace.begin('wrappers')
+        try:
+            builds = self._find_variant_builds()
+            self.logger.info(f"Buildy dostępne dla launchera: {builds}")
             
             executables = []
             for name in ["llama-cli", "llama-server", "llama-simple"]:
-                exe_path = bin_dir / name
-                if exe_path.exists():
-                    executables.append((name, exe_path))
+                if any((self._get_bin_dir(build_name) / name).exists() for build_name, _ in builds):
+                    executables.append(name)
             
             if not executables:
                 self._print("Nie znaleziono plików wykonywalnych", "yellow")
                 return False
             
-            # Utwórz wrapper scripts w katalogu głównym
-            for name, exe_path in executables:
+            # Utwórz launchery w katalogu głównym
+            for name in executables:
                 wrapper_path = self.install_dir / f"{name}.sh"
-                # Użyj względnej ścieżki względem katalogu skryptu
-                rel_exe_path = exe_path.relative_to(self.install_dir)
-                wrapper_content = f"""#!/bin/bash
-# Wrapper script dla {name}
-cd "$(dirname "$0")"
-exec "./{rel_exe_path}" "$@"
-"""
                 with open(wrapper_path, 'w') as f:
-                    f.write(wrapper_content)
+                    f.write(self._generate_launcher(name, builds))
                 
                 # Nadaj uprawnienia wykonywalne
                 os.chmod(wrapper_path, 0o755)
@@ -476,56 +1404,143 @@ exec "./{rel_exe_path}" "$@"
         except Exception as e:
             self._print(f"Błąd tworzenia wrapper scripts: {e}", "red")
             return False
+        finally:
+            self.trace.end('wrappers')
     
-    async def install_full(self, hardware_type: str = None, custom_config: str = None) -> bool:
-        """Pełna instalacja llama.cpp (asynchroniczna)"""
-        if hardware_type is None:
-            hardware_type = self.hardware_info['hardware_type']
-        
-        self.logger.info(f"Rozpoczęcie pełnej instalacji llama.cpp dla typu sprzętu: {hardware_type}")
-        self.installer_logger.log_installation_start(str(self.install_dir))
-        
-        self.console.print(Panel("[bold green]Rozpoczynam instalację llama.cpp[/bold green]", expand=False))
-        
-        # Pokaż informacje o sprzęcie
-        self.show_hardware_info()
+    async def _dependencies_stage(self, hardware_type: str) -> bool:
+        """Etap potoku: sprawdzenie i instalacja zależności"""
+        required_deps = sorted(OptimizationConfigs.get_dependencies(hardware_type))
+        checkpoint = self.install_state.get('dependencies')
+        if checkpoint and checkpoint.get('packages') == required_deps:
+            self._print("Zależności sprawdzone w przerwanej instalacji - pomijam", "cyan")
+            self.progress.skip_stage('dependencies')
+            return True
         
-        # Sprawdź i zainstaluj zależności
-        self.console.print("\n[cyan]1. Sprawdzanie zależności...[/cyan]")
-        if not self.install_dependencies(hardware_type):
+        if not await self.install_dependencies_async(hardware_type):
             self.logger.error("Wymagane zainstalowanie zależności systemowych")
-            self.console.print(f"\n[red]❌ {t('installation_interrupted')}[/red]")
             return False
+        self.install_state.set('dependencies', packages=required_deps)
+        return True
+    
+    async def _download_stage(self, build_name: str) -> bool:
+        """Etap potoku: klonowanie llama.cpp (pomijane dla dodatkowego buildu)"""
+        if build_name != "build" and (self.install_dir / ".git").exists():
+            # Dodatkowy build obok istniejących - nie usuwaj źródeł ani innych buildów
+            self._print(f"Używam istniejącego źródła llama.cpp dla buildu {build_name}", "cyan")
+            self.logger.info(f"Pominięto pobieranie - dodatkowy build: {build_name}")
+            self.progress.skip_stage('download')
+            return True
+        
+        commit = self.install_state.get_source_commit()
+        if commit and (self.install_dir / ".git").exists():
+            current = await self._run_blocking(InstallState.read_commit, self.install_dir)
+            if current == commit:
+                self._print(f"Źródło llama.cpp z przerwanej instalacji (commit {commit[:10]}) - pomijam pobieranie", "cyan")
+                self.logger.info(f"Wznowienie z punktu kontrolnego źródła: {commit}")
+                self.progress.skip_stage('download')
+                return True
         
-        # Pobierz llama.cpp
-        self.console.print("\n[cyan]2. Pobieranie llama.cpp...[/cyan]")
         if not await self.download_llama_cpp():
             self.logger.error("Błąd podczas pobierania llama.cpp")
             return False
-        
-        # Kompiluj
-        self.console.print("\n[cyan]3. Kompilacja...[/cyan]")
-        if not await self.compile_llama_cpp(hardware_type, custom_config):
-            self.logger.error("Błąd podczas kompilacji llama.cpp")
-            return False
-        
-        # Utwórz wrapper scripts
-        self.console.print("\n[cyan]4. Tworzenie wrapper scripts...[/cyan]")
+        return True
+    
+    async def _wrappers_stage(self) -> bool:
+        """Etap potoku: launchery (brak plików wykonywalnych nie przerywa instalacji)"""
         self.create_wrapper_scripts()
         self.logger.info("Utworzono skrypty wrapper")
+        return True
+    
+    async def install_full(self, hardware_type: str = None, custom_config: str = None,
+                           march: str = None, build_name: str = "build",
+                           compiler: str = None, bench_model: str = None,
+                           unity: bool = False, build_location: str = None,
+                           background: bool = False, restart: bool = False) -> bool:
+        """
+        Pełna instalacja llama.cpp (asynchroniczna)
         
-        self.console.print(Panel(
-            f"[bold green]Instalacja zakończona pomyślnie![/bold green]\n"
-            f"Katalog instalacji: {self.install_dir}\n"
-            f"Uruchom: {self.install_dir}/llama-cli.sh --help",
-            title="Sukces",
-            expand=False
-        ))
+        Przerwana instalacja jest wznawiana od ostatniego punktu kontrolnego
+        (zależności, pobrane źródło, skonfigurowany build); restart=True wymusza czystą instalację.
+        """
+        await self.detect_async()
+        if hardware_type is None:
+            hardware_type = self.hardware_info['hardware_type']
         
-        self.logger.info("Instalacja zakończona pomyślnie")
-        return True
+        if restart or self.install_state.is_completed():
+            self.install_state.reset()
+            if restart:
+                self.logger.info("Wymuszona czysta instalacja (--restart)")
+        
+        try:
+            self.logger.info(f"Rozpoczęcie pełnej instalacji llama.cpp dla typu sprzętu: {hardware_type}")
+            self.installer_logger.log_installation_start(str(self.install_dir))
+        
+            self.console.print(Panel("[bold green]Rozpoczynam instalację llama.cpp[/bold green]", expand=False))
+        
+            # Pokaż informacje o sprzęcie
+            self.show_hardware_info()
+            self.begin_progress(hardware_type)
+        
+            # Zależności, klonowanie i wyznaczanie flag (testy 'dynamic') są niezależne -
+            # działają równolegle; kompilacja czeka na wszystkie trzy
+            pipeline = InstallPipeline()
+            pipeline.add_stage('dependencies', lambda results: self._dependencies_stage(hardware_type),
+                               description="Sprawdzanie zależności")
+            # Klonowanie wymaga git, a testy 'dynamic' kompilatora - bez nich czekają na zależności
+            has_compiler = any(shutil.which(name) for name in ('cc', 'gcc', 'clang'))
+            pipeline.add_stage('download', lambda results: self._download_stage(build_name),
+                               depends_on=[] if shutil.which('git') else ['dependencies'],
+                               description="Pobieranie llama.cpp")
+            pipeline.add_stage('flags', lambda results: self._run_blocking(
+                OptimizationConfigs.get_cmake_flags, hardware_type, custom_config),
+                               depends_on=[] if has_compiler else ['dependencies'],
+                               description="Wyznaczanie flag kompilacji")
+            
+            async def compile_stage(results):
+                if compiler == 'compare':
+                    return await self.compare_compilers(hardware_type, bench_model, custom_config, march,
+                                                        build_name, unity, build_location, background,
+                                                        results['flags'])
+                return await self.compile_llama_cpp(hardware_type, custom_config, march, build_name,
+                                                    compiler, unity, build_location, background,
+                                                    results['flags'])
+            
+            pipeline.add_stage('compile', compile_stage, depends_on=['dependencies', 'download', 'flags'],
+                               description="Kompilacja")
+            pipeline.add_stage('wrappers', lambda results: self._wrappers_stage(),
+                               depends_on=['compile'], description="Tworzenie wrapper scripts")
+            
+            success = await pipeline.run(
+                lambda name, description: self._print(f"\n▶ {description}...", "cyan"))
+            
+            self._print("\nCzasy etapów instalacji:", "cyan")
+            for line in pipeline.get_report():
+                self._print(f"  {line}")
+            
+            if not success:
+                failed = [name for name, timing in pipeline.timings.items() if timing['status'] == 'błąd']
+                self.logger.error(f"Instalacja przerwana na etapie: {', '.join(failed)}")
+                self.console.print(f"\n[red]❌ {t('installation_interrupted')}[/red]")
+                return False
+            
+            self.install_state.mark_completed()
+            self.console.print(Panel(
+                f"[bold green]Instalacja zakończona pomyślnie![/bold green]\n"
+                f"Katalog instalacji: {self.install_dir}\n"
+                f"Uruchom: {self.install_dir}/llama-cli.sh --help",
+                title="Sukces",
+                expand=False
+            ))
+        
+            self.logger.info("Instalacja zakończona pomyślnie")
+            return True
+        finally:
+            # Nie kończ procesu przed usunięciem katalogów z kosza
+            await self.wait_for_cleanup()
+            self.write_trace()
+            self.output.close()
 
 
 if __name__ == "__main__":
     installer = LlamaInstaller()
-    installer.install_full()
\ No newline at end of file
+    asyncio.run(installer.install_full())
\ No newline at end of file
@@ -10,17 +10,54 @@ LinkedIn: https://linkedin.com/in/Fibogacci
 
 Konfiguracja logowania dla debugowania
 """
+import atexit
+import gzip
 import logging
 import logging.handlers
 import os
+import queue
+import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
+
+
+LOGGER_NAME = "llamacpp_installer"
+
+# Wyjście git/CMake/kompilatora - osobny plik, poza głównym logiem i konsolą
+BUILD_OUTPUT_LOGGER_NAME = f"{LOGGER_NAME}.build_output"
+BUILD_OUTPUT_MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+BUILD_OUTPUT_BACKUP_COUNT = 3
+
+
+def _gzip_namer(name: str) -> str:
+    """Nazwa kopii po rotacji: llamacpp_installer_<sesja>.log.1.gz"""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Kompresuje plik loga po rotacji (w wątku zapisu, nie w wątku logującym)"""
+    with open(source, 'rb') as source_file, gzip.open(dest, 'wb') as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+def _is_main_log_record(record: logging.LogRecord) -> bool:
+    """Filtr głównych handlerów - wyjście narzędzi trafia tylko do własnego pliku"""
+    return not record.name.startswith(BUILD_OUTPUT_LOGGER_NAME)
 
 
 class LlamaInstallerLogger:
-    """Klasa konfigurująca logowanie dla instalatora llama.cpp"""
+    """
+    Klasa konfigurująca logowanie dla instalatora llama.cpp
+
+    Loggery mają tylko QueueHandler - formatowanie i zapis do konsoli oraz plików
+    (z rotacją i kompresją gzip) wykonuje wątek QueueListener, więc zapis na wolną
+    kartę SD nie blokuje pętli odczytu wyjścia kompilacji. Jedna sesja to jeden
+    plik loga: ponowna konfiguracja (np. GUI przełącza logi do katalogu instalacji)
+    przenosi plik sesji zamiast tworzyć nowy.
+    """
     
     def __init__(self, 
                  log_level: str = "INFO",
@@ -40,27 +77,84 @@ class LlamaInstallerLogger:
             max_file_size: Maksymalny rozmiar pliku loga w bajtach
             backup_count: Liczba kopii zapasowych plików logów
         """
+        self.session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.max_file_size = max_file_size
+        self.backup_count = backup_count
+        self.log_file: Optional[Path] = None
+        self.build_output_file: Optional[Path] = None
+        self.build_logger = logging.getLogger(BUILD_OUTPUT_LOGGER_NAME)
+        self._handlers: List[logging.Handler] = []
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        
+        self.configure(log_level, log_to_file, log_to_console, log_dir)
+        atexit.register(self.stop)
+    
+    def configure(self,
+                  log_level: str = "INFO",
+                  log_to_file: bool = True,
+                  log_to_console: bool = True,
+                  log_dir: Optional[str] = None):
+        """
+        Ustawia poziom, cele i katalog logów bieżącej sesji
+        
+        Pliki sesji z poprzedniego katalogu (z kopiami po rotacji) są przenoszone
+        do nowego, a zapis jest kontynuowany w tym samym pliku.
+        """
+        self.stop()
         self.log_level = getattr(logging, log_level.upper(), logging.INFO)
         self.log_to_file = log_to_file
         self.log_to_console = log_to_console
         self.log_dir = Path(log_dir) if log_dir else Path("logs")
-        self.max_file_size = max_file_size
-        self.backup_count = backup_count
         
         # Utworz katalog dla logów jeśli nie istnieje
         if self.log_to_file:
-            self.log_dir.mkdir(exist_ok=True)
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._move_session_files()
         
         self.logger = self._setup_logger()
     
+    def _move_session_files(self):
+        """Przenosi pliki tej sesji z poprzedniego katalogu logów do self.log_dir"""
+        for previous in (self.log_file, self.build_output_file):
+            if previous is None or not previous.parent.exists():
+                continue
+            if previous.parent.resolve() == self.log_dir.resolve():
+                continue
+            for path in previous.parent.glob(f"{previous.name}*"):
+                try:
+                    shutil.move(str(path), str(self.log_dir / path.name))
+                except OSError:
+                    continue
+            try:
+                # Pusty katalog logów zostawiony np. przez start GUI w innym katalogu
+                previous.parent.rmdir()
+            except OSError:
+                pass
+    
+    def _rotating_file_handler(self, path: Path, max_bytes: int, backup_count: int) -> logging.Handler:
+        handler = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+        return handler
+    
     def _setup_logger(self) -> logging.Logger:
-        """Konfiguruje i zwraca logger"""
-        logger = logging.getLogger("llamacpp_installer")
+        """Konfiguruje logger, wyjście narzędzi i wątek zapisu; zwraca logger"""
+        logger = logging.getLogger(LOGGER_NAME)
         logger.setLevel(self.log_level)
         
         # Usuń istniejące handlery aby uniknąć duplikowania
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        for configured in (logger, self.build_logger):
+            for handler in configured.handlers[:]:
+                configured.removeHandler(handler)
+        
+        # Wyjście narzędzi jest zawsze zapisywane w całości (DEBUG), niezależnie od poziomu loga
+        self.build_logger.setLevel(logging.DEBUG)
+        self.build_logger.propagate = False
         
         # Format logów
         detailed_formatter = logging.Formatter(
@@ -73,36 +167,64 @@ class LlamaInstallerLogger:
             datefmt='%H:%M:%S'
         )
         
+        build_output_formatter = logging.Formatter('%(asctime)s | %(message)s', datefmt='%H:%M:%S')
+        
+        handlers = []
+        
         # Handler dla konsoli
         if self.log_to_console:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(self.log_level)
             console_handler.setFormatter(simple_formatter)
-            logger.addHandler(console_handler)
+            console_handler.addFilter(_is_main_log_record)
+            handlers.append(console_handler)
         
-        # Handler dla pliku z rotacją
+        # Handlery plików z rotacją i kompresją: log sesji i wyjście narzędzi
         if self.log_to_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = self.log_dir / f"llamacpp_installer_{timestamp}.log"
-            
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file,
-                maxBytes=self.max_file_size,
-                backupCount=self.backup_count,
-                encoding='utf-8'
-            )
+            self.log_file = self.log_dir / f"llamacpp_installer_{self.session}.log"
+            file_handler = self._rotating_file_handler(self.log_file, self.max_file_size, self.backup_count)
             file_handler.setLevel(logging.DEBUG)  # Plik dostaje wszystkie logi
             file_handler.setFormatter(detailed_formatter)
-            logger.addHandler(file_handler)
+            file_handler.addFilter(_is_main_log_record)
+            handlers.append(file_handler)
             
+            self.build_output_file = self.log_dir / f"build_output_{self.session}.log"
+            build_handler = self._rotating_file_handler(self.build_output_file, BUILD_OUTPUT_MAX_FILE_SIZE,
+                                                        BUILD_OUTPUT_BACKUP_COUNT)
+            build_handler.setFormatter(build_output_formatter)
+            build_handler.addFilter(logging.Filter(BUILD_OUTPUT_LOGGER_NAME))
+            handlers.append(build_handler)
+        
+        # Logger i wyjście narzędzi wrzucają rekordy do kolejki - zapis w wątku QueueListener
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        if self.log_to_file:
+            self.build_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        else:
+            self.build_logger.addHandler(logging.NullHandler())
+        self._handlers = handlers
+        self._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        
+        if self.log_to_file:
             # Log informacji o starcie
-            logger.info(f"Logowanie skonfigurowane. Plik loga: {log_file}")
+            logger.info(f"Logowanie skonfigurowane. Plik loga: {self.log_file}")
+            logger.info(f"Wyjście narzędzi: {self.build_output_file}")
             logger.info(f"Poziom logowania konsoli: {logging.getLevelName(self.log_level)}")
             logger.info(f"Maksymalny rozmiar pliku: {self.max_file_size / 1024 / 1024:.1f} MB")
             logger.info(f"Liczba kopii zapasowych: {self.backup_count}")
         
         return logger
     
+    def stop(self):
+        """Zapisuje zaległe rekordy z kolejki i zamyka pliki logów"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        for handler in self._handlers:
+            handler.close()
+        self._handlers = []
+    
     def get_logger(self) -> logging.Logger:
         """Zwraca skonfigurowany logger"""
         return self.logger
@@ -176,6 +298,11 @@ class LlamaInstallerLogger:
             logger.error("Instalacja zakończona błędem")
         logger.info("=" * 60)
     
+    def log_build_output(self, lines: Iterable[str]):
+        """Zapisuje linie wyjścia narzędzi (git, CMake, kompilator) do pliku build_output_<sesja>.log"""
+        for line in lines:
+            self.build_logger.debug(line)
+    
     def log_error_with_context(self, error: Exception, context: str = ""):
         """Loguje błąd z kontekstem"""
         logger = self.logger
@@ -198,6 +325,9 @@ def setup_logging(log_level: str = "INFO",
     """
     Konfiguruje globalne logowanie dla aplikacji
     
+    Ponowne wywołanie rekonfiguruje istniejącą instancję - sesja zachowuje
+    jeden plik loga, przenoszony do nowego log_dir.
+    
     Args:
         log_level: Poziom logowania (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_to_file: Czy logować do pliku
@@ -208,6 +338,9 @@ def setup_logging(log_level: str = "INFO",
         Skonfigurowana instancja LlamaInstallerLogger
     """
     global _global_logger
+    if _global_logger is not None:
+        _global_logger.configure(log_level, log_to_file, log_to_console, log_dir)
+        return _global_logger
     _global_logger = LlamaInstallerLogger(
         log_level=log_level,
         log_to_file=log_to_file,
@@ -254,6 +387,7 @@ if __name__ == "__main__":
     logger.warning("To jest ostrzeżenie warning")
     logger.error("To jest błąd error")
     logger.critical("To jest krytyczny błąd critical")
+    logger_config.log_build_output(["[1/2] Building C object ggml.c.o", "[2/2] Linking C executable llama-cli"])
     
     # Test logowania błędu z kontekstem
     try:
@@ -31,6 +31,9 @@ from rich.text import Text
 from hardware_detector import HardwareDetector
 from optimization_configs import OptimizationConfigs
 from llama_installer import LlamaInstaller
+from output_channel import strip_markup
+from progress_model import ProgressModel
+from build_telemetry import BuildTelemetry
 from translations import set_language, t, get_language_from_env
 from logger_config import setup_logging, get_logger, get_installer_logger
 from __version__ import __version__, PROJECT_NAME, PROJECT_AUTHOR, PROJECT_URL
@@ -450,20 +453,30 @@ class InstallationScreen(Screen):
         self.logger_config = setup_logging(log_level="INFO", log_dir=str(install_logs_dir))
         self.logger = get_logger()
         
-        # Utwórz callback do przekazywania komunikatów z LlamaInstaller do Log widget
-        def gui_callback(message, progress_update=None):
-            if hasattr(self, '_log_widget') and self._log_widget:
-                # Bezpośredni dostęp - jesteśmy już w kontekście async
-                self._log_widget.write_line(message)
-            
-            # Opcjonalnie aktualizuj progress bar
-            if progress_update and hasattr(self, '_progress_widget') and self._progress_widget:
-                self._progress_widget.update(progress=progress_update)
-        
-        self.installer = LlamaInstaller(install_dir, gui_callback)
+        # Komunikaty z LlamaInstaller trafiają do Log widget paczkami (co 100 ms)
+        self._loop = asyncio.get_event_loop()
+        self.installer = LlamaInstaller(install_dir)
+        self.installer.output.subscribe(self._on_installer_output, interval=0.1)
         self.installation_cancelled = False
         self.install_start_time = None
         self.timer_widget = None
+        self.timer_done = False
+    
+    def _on_installer_output(self, events):
+        # Wywoływane także z wątku kanału - nie blokuj go, tylko zaplanuj aktualizację widgetów
+        self._loop.call_soon_threadsafe(self._update_widgets, events)
+    
+    def _update_widgets(self, events):
+        """Dopisz paczkę komunikatów do logu i ustaw postęp z ostatniego komunikatu"""
+        if hasattr(self, '_log_widget') and self._log_widget:
+            # Usuń markup Rich (wyjście narzędzi nie zawiera markup)
+            self._log_widget.write_lines([strip_markup(event['message']) if event['kind'] == 'message'
+                                          else event['message'] for event in events])
+        
+        # Opcjonalnie aktualizuj progress bar
+        progress_updates = [event['progress'] for event in events if event['progress']]
+        if progress_updates and hasattr(self, '_progress_widget') and self._progress_widget:
+            self._progress_widget.update(progress=progress_updates[-1])
     
     def update_elapsed_time(self):
         """Aktualizuj wyświetlany czas elapsed"""
@@ -473,7 +486,14 @@ class InstallationScreen(Screen):
             minutes = elapsed // 60
             seconds = elapsed % 60
             time_str = f"Czas: {minutes:02d}:{seconds:02d}"
+            if not self.timer_done and self.installer.detected:
+                time_str += f" | pozostało ok. {ProgressModel.format_seconds(self.installer.progress.eta())}"
             self.timer_widget.update(time_str)
+            
+            # Panel zasobów na żywo - tylko podczas kompilacji
+            telemetry = self.installer.telemetry
+            self.query_one("#telemetry", Static).update(
+                BuildTelemetry.format_sample(telemetry.latest, telemetry.interval) if telemetry else "")
     
     def compose(self) -> ComposeResult:
         """Komponuj UI dla instalacji"""
@@ -482,6 +502,7 @@ class InstallationScreen(Screen):
             Static(f"Instalacja llama.cpp dla: {self.hardware_type}", id="install-title"),
             Static(f"Katalog instalacji: {self.install_dir}", id="install-dir"),
             Static("Czas: 00:00", id="elapsed-time"),
+            Static("", id="telemetry"),
             ProgressBar(total=100, show_eta=False, id="progress"),
             Log(id="install-log"),
             Horizontal(
@@ -521,8 +542,10 @@ class InstallationScreen(Screen):
                 return
                 
             log_widget.write_line("Rozpoczynam instalację...")
-            await asyncio.sleep(0.5)  # Krótka pauza dla stabilności ETA
-            progress_widget.update(progress=20)
+            # Wykrywanie sprzętu (podprocesy) w puli wątków - interfejs pozostaje responsywny
+            await self.installer.detect_async()
+            # Postęp i ETA z modelu instalatora (wyjście ninja/make/git, historia instalacji)
+            self.installer.begin_progress(self.hardware_type)
             
             # Sprawdź zależności
             if self.installation_cancelled:
@@ -531,14 +554,12 @@ class InstallationScreen(Screen):
                 return
                 
             log_widget.write_line("Sprawdzanie zależności...")
-            await asyncio.sleep(0.3)
-            progress_widget.update(progress=30)
-            deps_ok, missing_deps = self.installer.check_dependencies(self.hardware_type)
+            deps_ok, missing_deps = await self.installer.check_dependencies_async(self.hardware_type)
             
             if not deps_ok:
                 log_widget.write_line(f"Brakuje zależności: {', '.join(missing_deps)}")
                 log_widget.write_line("Sprawdzanie instrukcji instalacji...")
-                install_result = self.installer.install_dependencies(self.hardware_type)
+                install_result = await self.installer.install_dependencies_async(self.hardware_type)
                 if not install_result:
                     log_widget.write_line("WYMAGANA RĘCZNA INSTALACJA ZALEŻNOŚCI:")
                     log_widget.write_line("")
@@ -577,9 +598,6 @@ class InstallationScreen(Screen):
                     cancel_btn.variant = "error"
                     return
             
-            await asyncio.sleep(0.3)
-            progress_widget.update(progress=45)
-            
             # Pobierz llama.cpp
             if self.installation_cancelled:
                 log_widget.write_line("Instalacja anulowana przez użytkownika")
@@ -591,13 +609,11 @@ class InstallationScreen(Screen):
             self.query_one("#cancel-install", Button).disabled = False
             
             if not await self.installer.download_llama_cpp():
-                log_widget.write_line("Błąd pobierania llama.cpp!")
+                log_widget.write_line("Instalacja anulowana przez użytkownika" if self.installation_cancelled
+                                      else "Błąd pobierania llama.cpp!")
                 self._finish_installation_with_error()
                 return
             
-            await asyncio.sleep(0.3)
-            progress_widget.update(progress=65)
-            
             # Kompilacja
             if self.installation_cancelled:
                 log_widget.write_line("Instalacja anulowana przez użytkownika")
@@ -605,27 +621,26 @@ class InstallationScreen(Screen):
                 return
                 
             log_widget.write_line("Rozpoczynam kompilację...")
-            await asyncio.sleep(0.3)
-            progress_widget.update(progress=70)
             
             if not await self.installer.compile_llama_cpp(self.hardware_type, self.custom_config):
-                log_widget.write_line("Błąd kompilacji!")
+                log_widget.write_line("Instalacja anulowana przez użytkownika" if self.installation_cancelled
+                                      else "Błąd kompilacji!")
                 self._finish_installation_with_error()
                 return
             
-            await asyncio.sleep(0.3)
-            progress_widget.update(progress=95)
-            
             # Wrapper scripts
             log_widget.write_line("Tworzenie wrapper scripts...")
             self.installer.create_wrapper_scripts()
+            await self.installer.wait_for_cleanup()
             
-            await asyncio.sleep(0.3)
             progress_widget.update(progress=100)
             
             # Zatrzymaj timer
             if hasattr(self, 'timer_handle') and self.timer_handle:
                 self.timer_handle.stop()
+            self.timer_done = True
+            self.update_elapsed_time()
+            self.installer.write_trace()
                 
             log_widget.write_line("Instalacja zakończona pomyślnie!")
             log_widget.write_line(f"Pliki zainstalowane w: {self.install_dir}")
@@ -650,6 +665,9 @@ class InstallationScreen(Screen):
         # Zatrzymaj timer
         if hasattr(self, 'timer_handle') and self.timer_handle:
             self.timer_handle.stop()
+        self.timer_done = True
+        self.update_elapsed_time()
+        self.installer.write_trace()
             
         # Ukryj przycisk rozpoczęcia i zmień przycisk anulowania
         start_btn = self.query_one("#start-install", Button)
@@ -671,6 +689,8 @@ class InstallationScreen(Screen):
             if event.button.label == "Anuluj":
                 # Anuluj instalację
                 self.installation_cancelled = True
+                # Zabij bieżące polecenie (git, cmake, kompilatory) zamiast czekać na koniec etapu
+                self.installer.cancel()
                 event.button.label = "Zakończ"
                 log_widget = self.query_one("#install-log", Log)
                 log_widget.write_line("Prośba o anulowanie instalacji...")
@@ -970,6 +990,7 @@ class LlamaCppInstallerApp(App):
             ("x86_linux", "Linux x86_64 (AVX2)"),
             ("x86_linux_old", t("hardware_x86_linux_old")),
             ("x86_linux_minimal", t("hardware_x86_linux_minimal")),
+            ("portable_max", t("hardware_portable_max")),
             ("no_optimization", "bez optymalizacji")
         ]
         
@@ -0,0 +1,546 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Wyznaczanie mikroarchitektury CPU i odpowiadających jej flag -march/-mtune/-mcpu
+"""
+import os
+import platform
+import subprocess
+from typing import Dict, List, Optional
+
+from logger_config import get_logger
+
+
+# Intel, rodzina 6: numer modelu -> nazwa -march w GCC/Clang
+INTEL_FAMILY6_MODELS = {
+    0x1C: 'bonnell', 0x26: 'bonnell', 0x27: 'bonnell', 0x35: 'bonnell', 0x36: 'bonnell',
+    0x37: 'silvermont', 0x4A: 'silvermont', 0x4C: 'silvermont', 0x4D: 'silvermont',
+    0x5A: 'silvermont', 0x5D: 'silvermont',
+    0x5C: 'goldmont', 0x5F: 'goldmont',
+    0x7A: 'goldmont-plus',
+    0x86: 'tremont', 0x96: 'tremont', 0x9C: 'tremont',
+    0x1A: 'nehalem', 0x1E: 'nehalem', 0x1F: 'nehalem', 0x2E: 'nehalem',
+    0x25: 'westmere', 0x2C: 'westmere', 0x2F: 'westmere',
+    0x2A: 'sandybridge', 0x2D: 'sandybridge',
+    0x3A: 'ivybridge', 0x3E: 'ivybridge',
+    0x3C: 'haswell', 0x3F: 'haswell', 0x45: 'haswell', 0x46: 'haswell',
+    0x3D: 'broadwell', 0x47: 'broadwell', 0x4F: 'broadwell', 0x56: 'broadwell',
+    0x4E: 'skylake', 0x5E: 'skylake', 0x8E: 'skylake', 0x9E: 'skylake',
+    0xA5: 'skylake', 0xA6: 'skylake',
+    0x55: 'skylake-avx512',
+    0x66: 'cannonlake',
+    0x7D: 'icelake-client', 0x7E: 'icelake-client',
+    0x6A: 'icelake-server', 0x6C: 'icelake-server',
+    0x8C: 'tigerlake', 0x8D: 'tigerlake',
+    0xA7: 'rocketlake',
+    0x97: 'alderlake', 0x9A: 'alderlake', 0xBE: 'alderlake',
+    0xB7: 'raptorlake', 0xBA: 'raptorlake', 0xBF: 'raptorlake',
+    0xAA: 'meteorlake', 0xAC: 'meteorlake',
+    0x8F: 'sapphirerapids',
+    0xCF: 'emeraldrapids',
+    0xAD: 'graniterapids', 0xAE: 'graniterapids',
+    0xAF: 'sierraforest',
+    0xB6: 'grandridge',
+    0x57: 'knl',
+    0x85: 'knm',
+}
+
+# ARM (implementer 0x41): numer części -> nazwa -mcpu
+ARM_CPU_PARTS = {
+    0xD03: 'cortex-a53',
+    0xD04: 'cortex-a35',
+    0xD05: 'cortex-a55',
+    0xD07: 'cortex-a57',
+    0xD08: 'cortex-a72',
+    0xD09: 'cortex-a73',
+    0xD0A: 'cortex-a75',
+    0xD0B: 'cortex-a76',
+    0xD0C: 'neoverse-n1',
+    0xD0D: 'cortex-a77',
+    0xD40: 'neoverse-v1',
+    0xD41: 'cortex-a78',
+    0xD44: 'cortex-x1',
+    0xD46: 'cortex-a510',
+    0xD47: 'cortex-a710',
+    0xD48: 'cortex-x2',
+    0xD49: 'neoverse-n2',
+    0xD4B: 'cortex-a78c',
+    0xD4D: 'cortex-a715',
+    0xD4E: 'cortex-x3',
+    0xD4F: 'neoverse-v2',
+}
+
+# Następca -> poprzednik, gdy kompilator nie zna nowszej nazwy
+MARCH_FALLBACKS = {
+    'znver5': 'znver4',
+    'znver4': 'znver3',
+    'znver3': 'znver2',
+    'znver2': 'znver1',
+    'graniterapids': 'sapphirerapids',
+    'emeraldrapids': 'sapphirerapids',
+    'sapphirerapids': 'icelake-server',
+    'icelake-server': 'skylake-avx512',
+    'cascadelake': 'skylake-avx512',
+    'cooperlake': 'cascadelake',
+    'skylake-avx512': 'skylake',
+    'meteorlake': 'alderlake',
+    'raptorlake': 'alderlake',
+    'alderlake': 'skylake',
+    'rocketlake': 'icelake-client',
+    'tigerlake': 'icelake-client',
+    'icelake-client': 'cannonlake',
+    'cannonlake': 'skylake',
+    'skylake': 'broadwell',
+    'broadwell': 'haswell',
+    'haswell': 'ivybridge',
+    'ivybridge': 'sandybridge',
+    'sandybridge': 'westmere',
+    'westmere': 'nehalem',
+    'sierraforest': 'tremont',
+    'grandridge': 'tremont',
+    'tremont': 'goldmont-plus',
+    'goldmont-plus': 'goldmont',
+    'goldmont': 'silvermont',
+    'cortex-a78c': 'cortex-a78',
+    'cortex-x1': 'cortex-a78',
+    'cortex-a78': 'cortex-a77',
+    'cortex-a77': 'cortex-a76',
+    'neoverse-n2': 'neoverse-n1',
+    'neoverse-v2': 'neoverse-v1',
+    'neoverse-v1': 'neoverse-n1',
+    'neoverse-n1': 'cortex-a76',
+    'cortex-x3': 'cortex-x2',
+    'cortex-x2': 'cortex-a710',
+    'cortex-a715': 'cortex-a710',
+    'cortex-a710': 'cortex-a78',
+}
+
+# Poziomy ISA x86-64 (psABI) - ostateczny fallback dla x86
+X86_ISA_LEVELS = [
+    ('x86-64-v4', ['avx512f', 'avx512bw', 'avx512cd', 'avx512dq', 'avx512vl']),
+    ('x86-64-v3', ['avx2', 'bmi1', 'bmi2', 'f16c', 'fma', 'movbe']),
+    ('x86-64-v2', ['sse4_2', 'ssse3', 'popcnt', 'cx16']),
+]
+
+ARM_CPU_PREFIXES = ('cortex-', 'neoverse-')
+
+# Flagi /proc/cpuinfo istotne przy wyborze buildu (ISA, które może użyć kompilator)
+ISA_CPU_FLAGS = {
+    'x86': ['sse4_2', 'avx', 'f16c', 'fma', 'bmi2', 'avx2', 'avx512f', 'avx512bw', 'avx512vl',
+            'avx512vbmi', 'avx512_vnni', 'avx512_bf16', 'avx_vnni', 'amx_tile', 'amx_int8'],
+    'arm': ['asimddp', 'asimdhp', 'sve', 'sve2', 'i8mm'],
+}
+
+# Opcje GGML_* -> flagi /proc/cpuinfo wymagane przez wygenerowany kod
+GGML_OPTION_CPU_FLAGS = {
+    'GGML_SSE42': ['sse4_2'],
+    'GGML_AVX': ['avx'],
+    'GGML_AVX2': ['avx2'],
+    'GGML_FMA': ['fma'],
+    'GGML_F16C': ['f16c'],
+    'GGML_BMI2': ['bmi2'],
+    'GGML_AVX_VNNI': ['avx_vnni'],
+    'GGML_AVX512': ['avx512f', 'avx512bw', 'avx512vl'],
+    'GGML_AVX512_VBMI': ['avx512vbmi'],
+    'GGML_AVX512_VNNI': ['avx512_vnni'],
+    'GGML_AVX512_BF16': ['avx512_bf16'],
+    'GGML_AMX_TILE': ['amx_tile'],
+    'GGML_AMX_INT8': ['amx_int8'],
+}
+
+# Opcje ISA, które ggml włącza domyślnie przy GGML_NATIVE=OFF (INS_ENB)
+GGML_DEFAULT_ON_OPTIONS = ['GGML_SSE42', 'GGML_AVX', 'GGML_AVX2', 'GGML_BMI2', 'GGML_FMA', 'GGML_F16C']
+
+# Makra predefiniowane przez kompilator dla -march -> flagi /proc/cpuinfo (x86)
+ISA_COMPILER_MACROS = {
+    '__SSE4_2__': 'sse4_2',
+    '__AVX__': 'avx',
+    '__AVX2__': 'avx2',
+    '__FMA__': 'fma',
+    '__F16C__': 'f16c',
+    '__BMI2__': 'bmi2',
+    '__AVXVNNI__': 'avx_vnni',
+    '__AVX512F__': 'avx512f',
+    '__AVX512BW__': 'avx512bw',
+    '__AVX512VL__': 'avx512vl',
+    '__AVX512VBMI__': 'avx512vbmi',
+    '__AVX512VNNI__': 'avx512_vnni',
+    '__AVX512BF16__': 'avx512_bf16',
+    '__AMX_TILE__': 'amx_tile',
+    '__AMX_INT8__': 'amx_int8',
+}
+
+# Rozszerzenia -march=armv8.x-a+... -> flagi Features z /proc/cpuinfo
+ARM_EXTENSION_CPU_FLAGS = {
+    'dotprod': 'asimddp',
+    'fp16': 'asimdhp',
+    'sve': 'sve',
+    'sve2': 'sve2',
+    'i8mm': 'i8mm',
+}
+
+# Warianty backendu CPU budowane przez GGML_CPU_ALL_VARIANTS (od najbardziej wydajnego)
+# wraz z flagami /proc/cpuinfo wymaganymi do ich załadowania
+CPU_BACKEND_VARIANTS = {
+    'x86': [
+        ('sapphirerapids', ['sse4_2', 'avx', 'f16c', 'avx2', 'bmi2', 'fma', 'avx512f',
+                            'avx512vbmi', 'avx512_vnni', 'avx512_bf16', 'amx_tile', 'amx_int8']),
+        ('icelake', ['sse4_2', 'avx', 'f16c', 'avx2', 'bmi2', 'fma', 'avx512f',
+                     'avx512vbmi', 'avx512_vnni']),
+        ('skylakex', ['sse4_2', 'avx', 'f16c', 'avx2', 'bmi2', 'fma', 'avx512f']),
+        ('alderlake', ['sse4_2', 'avx', 'f16c', 'avx2', 'bmi2', 'fma', 'avx_vnni']),
+        ('haswell', ['sse4_2', 'avx', 'f16c', 'avx2', 'bmi2', 'fma']),
+        ('sandybridge', ['sse4_2', 'avx']),
+        ('sse42', ['sse4_2']),
+        ('x64', []),
+    ],
+    'arm': [
+        ('armv8.6_1', ['asimddp', 'asimdhp', 'sve', 'i8mm']),
+        ('armv8.2_3', ['asimddp', 'asimdhp', 'sve']),
+        ('armv8.2_2', ['asimddp', 'asimdhp']),
+        ('armv8.2_1', ['asimddp']),
+        ('armv8.0_1', []),
+    ],
+}
+
+
+class MicroarchResolver:
+    """Klasa wyznaczająca jawne flagi -march/-mtune dla wykrytej mikroarchitektury"""
+
+    def __init__(self, compiler: str = None, cpuinfo_path: str = '/proc/cpuinfo'):
+        self.logger = get_logger()
+        self.compiler = compiler or os.environ.get('CC', 'cc')
+        self.cpuinfo_path = cpuinfo_path
+        self.machine = platform.machine().lower()
+        self._supported_cache: Dict[str, bool] = {}
+        self._known_march: Optional[List[str]] = None
+
+    def _read_cpuinfo(self) -> Dict[str, str]:
+        """Odczytuje pierwszy blok procesora z /proc/cpuinfo"""
+        fields = {}
+        try:
+            with open(self.cpuinfo_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        if fields:
+                            break
+                        continue
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        fields.setdefault(key.strip().lower(), value.strip())
+        except Exception as e:
+            self.logger.warning(f"Nie można odczytać {self.cpuinfo_path}: {e}")
+        return fields
+
+    def get_cpu_flags(self) -> List[str]:
+        """Zwraca listę flag CPU (x86: 'flags', ARM: 'features')"""
+        cpuinfo = self._read_cpuinfo()
+        return (cpuinfo.get('flags') or cpuinfo.get('features') or '').split()
+
+    def select_cpu_backend_variant(self, cpu_flags: List[str] = None) -> Optional[str]:
+        """Przewiduje wariant backendu CPU, który ggml wybierze w czasie działania"""
+        if cpu_flags is None:
+            cpu_flags = self.get_cpu_flags()
+        if self.machine in ['x86_64', 'amd64']:
+            variants = CPU_BACKEND_VARIANTS['x86']
+        elif self.machine in ['aarch64', 'arm64']:
+            variants = CPU_BACKEND_VARIANTS['arm']
+        else:
+            return None
+
+        for name, required in variants:
+            if all(flag in cpu_flags for flag in required):
+                return name
+        return None
+
+    def get_required_cpu_flags(self, cmake_flags: List[str]) -> List[str]:
+        """
+        Wyznacza flagi CPU wymagane do uruchomienia buildu z danymi flagami CMAKE
+
+        Buildy z GGML_NATIVE (także nieustawionym - domyślnie ON) lub -march/-mcpu
+        konkretnego rdzenia mogą użyć dowolnej instrukcji hosta, więc wymagają
+        wszystkich jego flag ISA. Nieustawione opcje ISA mają wartości domyślne ggml.
+        """
+        if '-DGGML_BACKEND_DL=ON' in cmake_flags and '-DGGML_CPU_ALL_VARIANTS=ON' in cmake_flags:
+            return []
+
+        arch = 'arm' if self.machine in ['aarch64', 'arm64'] else 'x86'
+        host_isa = [flag for flag in self.get_cpu_flags() if flag in ISA_CPU_FLAGS[arch]]
+
+        options = {}
+        for flag in cmake_flags:
+            if flag.startswith('-D') and '=' in flag:
+                option, value = flag[2:].split('=', 1)
+                options[option] = value
+        if options.get('GGML_NATIVE', 'ON').upper() == 'ON':
+            return host_isa
+
+        required = []
+        if arch == 'x86':
+            for option, option_flags in GGML_OPTION_CPU_FLAGS.items():
+                default = 'ON' if option in GGML_DEFAULT_ON_OPTIONS else 'OFF'
+                if options.get(option, default).upper() == 'ON':
+                    required.extend(option_flags)
+
+        for option in ('CMAKE_C_FLAGS', 'CMAKE_CXX_FLAGS'):
+            for token in options.get(option, '').split():
+                if token.startswith('-mcpu='):
+                    return host_isa
+                if not token.startswith('-march='):
+                    continue
+                march = token[len('-march='):]
+                if march.startswith('armv'):
+                    for extension in march.split('+')[1:]:
+                        if extension in ARM_EXTENSION_CPU_FLAGS:
+                            required.append(ARM_EXTENSION_CPU_FLAGS[extension])
+                    continue
+                for level, level_flags in X86_ISA_LEVELS:
+                    if march == level:
+                        required.extend(f for f in level_flags if f in ISA_CPU_FLAGS['x86'])
+                        break
+                else:
+                    if march != 'x86-64':
+                        return host_isa
+
+        # Zachowaj kolejność, usuń duplikaty
+        return list(dict.fromkeys(required))
+
+    @staticmethod
+    def _parse_int(value: Optional[str]) -> Optional[int]:
+        """Parsuje liczbę dziesiętną lub szesnastkową z cpuinfo"""
+        if not value:
+            return None
+        try:
+            return int(value, 0)
+        except ValueError:
+            return None
+
+    def _resolve_amd(self, family: int, model: int) -> Optional[str]:
+        """Mapuje rodzinę/model AMD na nazwę -march"""
+        if family == 0x1A:
+            return 'znver5'
+        if family == 0x19:
+            if 0x10 <= model <= 0x1F or 0x60 <= model <= 0x7F or 0xA0 <= model <= 0xAF:
+                return 'znver4'
+            return 'znver3'
+        if family == 0x17:
+            return 'znver2' if model >= 0x30 else 'znver1'
+        if family == 0x16:
+            return 'btver2' if model >= 0x30 else 'btver1'
+        if family == 0x15:
+            if model >= 0x60:
+                return 'bdver4'
+            if model >= 0x30:
+                return 'bdver3'
+            if model >= 0x02:
+                return 'bdver2'
+            return 'bdver1'
+        if family == 0x14:
+            return 'btver1'
+        if family == 0x10:
+            return 'amdfam10'
+        return None
+
+    def _resolve_intel(self, family: int, model: int, stepping: Optional[int]) -> Optional[str]:
+        """Mapuje rodzinę/model Intel na nazwę -march"""
+        if family != 6:
+            return None
+        name = INTEL_FAMILY6_MODELS.get(model)
+        if name == 'skylake-avx512' and stepping is not None:
+            # Ten sam model 0x55 obejmuje Cascade Lake i Cooper Lake
+            if stepping >= 10:
+                return 'cooperlake'
+            if stepping >= 5:
+                return 'cascadelake'
+        return name
+
+    def _isa_level(self, cpu_flags: List[str]) -> str:
+        """Zwraca najwyższy poziom x86-64-vN obsługiwany przez CPU"""
+        for level, required in X86_ISA_LEVELS:
+            if all(flag in cpu_flags for flag in required):
+                return level
+        return 'x86-64'
+
+    def _get_known_march(self) -> List[str]:
+        """Pobiera listę nazw -march znanych kompilatorowi (GCC: -Q --help=target)"""
+        if self._known_march is not None:
+            return self._known_march
+
+        self._known_march = []
+        try:
+            result = subprocess.run([self.compiler, '-Q', '--help=target'],
+                                    capture_output=True, text=True, timeout=10)
+            lines = result.stdout.splitlines()
+            for index, line in enumerate(lines):
+                if 'Known valid arguments for -march=' in line and index + 1 < len(lines):
+                    self._known_march = lines[index + 1].split()
+                    break
+        except Exception as e:
+            self.logger.debug(f"Nie można pobrać listy -march z {self.compiler}: {e}")
+
+        self.logger.debug(f"Kompilator {self.compiler} zna {len(self._known_march)} nazw -march")
+        return self._known_march
+
+    def _flag_option(self, name: str) -> str:
+        """Zwraca opcję kompilatora właściwą dla nazwy (-mcpu dla ARM, -march dla x86)"""
+        if name.startswith(ARM_CPU_PREFIXES):
+            return '-mcpu'
+        return '-march'
+
+    def is_supported(self, name: str) -> bool:
+        """Sprawdza czy zainstalowany kompilator akceptuje daną nazwę mikroarchitektury"""
+        if name in self._supported_cache:
+            return self._supported_cache[name]
+
+        option = self._flag_option(name)
+        known = self._get_known_march() if option == '-march' else []
+        if known:
+            supported = name in known
+        else:
+            # Clang i kompilatory krzyżowe - próbna kompilacja pustego pliku
+            try:
+                result = subprocess.run(
+                    [self.compiler, f'{option}={name}', '-E', '-x', 'c', os.devnull],
+                    capture_output=True, text=True, timeout=10
+                )
+                supported = result.returncode == 0
+            except Exception as e:
+                self.logger.debug(f"Test {option}={name} nie powiódł się: {e}")
+                supported = False
+
+        self._supported_cache[name] = supported
+        return supported
+
+    def _first_supported(self, name: str) -> Optional[str]:
+        """Przechodzi łańcuch fallbacków aż do nazwy znanej kompilatorowi"""
+        seen = set()
+        while name and name not in seen:
+            seen.add(name)
+            if self.is_supported(name):
+                return name
+            self.logger.debug(f"Kompilator nie obsługuje {name}, próbuję poprzednika")
+            name = MARCH_FALLBACKS.get(name)
+        return None
+
+    def resolve(self) -> Optional[Dict[str, str]]:
+        """
+        Wyznacza mikroarchitekturę hosta
+
+        Returns:
+            Słownik z kluczami 'name', 'detected', 'source', 'flags' lub None
+        """
+        cpuinfo = self._read_cpuinfo()
+        detected = None
+        source = 'table'
+
+        if self.machine in ['x86_64', 'amd64', 'i686', 'i386']:
+            vendor = cpuinfo.get('vendor_id', '')
+            family = self._parse_int(cpuinfo.get('cpu family'))
+            model = self._parse_int(cpuinfo.get('model'))
+            stepping = self._parse_int(cpuinfo.get('stepping'))
+            self.logger.debug(f"CPU: vendor={vendor}, family={family}, model={model}, stepping={stepping}")
+
+            if family is not None and model is not None:
+                if vendor in ('AuthenticAMD', 'HygonGenuine'):
+                    detected = self._resolve_amd(family, model)
+                elif vendor == 'GenuineIntel':
+                    detected = self._resolve_intel(family, model, stepping)
+
+            name = self._first_supported(detected) if detected else None
+            if name is None:
+                source = 'isa_level'
+                name = self._first_supported(self._isa_level(cpuinfo.get('flags', '').split()))
+            if name is None:
+                source = 'fallback'
+                name = 'x86-64'
+
+        elif self.machine in ['aarch64', 'arm64']:
+            implementer = self._parse_int(cpuinfo.get('cpu implementer'))
+            part = self._parse_int(cpuinfo.get('cpu part'))
+            self.logger.debug(f"CPU: implementer={implementer}, part={part}")
+
+            if implementer == 0x41 and part is not None:
+                detected = ARM_CPU_PARTS.get(part)
+            name = self._first_supported(detected) if detected else None
+            if name is None:
+                self.logger.info("Nie rozpoznano rdzenia ARM - brak jawnych flag -mcpu")
+                return None
+        else:
+            self.logger.info(f"Brak mapowania mikroarchitektury dla {self.machine}")
+            return None
+
+        flags = self.get_compiler_flags(name)
+        result = {
+            'name': name,
+            'detected': detected or name,
+            'source': source,
+            'flags': flags,
+            'cpu_flags': self.get_march_cpu_flags(flags),
+        }
+        self.logger.info(f"Mikroarchitektura: {result}")
+        return result
+
+    def validate(self, name: str) -> Optional[Dict[str, str]]:
+        """Sprawdza jawnie podaną nazwę (np. do kompilacji krzyżowej)"""
+        if not self.is_supported(name):
+            self.logger.error(f"Kompilator {self.compiler} nie obsługuje mikroarchitektury: {name}")
+            return None
+        flags = self.get_compiler_flags(name)
+        return {
+            'name': name,
+            'detected': name,
+            'source': 'user',
+            'flags': flags,
+            'cpu_flags': self.get_march_cpu_flags(flags),
+        }
+
+    def get_march_cpu_flags(self, compiler_flags: str) -> Optional[List[str]]:
+        """
+        Flagi ISA (nazwy z /proc/cpuinfo), które kompilator włącza dla danych flag -march
+
+        Odczytywane z makr predefiniowanych (__AVX2__, __FMA__...). Pusta lista, gdy
+        kompilator nie odpowie (opcje ISA ggml zostaną wtedy wyłączone); None poza x86.
+        """
+        if self.machine not in ['x86_64', 'amd64', 'i686', 'i386'] or '-mcpu=' in compiler_flags:
+            return None
+        try:
+            result = subprocess.run([self.compiler] + compiler_flags.split() + ['-dM', '-E', '-x', 'c', os.devnull],
+                                    capture_output=True, text=True, timeout=10)
+        except Exception as e:
+            self.logger.debug(f"Nie można odczytać makr kompilatora {self.compiler}: {e}")
+            return []
+        if result.returncode != 0:
+            self.logger.debug(f"Odczyt makr dla '{compiler_flags}' nie powiódł się: {result.stderr.strip()}")
+            return []
+
+        macros = {line.split()[1] for line in result.stdout.splitlines() if line.startswith('#define ')}
+        return [flag for macro, flag in ISA_COMPILER_MACROS.items() if macro in macros]
+
+    def get_compiler_flags(self, name: str) -> str:
+        """Zwraca flagi kompilatora dla nazwy mikroarchitektury"""
+        if self._flag_option(name) == '-mcpu':
+            return f'-mcpu={name}'
+        if name.startswith('x86-64'):
+            return f'-march={name} -mtune=generic'
+        return f'-march={name} -mtune={name}'
+
+
+if __name__ == "__main__":
+    resolver = MicroarchResolver()
+    info = resolver.resolve()
+
+    print("=== Mikroarchitektura CPU ===")
+    if info:
+        print(f"Wykryta: {info['detected']}")
+        print(f"Użyta: {info['name']} ({info['source']})")
+        print(f"Flagi: {info['flags']}")
+    else:
+        print("Brak jawnych flag dla tej platformy")
+    print(f"Wariant backendu CPU (GGML_CPU_ALL_VARIANTS): {resolver.select_cpu_backend_variant()}")
@@ -10,7 +10,71 @@ LinkedIn: https://linkedin.com/in/Fibogacci
 
 Konfiguracje optymalizacji dla różnych typów sprzętu
 """
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
+
+from microarch import GGML_OPTION_CPU_FLAGS
+
+
+# Drabina konfiguracji zapasowych: od najmniej kosztownej rezygnacji.
+# Każdy krok rozpoznaje błąd po komunikatach diagnostycznych CMake/kompilatora/linkera
+# i wyłącza odpowiednie opcje (pusta wartość = usunięcie ustawienia). Wzorce są
+# zakotwiczone w treści diagnostyki - ninja po "FAILED:" wypisuje całą komendę
+# (z -fuse-ld=..., -lopenblas, -lgomp, -lcurl), a ta nie może wskazywać przyczyny.
+MISSING_LIBRARY = r'(cannot find -l|unable to find library -l|library not found: (lib)?)'
+MISSING_HEADER = r"fatal error: '?{}'?(: No such file| file not found)"
+
+FALLBACK_LADDER = [
+    {
+        'name': 'unity',
+        'description': 'unity build wyłączony (konflikt symboli w połączonych plikach)',
+        'patterns': [r'Unity/unity_\d+_\w+\.\w+:\d+:(\d+:)? (fatal )?error:',
+                     r'Unity[/\\]unity_\d+_\w+\.\w+\(\d+\): (fatal )?error'],
+        'options': {'CMAKE_UNITY_BUILD': 'OFF'},
+    },
+    {
+        'name': 'linker',
+        'description': 'domyślny linker (błąd mold/lld/gold)',
+        'patterns': [r'mold: (fatal|error): (?!library not found|undefined symbol)',
+                     r'ld\.lld: error: (?!unable to find library|undefined symbol)',
+                     r'ld\.gold: (fatal|error|internal error): (?!cannot find -l)',
+                     r'error: invalid linker name in argument',
+                     r"error: unrecogni[sz]ed command[- ]line option '-fuse-ld=",
+                     r"collect2: fatal error: cannot find 'ld'",
+                     r"LINKER_TYPE '\w+' is unknown or not supported"],
+        'options': {'CMAKE_LINKER_TYPE': '', 'CMAKE_EXE_LINKER_FLAGS': '',
+                    'CMAKE_SHARED_LINKER_FLAGS': '', 'CMAKE_MODULE_LINKER_FLAGS': ''},
+    },
+    {
+        'name': 'lto',
+        'description': 'LTO wyłączone (błąd wtyczki/linkowania LTO)',
+        # "lto-wrapper: warning: using serial compilation" to tylko ostrzeżenie
+        'patterns': [r'lto-wrapper: fatal error', r'lto1: (fatal error|internal compiler error)',
+                     r'plugin needed to handle lto object', r'LLVMgold\.so: error loading plugin'],
+        'options': {'GGML_LTO': 'OFF'},
+    },
+    {
+        'name': 'blas',
+        'description': 'BLAS wyłączone (biblioteka BLAS niedostępna)',
+        'patterns': [r'Could NOT find BLAS', r'BLAS not found', MISSING_HEADER.format(r'cblas\.h'),
+                     MISSING_LIBRARY + r'(open)?blas\b', r'undefined (reference to|symbol:) .?cblas_'],
+        'options': {'GGML_BLAS': 'OFF'},
+    },
+    {
+        'name': 'openmp',
+        'description': 'OpenMP wyłączone (brak obsługi OpenMP)',
+        'patterns': [r'Could NOT find OpenMP', r'OpenMP not found', MISSING_HEADER.format(r'omp\.h'),
+                     MISSING_LIBRARY + r'(g|i)?omp\b', r'undefined (reference to|symbol:) .?(omp_|GOMP_)'],
+        'options': {'GGML_OPENMP': 'OFF'},
+    },
+    {
+        'name': 'curl',
+        'description': 'CURL wyłączony (brak libcurl)',
+        'patterns': [r'Could NOT find CURL', MISSING_HEADER.format(r'curl/curl\.h'),
+                     MISSING_LIBRARY + r'curl\b', r'undefined (reference to|symbol:) .?curl_'],
+        'options': {'LLAMA_CURL': 'OFF'},
+    },
+]
 
 
 class OptimizationConfigs:
@@ -147,6 +211,18 @@ class OptimizationConfigs:
                 '-DLLAMA_CURL=OFF'
             ],
             
+            'portable_max': [  # Jeden build z wariantami backendu CPU wybieranymi w czasie działania
+                '-DGGML_BACKEND_DL=ON',
+                '-DGGML_CPU_ALL_VARIANTS=ON',
+                '-DBUILD_SHARED_LIBS=ON',  # Wymagane przez GGML_BACKEND_DL
+                '-DGGML_NATIVE=OFF',  # Warianty ISA zamiast flag hosta
+                '-DGGML_OPENMP=ON',
+                '-DGGML_BLAS=OFF',
+                '-DGGML_LTO=OFF',
+                '-DCMAKE_BUILD_TYPE=Release',
+                '-DGGML_CUDA=OFF'
+            ],
+            
             'no_optimization': [
                 '-DCMAKE_BUILD_TYPE=Release',
                 '-DGGML_CUDA=OFF',
@@ -167,6 +243,108 @@ class OptimizationConfigs:
         
         return configs.get(hardware_type, configs['no_optimization'])
     
+    @staticmethod
+    def get_option(flags: List[str], option: str) -> str:
+        """Zwraca wartość opcji -D<option>=... lub None"""
+        prefix = f'-D{option}='
+        value = None
+        for flag in flags:
+            if flag.startswith(prefix):
+                value = flag[len(prefix):]
+        return value
+    
+    @staticmethod
+    def set_option(flags: List[str], option: str, value: str) -> List[str]:
+        """Zwraca kopię flag z ustawioną opcją -D<option>=<value>"""
+        prefix = f'-D{option}='
+        result = [flag for flag in flags if not flag.startswith(prefix)]
+        result.append(f'{prefix}{value}')
+        return result
+    
+    @staticmethod
+    def classify_build_failure(flags: List[str], output_lines: List[str]) -> Optional[dict]:
+        """
+        Rozpoznaje przyczynę błędu konfiguracji/kompilacji na podstawie wyjścia
+        
+        Args:
+            flags: bieżąca lista flag CMAKE
+            output_lines: przechwycone wyjście CMake lub kompilacji
+        
+        Returns:
+            Krok z FALLBACK_LADDER, który zmienia bieżące flagi, lub None, gdy
+            żaden komunikat diagnostyczny nie wskazuje przyczyny (koniec drabiny)
+        """
+        output = '\n'.join(output_lines)
+        for step in FALLBACK_LADDER:
+            if all(OptimizationConfigs.get_option(flags, option) in (value, None if value == '' else value)
+                   for option, value in step['options'].items()):
+                continue  # Krok niczego by nie zmienił
+            if any(re.search(pattern, output) for pattern in step['patterns']):
+                return step
+        return None
+    
+    @staticmethod
+    def apply_fallback(flags: List[str], step: dict) -> List[str]:
+        """Zwraca flagi CMAKE z zastosowanym krokiem drabiny zapasowej"""
+        result = list(flags)
+        for option, value in step['options'].items():
+            result = OptimizationConfigs.set_option(result, option, value)
+        return result
+    
+    @staticmethod
+    def apply_microarch(flags: List[str], compiler_flags: str, cpu_flags: List[str] = None) -> List[str]:
+        """
+        Zastępuje GGML_NATIVE i istniejące -march/-mtune/-mcpu jawnymi flagami mikroarchitektury
+
+        Przy GGML_NATIVE=OFF ggml domyślnie włącza brakujące opcje ISA i dopisuje
+        -mavx2 -mfma... po -march, więc każda opcja z GGML_OPTION_CPU_FLAGS dostaje
+        jawną wartość zgodną z zestawem instrukcji -march (profil mógł mieć np.
+        GGML_AVX2=ON dla starszego CPU, a CMakeCache pamięta poprzednie wartości).
+
+        Args:
+            flags: lista flag CMAKE
+            compiler_flags: flagi kompilatora, np. '-march=znver4 -mtune=znver4'
+            cpu_flags: flagi ISA włączane przez -march (MicroarchResolver.get_march_cpu_flags);
+                None - poza x86, opcje ISA są tylko usuwane
+
+        Returns:
+            Nowa lista flag CMAKE
+        """
+        result = []
+        has_c_flags = False
+        has_cxx_flags = False
+
+        for flag in flags:
+            option = flag[2:].split('=', 1)[0] if flag.startswith('-D') else None
+            if option == 'GGML_NATIVE' or option in GGML_OPTION_CPU_FLAGS:
+                continue
+
+            for prefix in ('-DCMAKE_C_FLAGS=', '-DCMAKE_CXX_FLAGS='):
+                if flag.startswith(prefix):
+                    tokens = [
+                        token for token in flag[len(prefix):].split()
+                        if not token.startswith(('-march=', '-mtune=', '-mcpu='))
+                    ]
+                    flag = prefix + ' '.join([compiler_flags] + tokens)
+                    if prefix == '-DCMAKE_C_FLAGS=':
+                        has_c_flags = True
+                    else:
+                        has_cxx_flags = True
+
+            result.append(flag)
+
+        result.append('-DGGML_NATIVE=OFF')
+        if cpu_flags is not None:
+            for option, required in GGML_OPTION_CPU_FLAGS.items():
+                enabled = all(flag in cpu_flags for flag in required)
+                result.append(f"-D{option}={'ON' if enabled else 'OFF'}")
+        if not has_c_flags:
+            result.append(f'-DCMAKE_C_FLAGS={compiler_flags}')
+        if not has_cxx_flags:
+            result.append(f'-DCMAKE_CXX_FLAGS={compiler_flags}')
+
+        return result
+
     @staticmethod
     def _load_custom_config(config_file: str) -> List[str]:
         """Wczytuje własne flagi z pliku tekstowego"""
@@ -231,11 +409,49 @@ class OptimizationConfigs:
             'x86_linux_old': base_deps + [
                 'libomp-dev'  # Tylko OpenMP, bez BLAS dla lepszej kompatybilności
             ],
-            'x86_linux_minimal': base_deps  # Tylko podstawowe narzędzia kompilacji
+            'x86_linux_minimal': base_deps,  # Tylko podstawowe narzędzia kompilacji
+            'portable_max': base_deps + [
+                'libomp-dev'
+            ]
         }
         
         return deps_map.get(hardware_type, base_deps)
     
+    @staticmethod
+    def apply_backend_variants(flags: List[str]) -> List[str]:
+        """
+        Zastępuje GGML_NATIVE i -march=native wariantami backendu CPU wybieranymi w czasie działania
+
+        Używane na maszynach wirtualnych, które mogą migrować między hostami
+        z różnymi zestawami instrukcji.
+        """
+        result = []
+        for flag in flags:
+            for prefix in ('-DCMAKE_C_FLAGS=', '-DCMAKE_CXX_FLAGS='):
+                if flag.startswith(prefix):
+                    tokens = [
+                        token for token in flag[len(prefix):].split()
+                        if token not in ('-march=native', '-mtune=native', '-mcpu=native')
+                    ]
+                    flag = prefix + ' '.join(tokens)
+            result.append(flag)
+
+        for option, value in (('GGML_NATIVE', 'OFF'), ('GGML_BACKEND_DL', 'ON'),
+                              ('GGML_CPU_ALL_VARIANTS', 'ON'), ('BUILD_SHARED_LIBS', 'ON')):
+            result = OptimizationConfigs.set_option(result, option, value)
+        return result
+    
+    @staticmethod
+    def uses_native(flags: List[str]) -> bool:
+        """Sprawdza czy flagi kompilują pod procesor hosta (GGML_NATIVE domyślnie ON lub -march=native)"""
+        native = OptimizationConfigs.get_option(flags, 'GGML_NATIVE')
+        return native in (None, 'ON') or any('-march=native' in flag for flag in flags)
+    
+    @staticmethod
+    def uses_backend_variants(flags: List[str]) -> bool:
+        """Sprawdza czy flagi budują dynamicznie ładowane warianty backendu CPU"""
+        return '-DGGML_BACKEND_DL=ON' in flags and '-DGGML_CPU_ALL_VARIANTS=ON' in flags
+    
     @staticmethod
     def get_description(hardware_type: str) -> str:
         """Zwraca opis optymalizacji dla danego sprzętu"""
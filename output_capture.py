@@ -0,0 +1,170 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Ograniczone przechwytywanie wyjścia narzędzi - bufor cykliczny, plik z pełnym wyjściem i fragment pierwszego błędu
+"""
+import re
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from logger_config import get_logger
+
+
+# Ostatnie linie trzymane w pamięci
+DEFAULT_MAX_LINES = 500
+
+# Linie kontekstu przed i po pierwszym błędzie
+ERROR_CONTEXT_LINES = 5
+
+# Linie błędów i ostrzeżeń zachowywane dla klasyfikacji błędu (drabina zapasowa)
+MAX_NOTABLE_LINES = 200
+
+# Pierwszy błąd: kompilator, linker, CMake, ninja
+ERROR_PATTERN = re.compile(
+    r'(\berror\b|fatal error|undefined reference|cannot find -l|CMake Error|^FAILED:)', re.IGNORECASE)
+
+# Linie istotne dla rozpoznania przyczyny błędu (np. "Could NOT find BLAS")
+NOTABLE_PATTERN = re.compile(
+    r'error|warning|fatal|failed|could not|not found|cannot|undefined reference|no such file', re.IGNORECASE)
+
+
+class OutputCapture:
+    """
+    Klasa przechwytująca wyjście polecenia w stałej ilości pamięci
+
+    W pamięci zostają: ostatnie max_lines linii, linie błędów i ostrzeżeń
+    (do MAX_NOTABLE_LINES) oraz fragment wokół pierwszego błędu. Pełne wyjście
+    trafia do pliku w spill_dir - zachowywanego przy błędzie, usuwanego po sukcesie.
+    """
+
+    def __init__(self, name: str, spill_dir: Path = None, max_lines: int = DEFAULT_MAX_LINES,
+                 context: int = ERROR_CONTEXT_LINES):
+        self.logger = get_logger()
+        self.name = name
+        self.context = context
+        self.tail = deque(maxlen=max_lines)
+        self.notable = deque(maxlen=MAX_NOTABLE_LINES)
+        self.line_count = 0
+        self.first_error: Optional[Dict[str, any]] = None
+        self.spill_path: Optional[Path] = None
+        self._spill = None
+
+        if spill_dir is not None:
+            self._open_spill(Path(spill_dir))
+
+    def _open_spill(self, spill_dir: Path):
+        """
+        Tworzy nowy plik pełnego wyjścia
+
+        Szybka ponowna próba (np. krok zapasowy) nie może nadpisać pliku z
+        poprzedniej - nazwa ma mikrosekundy, a plik jest tworzony w trybie 'x'.
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        try:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            for attempt in range(100):
+                suffix = f"_{attempt}" if attempt else ""
+                self.spill_path = spill_dir / f"{self.name}_{timestamp}{suffix}.log"
+                try:
+                    self._spill = open(self.spill_path, 'x', encoding='utf-8', errors='replace')
+                    return
+                except FileExistsError:
+                    continue
+            raise FileExistsError(f"{self.spill_path} już istnieje")
+        except OSError as e:
+            self.logger.warning(f"Nie można utworzyć pliku wyjścia {self.spill_path}: {e}")
+            self.spill_path = None
+
+    def append(self, line: str):
+        """Dodaje linię wyjścia"""
+        self.line_count += 1
+        if self._spill:
+            self._spill.write(line + '\n')
+
+        if self.first_error is not None and len(self.first_error['after']) < self.context:
+            self.first_error['after'].append(line)
+        if self.first_error is None and ERROR_PATTERN.search(line):
+            self.first_error = {
+                'line_number': self.line_count,
+                'line': line,
+                'before': [text for _, text in list(self.tail)[-self.context:]] if self.context else [],
+                'after': [],
+            }
+        if NOTABLE_PATTERN.search(line):
+            self.notable.append((self.line_count, line))
+        self.tail.append((self.line_count, line))
+
+    def get_lines(self) -> List[str]:
+        """Linie dla klasyfikacji błędu: istotne linie spoza bufora i ostatnie linie, w kolejności"""
+        lines = dict(self.notable)
+        lines.update(self.tail)
+        if self.first_error:
+            lines[self.first_error['line_number']] = self.first_error['line']
+        return [lines[number] for number in sorted(lines)]
+
+    def get_tail(self, count: int) -> List[str]:
+        """Ostatnie count linii"""
+        return [line for _, line in list(self.tail)[-count:]] if count > 0 else []
+
+    def get_error_excerpt(self) -> List[str]:
+        """Pierwszy błąd z kontekstem (pusta lista, gdy nie znaleziono)"""
+        if not self.first_error:
+            return []
+        return self.first_error['before'] + [self.first_error['line']] + self.first_error['after']
+
+    def get_failure_report(self, tail: int = 20) -> List[str]:
+        """Linie raportu błędu: fragment pierwszego błędu, ostatnie linie i plik z pełnym wyjściem"""
+        report = []
+        excerpt = self.get_error_excerpt()
+        if excerpt:
+            report.append(f"Pierwszy błąd (linia {self.first_error['line_number']}):")
+            report.extend(f"  {line}" for line in excerpt)
+
+        # Nie powtarzaj linii, które są już we fragmencie błędu
+        last_excerpt_line = self.first_error['line_number'] + len(self.first_error['after']) if excerpt else 0
+        tail_lines = [line for number, line in list(self.tail)[-tail:] if number > last_excerpt_line]
+        if tail_lines:
+            report.append(f"Ostatnie linie wyjścia ({len(tail_lines)} z {self.line_count}):")
+            report.extend(f"  {line}" for line in tail_lines)
+        if self.spill_path:
+            report.append(f"Pełne wyjście: {self.spill_path}")
+        return report
+
+    def close(self, keep: bool = True):
+        """Zamyka plik z pełnym wyjściem (keep=False usuwa go)"""
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+        if not keep and self.spill_path:
+            try:
+                self.spill_path.unlink()
+            except OSError:
+                pass
+            self.spill_path = None
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        capture = OutputCapture('demo', Path(spill_dir), max_lines=50)
+        for number in range(1, 1001):
+            capture.append(f"[{number}/1000] Building CXX object file{number}.cpp.o")
+            if number == 400:
+                capture.append("ggml.c:12:5: error: 'foo' undeclared")
+        capture.close()
+
+        print("=== Przechwytywanie wyjścia (demo) ===")
+        print(f"Linii: {capture.line_count}, w pamięci: {len(capture.tail)}, "
+              f"plik: {capture.spill_path.stat().st_size} B")
+        for line in capture.get_failure_report(tail=5):
+            print(line)
@@ -0,0 +1,204 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Kanał komunikatów instalatora - paczkowanie wyjścia kompilacji dla konsoli, GUI i pliku loga
+"""
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from logger_config import get_logger
+
+
+# Domyślny odstęp dostarczania paczek (jedna klatka interfejsu)
+DEFAULT_INTERVAL = 0.05
+
+# Markup Rich usuwany z komunikatów dla GUI i pliku loga
+MARKUP_PATTERN = re.compile(r'\[/?[a-z_ ]+\]')
+
+# Linie wyjścia, których nie wolno zwijać w liczniki
+IMPORTANT_PATTERN = re.compile(r'error|warning|błąd|failed|fatal', re.IGNORECASE)
+
+
+def strip_markup(message: str) -> str:
+    """Usuwa markup Rich ([red]...[/red]) z komunikatu"""
+    return MARKUP_PATTERN.sub('', message)
+
+
+class Subscription:
+    """Subskrybent kanału - dostaje paczki zdarzeń nie częściej niż co interval sekund"""
+
+    def __init__(self, callback: Callable[[List[Dict[str, any]]], None], interval: float,
+                 collapse: bool, kinds: Optional[List[str]]):
+        self.callback = callback
+        self.interval = interval
+        self.collapse = collapse
+        self.kinds = set(kinds) if kinds else None
+        self.pending: List[Dict[str, any]] = []
+        self.last_delivery = 0.0
+
+
+class OutputChannel:
+    """
+    Klasa buforująca komunikaty instalatora między producentami a odbiorcami
+
+    Zwykłe komunikaty (kind='message') są dostarczane od razu, razem z wcześniej
+    zbuforowanymi liniami, więc kolejność jest zachowana. Linie wyjścia narzędzi
+    (kind='build') trafiają do bufora, który wątek tła rozsyła paczkami - każdy
+    subskrybent we własnym tempie. Rutynowe linie kompilacji mogą być zwijane:
+    z serii zostaje ostatnia linia z licznikiem pominiętych.
+    """
+
+    def __init__(self, tick: float = DEFAULT_INTERVAL):
+        self.logger = get_logger()
+        self.tick = tick
+        self.subscriptions: List[Subscription] = []
+        self._buffer: List[Dict[str, any]] = []
+        self._buffer_lock = threading.Lock()
+        self._delivery_lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def subscribe(self, callback: Callable[[List[Dict[str, any]]], None], interval: float = DEFAULT_INTERVAL,
+                  collapse: bool = True, kinds: List[str] = None) -> Subscription:
+        """
+        Dodaje odbiorcę komunikatów
+
+        Args:
+            callback: funkcja dostająca listę zdarzeń {'kind', 'message', 'color', 'progress', 'count'}
+            interval: minimalny odstęp między paczkami w sekundach
+            collapse: czy zwijać rutynowe linie kompilacji w liczniki
+            kinds: rodzaje zdarzeń do dostarczania (None = wszystkie)
+
+        Odbiorca nie może blokować się w oczekiwaniu na inny wątek publikujący
+        komunikaty (np. GUI powinno użyć call_soon_threadsafe, a nie call_from_thread).
+        """
+        subscription = Subscription(callback, interval, collapse, kinds)
+        with self._delivery_lock:
+            self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._delivery_lock:
+            if subscription in self.subscriptions:
+                self._deliver(subscription)
+                self.subscriptions.remove(subscription)
+
+    def publish(self, message: str, color: str = None, progress: int = None, kind: str = 'message'):
+        """
+        Publikuje komunikat (bezpieczne z dowolnego wątku)
+
+        Args:
+            message: treść (może zawierać markup Rich)
+            color: kolor Rich całego komunikatu
+            progress: postęp instalacji w procentach
+            kind: 'message' (dostarczany od razu), 'report' (jak 'message', ale bez markup Rich)
+                lub 'build' (linia wyjścia narzędzia, buforowana)
+        """
+        event = {'kind': kind, 'message': message, 'color': color, 'progress': progress, 'count': 1}
+        with self._buffer_lock:
+            self._buffer.append(event)
+        if kind == 'build' and not self._closed:
+            self._ensure_thread()
+        else:
+            self.flush()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="output-channel", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Wątek tła - rozsyła zbuforowane linie co tick"""
+        while not self._closed:
+            self._wakeup.wait(self.tick)
+            self._dispatch(force=False)
+
+    def _take_buffer(self) -> List[Dict[str, any]]:
+        with self._buffer_lock:
+            events, self._buffer = self._buffer, []
+        return events
+
+    def _dispatch(self, force: bool):
+        with self._delivery_lock:
+            events = self._take_buffer()
+            now = time.monotonic()
+            for subscription in self.subscriptions:
+                subscription.pending.extend(
+                    event for event in events
+                    if subscription.kinds is None or event['kind'] in subscription.kinds)
+                if subscription.pending and (force or now - subscription.last_delivery >= subscription.interval):
+                    self._deliver(subscription)
+
+    @staticmethod
+    def _is_routine(event: Dict[str, any]) -> bool:
+        return event['kind'] == 'build' and not IMPORTANT_PATTERN.search(event['message'])
+
+    @classmethod
+    def collapse_events(cls, events: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """Zwija serie rutynowych linii kompilacji w jedno zdarzenie z licznikiem"""
+        collapsed = []
+        for event in events:
+            previous = collapsed[-1] if collapsed else None
+            if previous and cls._is_routine(event) and cls._is_routine(previous):
+                collapsed[-1] = dict(event, count=previous['count'] + event['count'],
+                                     progress=event['progress'] if event['progress'] is not None
+                                     else previous['progress'])
+            else:
+                collapsed.append(dict(event))
+        for event in collapsed:
+            if event['count'] > 1:
+                event['message'] = f"{event['message']} (+{event['count'] - 1} wcześniejszych)"
+        return collapsed
+
+    def _deliver(self, subscription: Subscription):
+        events, subscription.pending = subscription.pending, []
+        subscription.last_delivery = time.monotonic()
+        if not events:
+            return
+        if subscription.collapse:
+            events = self.collapse_events(events)
+        try:
+            subscription.callback(events)
+        except Exception as e:
+            # Błąd odbiorcy (np. zamknięte GUI) nie może przerwać instalacji
+            self.logger.debug(f"Błąd odbiorcy komunikatów: {e}")
+
+    def flush(self):
+        """Dostarcza wszystkie zbuforowane komunikaty wszystkim odbiorcom"""
+        self._dispatch(force=True)
+
+    def close(self):
+        """Kończy wątek tła i dostarcza resztę komunikatów"""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+        self._wakeup.clear()
+        self.flush()
+        self._closed = False
+
+
+if __name__ == "__main__":
+    channel = OutputChannel()
+    channel.subscribe(lambda events: print(f"konsola: {[event['message'] for event in events]}"))
+    channel.subscribe(lambda events: print(f"log: {len(events)} linii"), interval=1.0, collapse=False)
+
+    print("=== Kanał komunikatów (demo) ===")
+    channel.publish("Rozpoczynam kompilację...", "cyan")
+    for number in range(1, 201):
+        channel.publish(f"[{number}/200] Building CXX object ggml/src/file{number}.cpp.o", kind='build')
+        if number == 120:
+            channel.publish("warning: unused variable 'x'", kind='build')
+        time.sleep(0.002)
+    channel.close()
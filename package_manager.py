@@ -0,0 +1,237 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Warstwa menedżerów pakietów - wsadowe sprawdzanie zależności (dpkg, rpm, pacman, pkg)
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from logger_config import get_logger
+
+
+# Nazwy zależności w konfiguracjach są debianowe - odpowiedniki dla innych menedżerów
+PACKAGE_NAMES = {
+    'build-essential': {
+        'rpm': ['gcc', 'gcc-c++', 'make'],
+        'pacman': ['base-devel'],
+    },
+    'libopenblas-dev': {
+        'rpm': ['openblas-devel'],
+        'pacman': ['openblas'],
+        'pkg': ['libopenblas'],
+    },
+    'libomp-dev': {
+        'rpm': ['libomp-devel'],
+        'pacman': ['openmp'],
+    },
+    'libvulkan-dev': {
+        'rpm': ['vulkan-loader-devel'],
+        'pacman': ['vulkan-icd-loader'],
+        'pkg': ['vulkan-loader-android'],
+    },
+    'pkg-config': {
+        'rpm': ['pkgconf-pkg-config'],
+        'pacman': ['pkgconf'],
+    },
+}
+
+# Biblioteki potwierdzane przez pkg-config lub próbne linkowanie zamiast nazwy pakietu
+LIBRARY_PROBES = {
+    'libopenblas-dev': {'pkg_config': 'openblas', 'link': ['-lopenblas']},
+    'libomp-dev': {'link': ['-fopenmp']},
+    'libvulkan-dev': {'pkg_config': 'vulkan', 'link': ['-lvulkan']},
+}
+
+# Zależności będące zestawem narzędzi, a nie jedną komendą
+COMMAND_PROBES = {
+    'build-essential': ['gcc', 'g++'],
+}
+
+QUERY_TIMEOUT = 60
+PROBE_TIMEOUT = 30
+
+# Wyniki sprawdzeń współdzielone przez wszystkie instancje w ramach sesji
+_session_cache: Dict[Tuple[str, str], bool] = {}
+
+
+class PackageManager:
+    """Klasa wykrywająca menedżer pakietów i sprawdzająca zależności jednym wywołaniem"""
+
+    def __init__(self, name: Optional[str] = None):
+        self.logger = get_logger()
+        self.name = name or self.detect()
+
+    @staticmethod
+    def detect() -> Optional[str]:
+        """Zwraca 'pkg' (Termux), 'dpkg', 'rpm', 'pacman' lub None"""
+        if os.environ.get('TERMUX_VERSION') or 'com.termux' in os.environ.get('PREFIX', ''):
+            return 'pkg'
+        if shutil.which('dpkg-query'):
+            return 'dpkg'
+        if shutil.which('rpm') and any(shutil.which(tool) for tool in ('dnf', 'yum', 'zypper')):
+            return 'rpm'
+        if shutil.which('pacman'):
+            return 'pacman'
+        return None
+
+    @staticmethod
+    def clear_cache():
+        """Czyści wyniki sesji (np. po instalacji brakujących pakietów)"""
+        _session_cache.clear()
+
+    def get_package_names(self, dependency: str) -> List[str]:
+        """Natywne nazwy pakietów dla zależności"""
+        return PACKAGE_NAMES.get(dependency, {}).get(self.name, [dependency])
+
+    def _query_installed(self, packages: List[str]) -> Dict[str, bool]:
+        """Sprawdza wszystkie pakiety jednym wywołaniem menedżera pakietów"""
+        installed = {package: False for package in packages}
+        if not packages or self.name is None:
+            return installed
+
+        try:
+            if self.name in ('dpkg', 'pkg'):
+                # Termux używa dpkg pod spodem
+                result = subprocess.run(
+                    ['dpkg-query', '-W', '-f=${Package} ${db:Status-Status}\\n'] + packages,
+                    capture_output=True, text=True, timeout=QUERY_TIMEOUT)
+                for line in result.stdout.splitlines():
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == 'installed':
+                        installed[parts[0].split(':')[0]] = True
+            elif self.name == 'rpm':
+                result = subprocess.run(['rpm', '-q', '--qf', '%{NAME}\\n'] + packages,
+                                        capture_output=True, text=True, timeout=QUERY_TIMEOUT)
+                for line in result.stdout.splitlines():
+                    if line.strip() in installed:
+                        installed[line.strip()] = True
+            elif self.name == 'pacman':
+                result = subprocess.run(['pacman', '-Q'] + packages,
+                                        capture_output=True, text=True, timeout=QUERY_TIMEOUT)
+                for line in result.stdout.splitlines():
+                    parts = line.split()
+                    if parts and parts[0] in installed:
+                        installed[parts[0]] = True
+        except Exception as e:
+            self.logger.warning(f"Błąd zapytania {self.name} o pakiety: {e}")
+
+        self.logger.debug(f"Zapytanie {self.name}: {installed}")
+        return installed
+
+    def _pkg_config_exists(self, module: str) -> bool:
+        """Sprawdza bibliotekę przez pkg-config"""
+        if not shutil.which('pkg-config'):
+            return False
+        try:
+            return subprocess.run(['pkg-config', '--exists', module],
+                                  capture_output=True, timeout=PROBE_TIMEOUT).returncode == 0
+        except Exception:
+            return False
+
+    def _link_probe(self, flags: List[str]) -> bool:
+        """Kompiluje i linkuje pusty program z podanymi flagami"""
+        compiler = os.environ.get('CC') or shutil.which('cc') or shutil.which('gcc') or shutil.which('clang')
+        if not compiler:
+            return False
+        with tempfile.TemporaryDirectory(prefix='llamacpp-probe-') as probe_dir:
+            source = os.path.join(probe_dir, 'probe.c')
+            with open(source, 'w') as f:
+                f.write('int main(void) { return 0; }\n')
+            try:
+                result = subprocess.run([compiler, source, '-o', os.path.join(probe_dir, 'probe')] + flags,
+                                        capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+            except Exception as e:
+                self.logger.debug(f"Próbne linkowanie {flags} nie powiodło się: {e}")
+                return False
+        return result.returncode == 0
+
+    def _probe(self, dependency: str) -> bool:
+        """Potwierdza zależność bez menedżera pakietów (komenda, pkg-config, linkowanie)"""
+        probe = LIBRARY_PROBES.get(dependency)
+        if probe:
+            if probe.get('pkg_config') and self._pkg_config_exists(probe['pkg_config']):
+                return True
+            return bool(probe.get('link')) and self._link_probe(probe['link'])
+        commands = COMMAND_PROBES.get(dependency, [dependency])
+        return all(shutil.which(command) for command in commands)
+
+    def check(self, dependencies: List[str]) -> Dict[str, bool]:
+        """
+        Sprawdza zależności: najpierw sondy, potem jedno zapytanie o pakiety bibliotek
+
+        Args:
+            dependencies: nazwy zależności z OptimizationConfigs.get_dependencies
+
+        Returns:
+            Słownik zależność -> czy dostępna
+        """
+        status = {}
+        unresolved = []
+        for dependency in dependencies:
+            key = (self.name or '', dependency)
+            if key in _session_cache:
+                status[dependency] = _session_cache[key]
+            elif self._probe(dependency):
+                status[dependency] = _session_cache[key] = True
+            elif dependency in LIBRARY_PROBES:
+                unresolved.append(dependency)
+            else:
+                # Komenda musi być w PATH - sam zainstalowany pakiet nie wystarczy
+                status[dependency] = _session_cache[key] = False
+
+        if unresolved:
+            packages = sorted({package for dependency in unresolved
+                               for package in self.get_package_names(dependency)})
+            installed = self._query_installed(packages)
+            for dependency in unresolved:
+                available = all(installed.get(package, False) for package in self.get_package_names(dependency))
+                status[dependency] = _session_cache[(self.name or '', dependency)] = available
+
+        return {dependency: status[dependency] for dependency in dependencies}
+
+    def get_install_commands(self, dependencies: List[str]) -> List[str]:
+        """Polecenia instalacji brakujących zależności dla wykrytego menedżera (pusta lista, gdy nieznany)"""
+        packages = []
+        for dependency in dependencies:
+            for package in self.get_package_names(dependency):
+                if package not in packages:
+                    packages.append(package)
+        if not packages:
+            return []
+        packages_str = ' '.join(packages)
+
+        if self.name == 'pkg':
+            return [f"pkg install -y {packages_str}"]
+        if self.name == 'dpkg':
+            return ["sudo apt update", f"sudo apt install -y {packages_str}"]
+        if self.name == 'rpm':
+            for tool in ('dnf', 'yum', 'zypper'):
+                if shutil.which(tool):
+                    return [f"sudo {tool} install -y {packages_str}"]
+        if self.name == 'pacman':
+            return [f"sudo pacman -S --needed --noconfirm {packages_str}"]
+        return []
+
+
+if __name__ == "__main__":
+    from optimization_configs import OptimizationConfigs
+
+    manager = PackageManager()
+    print(f"=== Menedżer pakietów: {manager.name or 'nieznany'} ===")
+    dependencies = OptimizationConfigs.get_dependencies('x86_linux')
+    status = manager.check(dependencies)
+    for dependency, available in status.items():
+        print(f"  {dependency}: {'OK' if available else 'brak'} ({', '.join(manager.get_package_names(dependency))})")
+    missing = [dependency for dependency, available in status.items() if not available]
+    for command in manager.get_install_commands(missing):
+        print(f"  {command}")
@@ -0,0 +1,331 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Zarządzanie procesami potomnymi - grupy procesów, anulowanie całego drzewa i limity czasu
+"""
+import asyncio
+import atexit
+import ctypes
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from logger_config import get_logger
+
+
+# Limity czasu etapów w sekundach (None = bez limitu)
+STAGE_TIMEOUTS = {
+    'clone': 30 * 60,
+    'dependencies': 30 * 60,
+    'configure': 10 * 60,
+    'build': 4 * 60 * 60,  # Raspberry Pi z LTO potrafi kompilować ponad godzinę
+}
+
+# Czas na zakończenie po SIGTERM, zanim drzewo dostanie SIGKILL
+KILL_GRACE_SECONDS = 0.5
+
+PR_SET_PDEATHSIG = 1
+
+READ_CHUNK_SIZE = 64 * 1024
+LINE_SEPARATOR = re.compile(rb'\r\n|\r|\n')
+
+# Wszystkie menedżery w procesie - sprzątanie przy wyjściu i SIGTERM/SIGHUP
+_managers = weakref.WeakSet()
+_handlers_installed = False
+
+
+def _load_prctl():
+    """
+    Zwraca prctl z libc (None poza Linuksem)
+
+    Wyszukanie symbolu (dlopen/dlsym) musi nastąpić przy imporcie - w preexec_fn,
+    po fork() procesu z wątkami, mogłoby zakleszczyć się na blokadzie loadera.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        prctl = ctypes.CDLL(None, use_errno=True).prctl
+    except (OSError, AttributeError):
+        return None
+    prctl.argtypes = [ctypes.c_int, ctypes.c_ulong]
+    prctl.restype = ctypes.c_int
+    return prctl
+
+
+_prctl = _load_prctl()
+
+
+def _set_parent_death_signal():
+    """preexec_fn: proces potomny dostaje SIGKILL, gdy instalator zginie (również od SIGKILL)"""
+    _prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+
+
+def _kill_all_managers():
+    for manager in list(_managers):
+        manager.kill_all()
+
+
+def _handle_termination(signum, frame):
+    """SIGTERM/SIGHUP: zabij drzewa procesów, potem zakończ się domyślną obsługą sygnału"""
+    _kill_all_managers()
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def _install_cleanup_handlers():
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+    atexit.register(_kill_all_managers)
+    # Sygnały można ustawiać tylko w głównym wątku; nie nadpisuj cudzej obsługi
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGHUP):
+            if signal.getsignal(signum) == signal.SIG_DFL:
+                signal.signal(signum, _handle_termination)
+
+
+class ProcessManager:
+    """
+    Klasa uruchamiająca procesy potomne w osobnych grupach procesów
+
+    Każde polecenie (git, cmake, kompilator) startuje w nowej sesji, więc anulowanie
+    zabija całą grupę - razem z procesami kompilatora uruchomionymi przez make/ninja.
+    Procesy są sprzątane także przy wyjściu instalatora (atexit, SIGTERM, SIGHUP),
+    a na Linuksie bezpośredni potomek dostaje SIGKILL po śmierci instalatora.
+    """
+
+    def __init__(self):
+        self.logger = get_logger()
+        self.cancelled = False
+        self._processes: Dict[int, any] = {}  # asyncio.subprocess.Process lub subprocess.Popen
+        _managers.add(self)
+        _install_cleanup_handlers()
+
+    async def run(self, cmd: List[str], on_line: Callable[[str], None] = None,
+                  timeout: Optional[float] = None,
+                  on_start: Callable[[asyncio.subprocess.Process], None] = None,
+                  cwd: str = None) -> Dict[str, any]:
+        """
+        Uruchamia polecenie i przekazuje kolejne linie wyjścia (stdout + stderr)
+
+        Args:
+            cmd: polecenie z argumentami
+            on_line: wywoływana dla każdej niepustej linii wyjścia
+            timeout: limit czasu w sekundach - po nim drzewo procesów jest zabijane
+            on_start: wywoływana z obiektem procesu po jego uruchomieniu
+            cwd: katalog roboczy
+
+        Returns:
+            Słownik z kluczami 'returncode', 'timed_out', 'cancelled'
+        """
+        if self.cancelled:
+            return {'returncode': -signal.SIGTERM, 'timed_out': False, 'cancelled': True}
+
+        kwargs = {'start_new_session': True}
+        if _prctl is not None:
+            kwargs['preexec_fn'] = _set_parent_death_signal
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+            **kwargs
+        )
+        self._processes[process.pid] = process
+        self.logger.debug(f"Uruchomiono proces {process.pid} (grupa {process.pid}): {' '.join(cmd)}")
+        if on_start:
+            on_start(process)
+
+        async def read_output():
+            # Linie kończą się '\n' lub '\r' (postęp git --progress nadpisuje bieżącą linię)
+            pending = b''
+            while True:
+                chunk = await process.stdout.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = LINE_SEPARATOR.split(pending + chunk)
+                pending = lines.pop()
+                for line in lines:
+                    line_text = line.decode(errors='replace').strip()
+                    if line_text and on_line:
+                        on_line(line_text)
+            line_text = pending.decode(errors='replace').strip()
+            if line_text and on_line:
+                on_line(line_text)
+            await process.wait()
+
+        timed_out = False
+        try:
+            await asyncio.wait_for(read_output(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self.logger.error(f"Przekroczono limit czasu {timeout:.0f} s: {' '.join(cmd)}")
+            await self.terminate(process.pid)
+            await process.wait()
+        except asyncio.CancelledError:
+            # Anulowane zadanie asyncio (np. Ctrl+C, błąd innego etapu) - nie zostawiaj procesów
+            self.kill_tree(process.pid)
+            raise
+        finally:
+            self._processes.pop(process.pid, None)
+
+        return {
+            'returncode': process.returncode,
+            'timed_out': timed_out,
+            'cancelled': self.cancelled,
+        }
+
+    def run_sync(self, cmd: List[str], timeout: Optional[float] = None, cwd: str = None,
+                 env: Dict[str, str] = None) -> Dict[str, any]:
+        """
+        Synchroniczna wersja run() dla kodu w puli wątków (testy dymne, ctest, llama-bench)
+
+        Proces startuje w osobnej grupie i jest rejestrowany w menedżerze, więc
+        cancel() i sprzątanie przy wyjściu zabijają go tak samo jak procesy z run().
+
+        Returns:
+            Słownik z kluczami 'returncode', 'stdout', 'stderr', 'timed_out', 'cancelled'
+        """
+        if self.cancelled:
+            return {'returncode': -signal.SIGTERM, 'stdout': '', 'stderr': '',
+                    'timed_out': False, 'cancelled': True}
+
+        kwargs = {'start_new_session': True}
+        if _prctl is not None:
+            kwargs['preexec_fn'] = _set_parent_death_signal
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   errors='replace', cwd=cwd, env=env, **kwargs)
+        self._processes[process.pid] = process
+        self.logger.debug(f"Uruchomiono proces {process.pid} (grupa {process.pid}): {' '.join(cmd)}")
+
+        timed_out = False
+        try:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                self.logger.error(f"Przekroczono limit czasu {timeout:.0f} s: {' '.join(cmd)}")
+                self.kill_tree(process.pid)
+                stdout, stderr = process.communicate()
+        finally:
+            self._processes.pop(process.pid, None)
+
+        return {
+            'returncode': process.returncode,
+            'stdout': stdout,
+            'stderr': stderr,
+            'timed_out': timed_out,
+            'cancelled': self.cancelled,
+        }
+
+    @staticmethod
+    def _get_tree(pid: int) -> List[psutil.Process]:
+        """Proces i wszyscy jego potomkowie (także ci, którzy opuścili grupę procesów)"""
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    @staticmethod
+    def _alive(process: psutil.Process) -> bool:
+        """Proces działa (zombie czekający na odebranie statusu już nie)"""
+        try:
+            return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    @staticmethod
+    def _signal_tree(pid: int, processes: List[psutil.Process], signum: int):
+        try:
+            os.killpg(pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+        for process in processes:
+            try:
+                process.send_signal(signum)
+            except psutil.Error:
+                continue
+
+    def _terminate_signals(self, pid: int) -> List[psutil.Process]:
+        """SIGTERM dla drzewa i SIGCONT dla procesów wstrzymanych przez watchdog"""
+        processes = self._get_tree(pid)
+        self._signal_tree(pid, processes, signal.SIGTERM)
+        self._signal_tree(pid, processes, signal.SIGCONT)
+        return processes
+
+    async def terminate(self, pid: int, grace: float = KILL_GRACE_SECONDS):
+        """Kończy drzewo procesów: SIGTERM, a po czasie grace SIGKILL (bez blokowania pętli)"""
+        processes = self._terminate_signals(pid)
+        deadline = time.monotonic() + grace
+        while time.monotonic() < deadline and any(self._alive(process) for process in processes):
+            await asyncio.sleep(0.05)
+        self._signal_tree(pid, [process for process in processes if self._alive(process)], signal.SIGKILL)
+
+    def kill_tree(self, pid: int, grace: float = KILL_GRACE_SECONDS):
+        """Synchroniczna wersja terminate() - dla atexit i obsługi sygnałów"""
+        processes = self._terminate_signals(pid)
+        _, alive = psutil.wait_procs(processes, timeout=grace)
+        self._signal_tree(pid, alive, signal.SIGKILL)
+
+    def cancel(self):
+        """
+        Anuluje instalację: bieżące drzewa procesów dostają SIGTERM od razu, a SIGKILL po
+        KILL_GRACE_SECONDS; kolejne run() nie uruchamiają już procesów
+        """
+        self.cancelled = True
+        pids = list(self._processes)
+        if not pids:
+            return
+        self.logger.warning(f"Anulowanie - kończenie procesów: {pids}")
+        trees = {pid: self._terminate_signals(pid) for pid in pids}
+
+        def force_kill():
+            for pid, processes in trees.items():
+                self._signal_tree(pid, [process for process in processes if self._alive(process)],
+                                  signal.SIGKILL)
+
+        try:
+            asyncio.get_event_loop().call_later(KILL_GRACE_SECONDS, force_kill)
+        except RuntimeError:
+            # Poza pętlą zdarzeń (np. inny wątek bez pętli)
+            threading.Timer(KILL_GRACE_SECONDS, force_kill).start()
+
+    def kill_all(self):
+        """Zabija wszystkie uruchomione drzewa procesów (sprzątanie przy wyjściu)"""
+        for pid in list(self._processes):
+            self.kill_tree(pid)
+        self._processes.clear()
+
+
+if __name__ == "__main__":
+    async def demo():
+        manager = ProcessManager()
+        started = time.monotonic()
+        result = await manager.run(['sh', '-c', 'sleep 30 & sleep 30 & wait'], timeout=1)
+        print(f"Limit czasu: {result} po {time.monotonic() - started:.1f} s")
+
+        task = asyncio.ensure_future(manager.run(['sh', '-c', 'sleep 30 & wait']))
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        manager.cancel()
+        print(f"Anulowanie: {await task} po {time.monotonic() - started:.1f} s")
+
+    print("=== Menedżer procesów ===")
+    asyncio.run(demo())
@@ -0,0 +1,192 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Model postępu instalacji - postęp z wyjścia ninja/make/git i czas pozostały z historii instalacji
+"""
+import re
+import time
+from typing import Dict, Optional
+
+from build_history import BuildHistory
+from logger_config import get_logger
+
+
+# Etapy instalacji i ich domyślne czasy w sekundach (bez historii dla profilu)
+DEFAULT_STAGE_SECONDS = {
+    'dependencies': 5.0,
+    'download': 60.0,
+    'configure': 20.0,
+    'build': 600.0,
+    'verify': 15.0,
+}
+
+# Etapy, których czas skaluje się odwrotnie do liczby rdzeni
+PARALLEL_STAGES = {'build'}
+
+# Udział liniowej ekstrapolacji w ETA rośnie z postępem etapu
+MIN_FRACTION_FOR_EXTRAPOLATION = 0.05
+
+NINJA_PATTERN = re.compile(r'\[(\d+)/(\d+)\]')
+MAKE_PATTERN = re.compile(r'\[\s*(\d+)%\]')
+# git clone --progress: pobieranie obiektów to większość czasu, rozwiązywanie delt reszta
+GIT_PATTERNS = [
+    (re.compile(r'Receiving objects:\s+(\d+)%'), 0.0, 0.85),
+    (re.compile(r'Resolving deltas:\s+(\d+)%'), 0.85, 0.1),
+    (re.compile(r'Updating files:\s+(\d+)%'), 0.95, 0.05),
+]
+
+
+def parse_progress(line: str) -> Optional[float]:
+    """
+    Postęp etapu (0.0 - 1.0) z linii wyjścia ninja ([n/N]), make ([NN%]) lub git
+
+    Returns:
+        Ułamek postępu lub None, gdy linia go nie zawiera
+    """
+    match = NINJA_PATTERN.match(line)
+    if match:
+        return int(match.group(1)) / max(int(match.group(2)), 1)
+    match = MAKE_PATTERN.match(line)
+    if match:
+        return int(match.group(1)) / 100.0
+    for pattern, start, share in GIT_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            return start + share * int(match.group(1)) / 100.0
+    return None
+
+
+class ProgressModel:
+    """
+    Klasa licząca postęp całej instalacji i szacowany czas pozostały
+
+    Waga etapu to jego oczekiwany czas: mediana z poprzednich instalacji dla tego
+    samego profilu i liczby rdzeni (lub przeskalowana z innej liczby rdzeni),
+    a bez historii - DEFAULT_STAGE_SECONDS. Etapy mogą działać równolegle.
+    """
+
+    def __init__(self, hardware_type: str, cores: int, history: BuildHistory = None):
+        self.logger = get_logger()
+        self.hardware_type = hardware_type
+        self.cores = max(int(cores or 1), 1)
+        self.history = history or BuildHistory()
+        self.expected: Dict[str, float] = dict(DEFAULT_STAGE_SECONDS)
+        self.from_history = set()
+        self.fractions: Dict[str, float] = {stage: 0.0 for stage in DEFAULT_STAGE_SECONDS}
+        self.started: Dict[str, float] = {}
+        self._load_history()
+
+    def _load_history(self):
+        """Oczekiwane czasy etapów z historii instalacji"""
+        try:
+            times = self.history.get_stage_times(self.hardware_type, self.cores)
+        except Exception as e:
+            self.logger.debug(f"Nie można odczytać czasów etapów: {e}")
+            return
+        for stage, (seconds, cores) in times.items():
+            if stage not in self.expected:
+                continue
+            if stage in PARALLEL_STAGES and cores != self.cores:
+                seconds = seconds * cores / self.cores
+            self.expected[stage] = seconds
+            self.from_history.add(stage)
+        if self.from_history:
+            self.logger.debug(f"Oczekiwane czasy etapów ({self.hardware_type}, {self.cores} rdz.): "
+                              f"{ {stage: round(seconds, 1) for stage, seconds in self.expected.items()} }")
+
+    def start_stage(self, stage: str):
+        """Rozpoczyna (lub ponawia) etap"""
+        self.started[stage] = time.monotonic()
+        self.fractions[stage] = 0.0
+
+    def update(self, stage: str, fraction: float):
+        """Ustawia postęp etapu (postęp nie cofa się w ramach jednego uruchomienia)"""
+        if stage in self.fractions:
+            self.fractions[stage] = max(self.fractions[stage], min(max(fraction, 0.0), 1.0))
+
+    def update_from_line(self, stage: str, line: str) -> bool:
+        """Aktualizuje etap na podstawie linii wyjścia; True, gdy linia zawierała postęp"""
+        fraction = parse_progress(line)
+        if fraction is None:
+            return False
+        self.update(stage, fraction)
+        return True
+
+    def finish_stage(self, stage: str, record: bool = True):
+        """
+        Kończy etap
+
+        Args:
+            record: zapisz czas etapu w historii (False np. dla kompilacji przyrostowej)
+        """
+        started = self.started.pop(stage, None)
+        self.fractions[stage] = 1.0
+        if record and started is not None:
+            seconds = time.monotonic() - started
+            try:
+                self.history.record_stage_time(self.hardware_type, self.cores, stage, seconds)
+            except Exception as e:
+                self.logger.debug(f"Nie można zapisać czasu etapu {stage}: {e}")
+
+    def skip_stage(self, stage: str):
+        """Etap pominięty (np. wznowienie) - liczony jako wykonany, bez zapisu czasu"""
+        self.finish_stage(stage, record=False)
+
+    def percent(self) -> int:
+        """Postęp całej instalacji w procentach"""
+        total = sum(self.expected.values())
+        done = sum(self.expected[stage] * fraction for stage, fraction in self.fractions.items())
+        return int(done / total * 100) if total else 0
+
+    def stage_remaining(self, stage: str) -> float:
+        """Szacowany czas do końca etapu w sekundach"""
+        fraction = self.fractions.get(stage, 0.0)
+        if fraction >= 1.0:
+            return 0.0
+        expected = self.expected.get(stage, 0.0)
+        started = self.started.get(stage)
+        if started is None:
+            return expected
+        elapsed = time.monotonic() - started
+        from_history = max(expected - elapsed, 0.0)
+        if fraction < MIN_FRACTION_FOR_EXTRAPOLATION:
+            return from_history
+        # Im dalej w etapie, tym bardziej wierzymy bieżącemu tempu
+        extrapolated = elapsed / fraction * (1.0 - fraction)
+        return fraction * extrapolated + (1.0 - fraction) * from_history
+
+    def eta(self) -> float:
+        """Szacowany czas do końca instalacji w sekundach"""
+        return sum(self.stage_remaining(stage) for stage in self.fractions)
+
+    @staticmethod
+    def format_seconds(seconds: float) -> str:
+        """Czas w formacie mm:ss lub h:mm:ss"""
+        seconds = int(round(seconds))
+        hours, rest = divmod(seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes:02d}:{seconds:02d}"
+
+
+if __name__ == "__main__":
+    import sys
+
+    model = ProgressModel(sys.argv[1] if len(sys.argv) > 1 else 'x86_linux',
+                          int(sys.argv[2]) if len(sys.argv) > 2 else 4)
+    print(f"=== Model postępu: {model.hardware_type}, {model.cores} rdzeni ===")
+    for stage, seconds in model.expected.items():
+        source = 'historia' if stage in model.from_history else 'domyślny'
+        print(f"  {stage}: {model.format_seconds(seconds)} ({source})")
+    print(f"Szacowany czas instalacji: {model.format_seconds(model.eta())}")
+    for line in ["[12/340] Building CXX object ggml/src/ggml.c.o", "[ 45%] Linking CXX executable",
+                 "Receiving objects:  50% (1000/2000), 10.00 MiB | 5.00 MiB/s"]:
+        print(f"  {line!r} -> {parse_progress(line)}")
@@ -0,0 +1,20 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Wspólna konfiguracja testów - moduły z katalogu głównego i logowanie bez plików
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from logger_config import setup_logging  # noqa: E402
+
+setup_logging(log_level="DEBUG", log_to_file=False, log_to_console=False)
@@ -0,0 +1,46 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy telemetrii kompilacji w kontenerze z limitami cgroup
+"""
+import json
+
+import build_telemetry
+from build_telemetry import BuildTelemetry
+
+MB = 1024**2
+
+
+class ContainerDetector:
+    """Kontener z limitem 2 CPU i 4 GB pamięci, z której 512 MB jest wolne"""
+
+    def get_effective_cpu_count(self) -> int:
+        return 2
+
+    def get_memory_status(self) -> dict:
+        return {'total': 4096 * MB, 'available': 512 * MB, 'limited': True}
+
+
+def test_sample_uses_cgroup_memory_and_cpu_limits(tmp_path, monkeypatch):
+    # Host z 8 rdzeniami, z których dwa są w pełni zajęte
+    monkeypatch.setattr(build_telemetry.psutil, 'cpu_percent',
+                        lambda percpu=False: [100.0, 100.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+    monkeypatch.setattr(BuildTelemetry, '_allowed_cpu_percent', staticmethod(lambda per_cpu: per_cpu))
+    telemetry = BuildTelemetry(pid=0, detector=ContainerDetector())
+
+    sample = telemetry.sample()
+    assert sample['available_bytes'] == 512 * MB
+    assert sample['busy_cores'] == 2.0
+    assert sample['cpu_percent'] == 100.0
+    assert telemetry.get_summary()['min_available_mb'] == 512.0
+
+    data = json.loads(telemetry.write(tmp_path).read_text())
+    assert data['cpu_count'] == 2
+    assert data['memory_total_bytes'] == 4096 * MB
@@ -0,0 +1,42 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy jawnych flag ISA dla bisekcji po SIGILL
+"""
+from build_verification import ISA_BISECT_OPTIONS, explicit_isa_flags
+from optimization_configs import OptimizationConfigs
+
+# Host z AVX, bez AVX2/FMA/F16C
+AVX_HOST = ['sse4_2', 'avx', 'popcnt']
+
+
+def test_march_build_gets_every_isa_option_from_host():
+    flags = ['-DGGML_NATIVE=OFF', '-DCMAKE_C_FLAGS=-march=haswell -mtune=haswell -O3']
+    result = explicit_isa_flags(flags, AVX_HOST)
+    assert OptimizationConfigs.get_option(result, 'CMAKE_C_FLAGS') == '-O3'
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX') == 'ON'
+    for option in ('GGML_AVX2', 'GGML_FMA', 'GGML_F16C', 'GGML_BMI2', 'GGML_AVX512'):
+        assert OptimizationConfigs.get_option(result, option) == 'OFF'
+
+
+def test_explicit_options_are_kept_for_bisection():
+    flags = ['-DGGML_NATIVE=OFF', '-DGGML_AVX2=ON', '-DGGML_FMA=ON']
+    result = explicit_isa_flags(flags, AVX_HOST)
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX2') == 'ON'
+    groups = [name for name, options in ISA_BISECT_OPTIONS
+              if any(OptimizationConfigs.get_option(result, option) == 'ON' for option in options)]
+    assert groups == ['AVX2', 'FMA']
+
+
+def test_native_build_is_replaced_by_host_options():
+    result = explicit_isa_flags(['-DGGML_BLAS=ON'], AVX_HOST)
+    assert OptimizationConfigs.get_option(result, 'GGML_NATIVE') == 'OFF'
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX') == 'ON'
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX2') == 'OFF'
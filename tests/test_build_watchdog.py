@@ -0,0 +1,122 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy watchdoga kompilacji - sztuczne strefy termiczne przez LLAMACPP_THERMAL_PATH
+"""
+import signal
+
+import pytest
+
+import build_watchdog
+from build_watchdog import BuildWatchdog, THERMAL_PATH_ENV
+
+
+class FakeProcess:
+    """Proces kompilatora zapamiętujący wysłane sygnały"""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.signals = []
+
+    def send_signal(self, sig):
+        self.signals.append(sig)
+
+    def is_running(self) -> bool:
+        return True
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self.signals) and self.signals[-1] == signal.SIGSTOP
+
+
+def set_temperature(thermal_dir, celsius: float):
+    (thermal_dir / "thermal_zone0" / "temp").write_text(f"{int(celsius * 1000)}\n")
+
+
+@pytest.fixture
+def thermal_dir(tmp_path, monkeypatch):
+    (tmp_path / "thermal_zone0").mkdir()
+    set_temperature(tmp_path, 50)
+    monkeypatch.setenv(THERMAL_PATH_ENV, str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def watchdog(thermal_dir):
+    """Watchdog z czterema procesami kompilatora (od najmłodszego) i dużą ilością wolnej pamięci"""
+    dog = BuildWatchdog(pid=0, memory_low_mb=300)
+    dog.processes = [FakeProcess(pid) for pid in (104, 103, 102, 101)]
+    dog.available_mb = 8000.0
+    dog._get_compiler_processes = lambda: [process for process in dog.processes if process not in dog.paused]
+    dog.read_available_memory_mb = lambda: dog.available_mb
+    return dog
+
+
+def test_reads_fake_thermal_zone(watchdog, thermal_dir):
+    assert watchdog.thermal_path == thermal_dir
+    set_temperature(thermal_dir, 72.5)
+    assert watchdog.read_temperature() == pytest.approx(72.5)
+
+
+def test_pauses_half_at_high_temperature(watchdog, thermal_dir):
+    set_temperature(thermal_dir, 85)
+    watchdog.check()
+    assert [process.pid for process in watchdog.paused] == [104, 103]
+    assert all(process.stopped for process in watchdog.processes[:2])
+    assert not any(process.signals for process in watchdog.processes[2:])
+
+
+def test_resumes_one_per_sample_at_low_temperature(watchdog, thermal_dir):
+    set_temperature(thermal_dir, 85)
+    watchdog.check()
+    set_temperature(thermal_dir, 75)  # Między progami - bez zmian
+    watchdog.check()
+    assert len(watchdog.paused) == 2
+
+    set_temperature(thermal_dir, 60)
+    watchdog.check()
+    assert len(watchdog.paused) == 1
+    watchdog.check()
+    assert watchdog.paused == []
+    assert not any(process.stopped for process in watchdog.processes)
+
+
+def test_resumes_when_no_active_compiler_remains(watchdog, thermal_dir):
+    set_temperature(thermal_dir, 85)
+    watchdog.check()
+    # Niewstrzymane procesy się skończyły, pamięć nadal poniżej progu wznowienia
+    watchdog.processes = watchdog.processes[:2]
+    watchdog.available_mb = 400.0
+    watchdog.check()
+    assert len(watchdog.paused) == 1
+    assert watchdog.events[-1]['action'] == 'wznowiono'
+
+
+def test_resumes_after_max_pause(watchdog, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(build_watchdog.time, 'monotonic', lambda: clock[0])
+    watchdog.available_mb = 200.0
+    watchdog.check()
+    assert len(watchdog.paused) == 3
+
+    # Pamięć nie wraca, ale żaden proces nie może stać dłużej niż max_pause
+    clock[0] += watchdog.max_pause
+    watchdog.processes = watchdog.processes[:3]
+    watchdog.check()
+    assert watchdog.paused == []
+    assert all(process.signals[-1] == signal.SIGCONT for process in watchdog.processes)
+
+
+def test_stop_resumes_all(watchdog):
+    watchdog.available_mb = 200.0
+    watchdog.check()
+    watchdog.stop()
+    assert watchdog.paused == []
+    assert not any(process.stopped for process in watchdog.processes)
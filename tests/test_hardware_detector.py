@@ -0,0 +1,96 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy pamięci z uwzględnieniem limitu cgroup - sztuczne drzewa /sys/fs/cgroup i /proc
+"""
+from collections import namedtuple
+
+import pytest
+
+import hardware_detector
+from background_build import BackgroundBuildPolicy
+from build_watchdog import BuildWatchdog
+from hardware_detector import HardwareDetector
+
+MB = 1024**2
+GB = 1024**3
+
+VirtualMemory = namedtuple('VirtualMemory', 'total available')
+
+
+@pytest.fixture(autouse=True)
+def host_memory(monkeypatch):
+    """Host z 64 GB RAM, z czego 48 GB wolne"""
+    monkeypatch.setattr(hardware_detector.psutil, 'virtual_memory',
+                        lambda: VirtualMemory(64 * GB, 48 * GB))
+
+
+def make_proc(tmp_path, cgroup_line: str):
+    proc = tmp_path / 'proc'
+    (proc / 'self').mkdir(parents=True)
+    (proc / 'self' / 'cgroup').write_text(cgroup_line + '\n')
+    return proc
+
+
+def make_cgroup_v2(tmp_path, limit: str, current: int, inactive_file: int = 0) -> HardwareDetector:
+    root = tmp_path / 'cgroup'
+    group = root / 'build.slice'
+    group.mkdir(parents=True)
+    (root / 'cgroup.controllers').write_text('cpu memory\n')
+    (group / 'memory.max').write_text(limit + '\n')
+    (group / 'memory.current').write_text(f'{current}\n')
+    (group / 'memory.stat').write_text(f'anon {current - inactive_file}\ninactive_file {inactive_file}\n')
+    return HardwareDetector(cgroup_root=str(root), proc_path=str(make_proc(tmp_path, '0::/build.slice')))
+
+
+def make_cgroup_v1(tmp_path, limit: int, usage: int, inactive_file: int = 0) -> HardwareDetector:
+    root = tmp_path / 'cgroup'
+    group = root / 'memory' / 'docker'
+    group.mkdir(parents=True)
+    (group / 'memory.limit_in_bytes').write_text(f'{limit}\n')
+    (group / 'memory.usage_in_bytes').write_text(f'{usage}\n')
+    (group / 'memory.stat').write_text(f'cache {inactive_file}\ntotal_inactive_file {inactive_file}\n')
+    return HardwareDetector(cgroup_root=str(root), proc_path=str(make_proc(tmp_path, '4:memory:/docker')))
+
+
+def test_cgroup_v2_available_is_limit_minus_current(tmp_path):
+    detector = make_cgroup_v2(tmp_path, str(4 * GB), current=3 * GB)
+    status = detector.get_memory_status()
+    assert status == {'total': 4 * GB, 'available': 1 * GB, 'limited': True}
+
+
+def test_cgroup_v2_inactive_file_cache_counts_as_available(tmp_path):
+    detector = make_cgroup_v2(tmp_path, str(4 * GB), current=3 * GB, inactive_file=1 * GB)
+    assert detector.get_memory_status()['available'] == 2 * GB
+
+
+def test_cgroup_v2_without_limit_uses_host_memory(tmp_path):
+    detector = make_cgroup_v2(tmp_path, 'max', current=3 * GB)
+    assert detector.get_memory_status() == {'total': 64 * GB, 'available': 48 * GB, 'limited': False}
+
+
+def test_cgroup_v1_available_is_limit_minus_usage(tmp_path):
+    detector = make_cgroup_v1(tmp_path, 2 * GB, usage=1536 * MB)
+    status = detector.get_memory_status()
+    assert status['total'] == 2 * GB
+    assert status['available'] == 512 * MB
+
+
+def test_watchdog_threshold_follows_cgroup_limit(tmp_path):
+    detector = make_cgroup_v2(tmp_path, str(4 * GB), current=3900 * MB)
+    watchdog = BuildWatchdog(pid=0, detector=detector)
+    # 10% z 4 GB zamiast 1 GB (górna granica) liczone od 64 GB hosta
+    assert watchdog.memory_low_mb == 409
+    assert watchdog.read_available_memory_mb() == pytest.approx(196)
+
+
+def test_background_memory_limit_follows_cgroup_limit(tmp_path):
+    detector = make_cgroup_v2(tmp_path, str(4 * GB), current=1 * GB)
+    assert BackgroundBuildPolicy(2, detector)._get_memory_limit() == '2048M'
@@ -0,0 +1,50 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy launchera wybierającego build zgodny z CPU
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from llama_installer import LlamaInstaller
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'), reason="launcher czyta /proc")
+
+
+def write_launcher(install_dir, builds):
+    installer = LlamaInstaller.__new__(LlamaInstaller)
+    installer.install_dir = install_dir
+    for build_name, _ in builds:
+        bin_dir = install_dir / build_name / 'bin'
+        bin_dir.mkdir(parents=True)
+        program = bin_dir / 'llama-cli'
+        program.write_text(f'#!/bin/sh\necho {build_name}\n')
+        program.chmod(0o755)
+    launcher = install_dir / 'llama-cli'
+    launcher.write_text(installer._generate_launcher('llama-cli', builds))
+    launcher.chmod(0o755)
+    return launcher
+
+
+def test_cache_goes_to_user_directory_without_runtime_dir(tmp_path):
+    home = tmp_path / 'home'
+    launcher = write_launcher(tmp_path / 'llama.cpp', [('build-future', ['no_such_flag']), ('build', [])])
+    env = {'PATH': os.environ.get('PATH', '/usr/bin:/bin'), 'HOME': str(home)}
+
+    for _ in range(2):  # Drugie uruchomienie czyta cache
+        result = subprocess.run([str(launcher)], env=env, capture_output=True, text=True)
+        assert result.returncode == 0
+        assert result.stdout.strip() == 'build'
+        assert result.stderr == ''
+    cache = home / '.cache' / 'llamacpp-cpuflags'
+    assert cache.read_text().split()[0] == open('/proc/sys/kernel/random/boot_id').read().strip()
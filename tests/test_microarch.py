@@ -0,0 +1,66 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy wyznaczania flag ISA mikroarchitektury
+"""
+import platform
+import shutil
+
+import pytest
+
+from microarch import MicroarchResolver
+
+x86_compiler = pytest.mark.skipif(
+    platform.machine().lower() not in ('x86_64', 'amd64') or not shutil.which('cc'),
+    reason="wymaga kompilatora x86")
+
+
+@x86_compiler
+def test_march_cpu_flags_from_compiler_macros():
+    resolver = MicroarchResolver('cc')
+    flags = resolver.get_march_cpu_flags('-march=sandybridge -mtune=sandybridge')
+    assert 'avx' in flags and 'sse4_2' in flags
+    assert 'avx2' not in flags and 'fma' not in flags and 'f16c' not in flags
+    assert {'avx2', 'fma', 'f16c', 'bmi2'} <= set(resolver.get_march_cpu_flags('-march=haswell'))
+
+
+@x86_compiler
+def test_march_cpu_flags_unknown_march_is_empty():
+    assert MicroarchResolver('cc').get_march_cpu_flags('-march=no-such-cpu') == []
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    """Resolver x86 z hostem obsługującym AVX (bez AVX2) - sztuczne /proc/cpuinfo"""
+    cpuinfo = tmp_path / 'cpuinfo'
+    cpuinfo.write_text('processor\t: 0\nvendor_id\t: GenuineIntel\n'
+                       'flags\t\t: fpu sse4_2 avx popcnt\n\n')
+    detector = MicroarchResolver('cc', cpuinfo_path=str(cpuinfo))
+    detector.machine = 'x86_64'
+    return detector
+
+
+def test_required_flags_unset_native_means_host_isa(resolver):
+    assert resolver.get_required_cpu_flags(['-DGGML_BLAS=ON']) == ['sse4_2', 'avx']
+
+
+def test_required_flags_native_off_counts_ggml_default_options(resolver):
+    required = resolver.get_required_cpu_flags(['-DGGML_NATIVE=OFF', '-DGGML_AVX512=OFF'])
+    assert set(required) == {'sse4_2', 'avx', 'avx2', 'bmi2', 'fma', 'f16c'}
+
+
+def test_required_flags_native_off_with_explicit_options(resolver):
+    flags = ['-DGGML_NATIVE=OFF', '-DGGML_AVX2=OFF', '-DGGML_FMA=OFF', '-DGGML_F16C=OFF',
+             '-DGGML_BMI2=OFF', '-DCMAKE_C_FLAGS=-march=x86-64-v2 -mtune=generic']
+    assert set(resolver.get_required_cpu_flags(flags)) == {'sse4_2', 'avx'}
+
+
+def test_required_flags_cpu_variants_run_anywhere(resolver):
+    assert resolver.get_required_cpu_flags(['-DGGML_BACKEND_DL=ON', '-DGGML_CPU_ALL_VARIANTS=ON']) == []
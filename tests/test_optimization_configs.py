@@ -0,0 +1,201 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy drabiny konfiguracji zapasowych i flag mikroarchitektury
+"""
+import pytest
+
+from microarch import GGML_OPTION_CPU_FLAGS
+from optimization_configs import OptimizationConfigs
+
+FLAGS = [
+    '-DGGML_LTO=ON',
+    '-DGGML_BLAS=ON',
+    '-DGGML_OPENMP=ON',
+    '-DLLAMA_CURL=ON',
+    '-DCMAKE_UNITY_BUILD=ON',
+    '-DCMAKE_EXE_LINKER_FLAGS=-fuse-ld=mold',
+    '-DCMAKE_SHARED_LINKER_FLAGS=-fuse-ld=mold',
+]
+
+# Komenda linkowania wypisana przez ninja po "FAILED:" - zawiera nazwy opcji i bibliotek
+NINJA_LINK_ECHO = [
+    'FAILED: bin/llama-cli',
+    ': && /usr/bin/c++ -O3 -DNDEBUG -flto=auto -fno-fat-lto-objects -fuse-ld=mold '
+    'tools/main/CMakeFiles/llama-cli.dir/main.cpp.o -o bin/llama-cli '
+    '-Wl,-rpath,/opt/llama.cpp/build/bin common/libcommon.a -lcurl '
+    'bin/libllama.so bin/libggml.so bin/libggml-cpu.so /usr/lib/x86_64-linux-gnu/libopenblas.so '
+    '/usr/lib/gcc/x86_64-linux-gnu/12/libgomp.so -lpthread && :',
+]
+
+# Komenda kompilacji wypisana przez ninja po "FAILED:"
+NINJA_COMPILE_ECHO = [
+    '[57/212] Building CXX object ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx.o',
+    'FAILED: ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx.o',
+    '/usr/bin/c++ -DGGML_USE_OPENMP -DGGML_USE_BLAS -I/opt/llama.cpp/ggml/include -O3 -flto=auto '
+    '-fopenmp -MD -MT ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx.o '
+    '-o ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx.o '
+    '-c /opt/llama.cpp/build/ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx',
+]
+
+
+def classify(lines, flags=FLAGS):
+    step = OptimizationConfigs.classify_build_failure(flags, lines)
+    return step['name'] if step else None
+
+
+def test_echoed_command_line_alone_is_not_a_diagnostic():
+    output = NINJA_LINK_ECHO + [
+        "/opt/llama.cpp/tools/main/main.cpp:42: error: 'foo' was not declared in this scope",
+        'ninja: build stopped: subcommand failed.',
+    ]
+    assert classify(output) is None
+
+
+def test_lto_wrapper_serial_compilation_warning_is_ignored():
+    output = NINJA_LINK_ECHO + [
+        'lto-wrapper: warning: using serial compilation of 4 LTRANS jobs',
+        'lto-wrapper: note: see the \'-flto\' option documentation for more information',
+        "main.cpp:(.text+0x1c): undefined reference to `llama_model_foo'",
+        'collect2: error: ld returned 1 exit status',
+        'ninja: build stopped: subcommand failed.',
+    ]
+    assert classify(output) is None
+
+
+def test_lto_wrapper_fatal_error():
+    output = NINJA_LINK_ECHO + [
+        'lto-wrapper: fatal error: /usr/bin/c++ returned 1 exit status',
+        'compilation terminated.',
+        '/usr/bin/ld: error: lto-wrapper failed',
+        'collect2: error: ld returned 1 exit status',
+    ]
+    assert classify(output) == 'lto'
+
+
+def test_llvm_gold_plugin_missing():
+    output = NINJA_LINK_ECHO + [
+        '/usr/bin/ld: /usr/lib/llvm-15/bin/../lib/LLVMgold.so: error loading plugin: '
+        'LLVMgold.so: cannot open shared object file: No such file or directory',
+        'clang: error: linker command failed with exit code 1 (use -v to see invocation)',
+    ]
+    assert classify(output) == 'lto'
+
+
+def test_gcc_missing_omp_header():
+    output = NINJA_COMPILE_ECHO + [
+        '/opt/llama.cpp/ggml/src/ggml-cpu/ggml-cpu.c:21:10: fatal error: omp.h: No such file or directory',
+        '   21 | #include <omp.h>',
+        '      |          ^~~~~~~',
+        'compilation terminated.',
+    ]
+    # Błąd w pliku ggml-cpu.c, nie w pliku unity - ma wygrać OpenMP
+    assert classify(output) == 'openmp'
+
+
+def test_clang_missing_omp_header():
+    output = [
+        "/opt/llama.cpp/ggml/src/ggml-cpu/ggml-cpu.c:21:10: fatal error: 'omp.h' file not found",
+        '#include <omp.h>',
+        '         ^~~~~~~',
+        '1 error generated.',
+    ]
+    assert classify(output) == 'openmp'
+
+
+def test_gnu_ld_missing_openblas():
+    output = NINJA_LINK_ECHO + [
+        '/usr/bin/ld: cannot find -lopenblas: No such file or directory',
+        'collect2: error: ld returned 1 exit status',
+    ]
+    assert classify(output) == 'blas'
+
+
+def test_mold_missing_curl_is_not_a_linker_failure():
+    output = NINJA_LINK_ECHO + [
+        'mold: fatal: library not found: curl',
+        'collect2: error: ld returned 1 exit status',
+    ]
+    assert classify(output) == 'curl'
+
+
+def test_lld_undefined_omp_symbol():
+    output = [
+        'ld.lld: error: undefined symbol: omp_get_thread_num',
+        '>>> referenced by ggml-cpu.c',
+        'clang: error: linker command failed with exit code 1 (use -v to see invocation)',
+    ]
+    assert classify(output) == 'openmp'
+
+
+def test_clang_invalid_linker_name():
+    output = NINJA_LINK_ECHO + [
+        "clang++: error: invalid linker name in argument '-fuse-ld=mold'",
+    ]
+    assert classify(output) == 'linker'
+
+
+def test_mold_crash_is_a_linker_failure():
+    output = NINJA_LINK_ECHO + [
+        'mold: fatal: bin/libggml-cpu.so: unknown relocation type: 0x2a',
+    ]
+    assert classify(output) == 'linker'
+
+
+def test_unity_redefinition():
+    output = NINJA_COMPILE_ECHO + [
+        '/opt/llama.cpp/build/ggml/src/CMakeFiles/ggml-cpu.dir/Unity/unity_0_cxx.cxx:9:10: '
+        "error: redefinition of 'static int block_size'",
+    ]
+    assert classify(output) == 'unity'
+
+
+def test_applied_step_is_skipped():
+    output = ['/usr/bin/ld: cannot find -lopenblas: No such file or directory']
+    flags = OptimizationConfigs.set_option(FLAGS, 'GGML_BLAS', 'OFF')
+    assert classify(output, flags) is None
+
+
+@pytest.mark.parametrize('line', [
+    "ggml.c:12:10: fatal error: 'curl/curl.h' file not found",
+    'common/arg.cpp:15:10: fatal error: curl/curl.h: No such file or directory',
+    "arg.cpp:(.text+0x8f2): undefined reference to `curl_easy_init'",
+])
+def test_missing_curl(line):
+    assert classify([line]) == 'curl'
+
+
+def test_apply_microarch_sets_isa_options_from_march():
+    flags = OptimizationConfigs.get_cmake_flags('x86_linux')
+    # -march=sandybridge: AVX bez AVX2/FMA/F16C
+    result = OptimizationConfigs.apply_microarch(flags, '-march=sandybridge -mtune=sandybridge',
+                                                 ['sse4_2', 'avx'])
+    assert OptimizationConfigs.get_option(result, 'GGML_NATIVE') == 'OFF'
+    assert OptimizationConfigs.get_option(result, 'GGML_SSE42') == 'ON'
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX') == 'ON'
+    for option in ('GGML_AVX2', 'GGML_FMA', 'GGML_F16C', 'GGML_BMI2', 'GGML_AVX512', 'GGML_AMX_INT8'):
+        assert OptimizationConfigs.get_option(result, option) == 'OFF'
+    assert OptimizationConfigs.get_option(result, 'CMAKE_C_FLAGS') == '-march=sandybridge -mtune=sandybridge'
+    assert OptimizationConfigs.get_option(result, 'GGML_BLAS') == 'ON'
+
+
+def test_apply_microarch_without_known_isa_forces_options_off():
+    flags = OptimizationConfigs.get_cmake_flags('x86_linux')
+    result = OptimizationConfigs.apply_microarch(flags, '-march=znver4 -mtune=znver4', [])
+    for option in GGML_OPTION_CPU_FLAGS:
+        assert OptimizationConfigs.get_option(result, option) == 'OFF'
+    assert len([flag for flag in result if flag.startswith('-DGGML_AVX2=')]) == 1
+
+
+def test_apply_microarch_on_arm_only_removes_isa_options():
+    flags = OptimizationConfigs.get_cmake_flags('rpi5_8gb') + ['-DGGML_AVX2=ON']
+    result = OptimizationConfigs.apply_microarch(flags, '-mcpu=cortex-a76')
+    assert OptimizationConfigs.get_option(result, 'GGML_AVX2') is None
+    assert OptimizationConfigs.get_option(result, 'CMAKE_C_FLAGS') == '-mcpu=cortex-a76 -O3'
@@ -0,0 +1,40 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy przechwytywania wyjścia - pliki pełnego wyjścia kolejnych prób
+"""
+from datetime import datetime
+
+import output_capture
+from output_capture import OutputCapture
+
+
+class FrozenDatetime(datetime):
+    """Zegar zatrzymany w jednej chwili - kolejne próby dostają ten sam znacznik czasu"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 2, 3, 4, 5, 678901)
+
+
+def test_quick_retry_does_not_truncate_previous_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_capture, 'datetime', FrozenDatetime)
+
+    first = OutputCapture('cmake_build', tmp_path)
+    first.append('/usr/bin/ld: cannot find -lopenblas')
+    first.close()
+    second = OutputCapture('cmake_build', tmp_path)
+    second.append('[1/2] Building C object ggml.c.o')
+    second.close()
+
+    assert first.spill_path != second.spill_path
+    assert first.spill_path.name == 'cmake_build_20250102_030405_678901.log'
+    assert first.spill_path.read_text() == '/usr/bin/ld: cannot find -lopenblas\n'
+    assert second.spill_path.read_text() == '[1/2] Building C object ggml.c.o\n'
@@ -0,0 +1,52 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy synchronicznego uruchamiania procesów w grupach menedżera
+"""
+import sys
+import threading
+import time
+
+import pytest
+
+from process_manager import ProcessManager
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith('win'), reason="grupy procesów POSIX")
+
+
+def test_run_sync_captures_output():
+    result = ProcessManager().run_sync(['sh', '-c', 'echo out; echo err >&2; exit 3'])
+    assert result['returncode'] == 3
+    assert result['stdout'] == 'out\n'
+    assert result['stderr'] == 'err\n'
+    assert not result['timed_out']
+
+
+def test_run_sync_timeout_kills_process_group():
+    started = time.monotonic()
+    result = ProcessManager().run_sync(['sh', '-c', 'sleep 30 & sleep 30; wait'], timeout=0.5)
+    assert result['timed_out']
+    assert time.monotonic() - started < 10
+
+
+def test_cancel_kills_run_sync_from_another_thread():
+    manager = ProcessManager()
+    results = []
+    worker = threading.Thread(target=lambda: results.append(manager.run_sync(['sleep', '30'])))
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not manager._processes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.cancel()
+    worker.join(10)
+
+    assert not worker.is_alive()
+    assert results[0]['cancelled']
+    assert manager.run_sync(['true'])['cancelled']
@@ -0,0 +1,35 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Testy wyboru kompilatorów do porównania wydajności
+"""
+from toolchain import ToolchainDetector
+
+
+def compiler(name: str, family: str, version: str) -> dict:
+    return {'name': name, 'family': family, 'version': version,
+            'cc': f'/usr/bin/{name}', 'cxx': f'/usr/bin/{name}++'}
+
+
+def test_compare_candidates_are_newest_in_each_family(monkeypatch):
+    detector = ToolchainDetector()
+    monkeypatch.setattr(detector, 'detect_compilers', lambda: [
+        compiler('gcc', 'gcc', '12.2.0'),
+        compiler('gcc-14', 'gcc', '14.1.0'),
+        compiler('clang', 'clang', '18.1.3'),
+        compiler('clang-15', 'clang', '15.0.7'),
+    ])
+    assert [c['name'] for c in detector.select_compare_candidates()] == ['gcc-14', 'clang']
+
+
+def test_compare_candidates_skip_missing_family(monkeypatch):
+    detector = ToolchainDetector()
+    monkeypatch.setattr(detector, 'detect_compilers', lambda: [compiler('gcc', 'gcc', '12.2.0')])
+    assert [c['name'] for c in detector.select_compare_candidates()] == ['gcc']
@@ -0,0 +1,419 @@
+"""
+Automatyczny instalator llama.cpp
+Copyright (c) 2025 Fibogacci
+Licencja: MIT
+
+Website: https://fibogacci.pl
+GitHub: https://github.com/fibogacci
+Projekt: https://fibogacci.pl/ai/llamacpp
+LinkedIn: https://linkedin.com/in/Fibogacci
+
+Wykrywanie narzędzi budowania: linker, tryb LTO, pomiar czasu linkowania
+"""
+import os
+import re
+import shutil
+import stat
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logger_config import get_logger
+
+
+# Linkery od najszybszego: nazwa -> (plik wykonywalny, wartość CMAKE_LINKER_TYPE)
+LINKERS = [
+    ('mold', 'mold', 'MOLD'),
+    ('lld', 'ld.lld', 'LLD'),
+    ('gold', 'ld.gold', 'GOLD'),
+]
+
+# CMAKE_LINKER_TYPE jest dostępne od CMake 3.29, launcher linkera od 3.21,
+# cmake_language(DEFER) (wyłączanie unity dla kerneli CPU) od 3.19
+CMAKE_LINKER_TYPE_VERSION = (3, 29)
+CMAKE_LINKER_LAUNCHER_VERSION = (3, 21)
+CMAKE_DEFER_VERSION = (3, 19)
+
+UNITY_INCLUDE_FILE = "unity_exclude_kernels.cmake"
+UNITY_BATCH_SIZE = 16
+
+# Wywoływane po każdym project(); na końcu przetwarzania głównego katalogu
+# wyłącza UNITY_BUILD dla celów ggml-cpu* (kernele z flagami ISA per plik)
+UNITY_INCLUDE_TEMPLATE = """# Wygenerowane przez instalator llama.cpp - unity build bez kerneli CPU
+if(NOT COMMAND _llamacpp_installer_unity_exclude)
+  function(_llamacpp_installer_collect_targets dir out)
+    get_property(targets DIRECTORY "${dir}" PROPERTY BUILDSYSTEM_TARGETS)
+    get_property(subdirs DIRECTORY "${dir}" PROPERTY SUBDIRECTORIES)
+    foreach(subdir IN LISTS subdirs)
+      _llamacpp_installer_collect_targets("${subdir}" subdir_targets)
+      list(APPEND targets ${subdir_targets})
+    endforeach()
+    set(${out} ${targets} PARENT_SCOPE)
+  endfunction()
+
+  function(_llamacpp_installer_unity_exclude)
+    _llamacpp_installer_collect_targets("${CMAKE_SOURCE_DIR}" targets)
+    foreach(target IN LISTS targets)
+      if(target MATCHES "^ggml-cpu")
+        set_target_properties(${target} PROPERTIES UNITY_BUILD OFF)
+      endif()
+    endforeach()
+  endfunction()
+
+  cmake_language(DEFER DIRECTORY "${CMAKE_SOURCE_DIR}" CALL _llamacpp_installer_unity_exclude)
+endif()
+"""
+
+LINK_TIMES_FILE = ".link_times"
+LINK_TIMER_SCRIPT = "link_timer.sh"
+
+# Czasy kompilacji plików dla generatorów bez .ninja_log (Makefile)
+COMPILE_TIMES_FILE = ".compile_times"
+COMPILE_TIMER_SCRIPT = "compile_timer.sh"
+
+# Rodziny kompilatorów: polecenie C -> polecenie C++ (z tym samym sufiksem wersji)
+COMPILER_FAMILIES = [('gcc', 'g++'), ('clang', 'clang++')]
+COMPILER_VERSION_RANGE = range(30, 8, -1)
+
+LINKER_FLAG_OPTIONS = ['CMAKE_EXE_LINKER_FLAGS', 'CMAKE_SHARED_LINKER_FLAGS', 'CMAKE_MODULE_LINKER_FLAGS']
+
+
+class ToolchainDetector:
+    """Klasa wybierająca linker i parametry LTO dla kompilacji llama.cpp"""
+
+    def __init__(self, compiler: str = None):
+        self.logger = get_logger()
+        self.compiler = compiler or os.environ.get('CC', 'cc')
+        self._probe_cache = {}
+
+    def get_cmake_version(self) -> Tuple[int, ...]:
+        """Zwraca wersję CMake jako krotkę, np. (3, 25, 1)"""
+        try:
+            result = subprocess.run(['cmake', '--version'], capture_output=True, text=True, timeout=10)
+            match = re.search(r'(\d+)\.(\d+)(?:\.(\d+))?', result.stdout)
+            if match:
+                return tuple(int(part) for part in match.groups() if part is not None)
+        except Exception as e:
+            self.logger.debug(f"Nie można odczytać wersji CMake: {e}")
+        return (0,)
+
+    def get_compiler_id(self) -> str:
+        """Rozpoznaje rodzinę kompilatora: 'gcc', 'clang' lub 'unknown'"""
+        try:
+            result = subprocess.run([self.compiler, '--version'], capture_output=True, text=True, timeout=10)
+            version = result.stdout.lower()
+        except Exception:
+            return 'unknown'
+
+        if 'clang' in version:
+            return 'clang'
+        if 'gcc' in version or 'free software foundation' in version:
+            return 'gcc'
+        return 'unknown'
+
+    def get_compiler_version(self, compiler: str = None) -> str:
+        """Zwraca wersję kompilatora, np. '12.2.0'"""
+        try:
+            result = subprocess.run([compiler or self.compiler, '--version'],
+                                    capture_output=True, text=True, timeout=10)
+            first_line = result.stdout.splitlines()[0] if result.stdout else ''
+        except Exception:
+            return ''
+
+        match = re.search(r'version (\d+(?:\.\d+)*)', first_line)
+        if match:
+            return match.group(1)
+        versions = re.findall(r'\d+\.\d+(?:\.\d+)?', first_line)
+        return versions[-1] if versions else ''
+
+    def detect_compilers(self) -> List[Dict[str, str]]:
+        """
+        Wyszukuje zainstalowane kompilatory GCC i Clang (także wersjonowane, np. clang-18)
+
+        Returns:
+            Lista słowników z kluczami name, family, version, cc, cxx
+        """
+        compilers = []
+        seen = set()
+        for family, cxx_command in COMPILER_FAMILIES:
+            names = [family] + [f'{family}-{version}' for version in COMPILER_VERSION_RANGE]
+            for name in names:
+                cc = shutil.which(name)
+                cxx = shutil.which(cxx_command + name[len(family):])
+                if not cc or not cxx or os.path.realpath(cc) in seen:
+                    continue
+                seen.add(os.path.realpath(cc))
+
+                # Np. na macOS 'gcc' to w rzeczywistości Clang
+                detected_family = ToolchainDetector(cc).get_compiler_id()
+                compilers.append({
+                    'name': name,
+                    'family': detected_family if detected_family != 'unknown' else family,
+                    'version': self.get_compiler_version(cc),
+                    'cc': cc,
+                    'cxx': cxx,
+                })
+
+        self.logger.debug(f"Wykryte kompilatory: {compilers}")
+        return compilers
+
+    def find_compiler(self, name: str) -> Optional[Dict[str, str]]:
+        """Znajduje kompilator po nazwie ('gcc-12') lub rodzinie ('clang' = najnowszy Clang)"""
+        compilers = self.detect_compilers()
+        for compiler in compilers:
+            if compiler['name'] == name or compiler['cc'] == name:
+                return compiler
+
+        family = [compiler for compiler in compilers if compiler['family'] == name]
+        return max(family, key=_version_key) if family else None
+
+    def select_compare_candidates(self) -> List[Dict[str, str]]:
+        """Zwraca najnowszy kompilator z każdej rodziny (do porównania wydajności)"""
+        # Nie find_compiler(family) - nazwa 'gcc' wskazałaby domyślny, a nie najnowszy (gcc-14)
+        compilers = self.detect_compilers()
+        candidates = []
+        for family, _ in COMPILER_FAMILIES:
+            members = [compiler for compiler in compilers if compiler['family'] == family]
+            if members:
+                candidates.append(max(members, key=_version_key))
+        return candidates
+
+    def detect_linkers(self) -> Dict[str, str]:
+        """Zwraca zainstalowane szybkie linkery: nazwa -> ścieżka"""
+        found = {}
+        for name, executable, _ in LINKERS:
+            path = shutil.which(executable)
+            if path:
+                found[name] = path
+        self.logger.debug(f"Wykryte linkery: {found}")
+        return found
+
+    def supports_linker(self, name: str) -> bool:
+        """Sprawdza, czy kompilator potrafi linkować z -fuse-ld=<name>"""
+        if name in self._probe_cache:
+            return self._probe_cache[name]
+
+        supported = False
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "probe.c"
+            source.write_text("int main(void) { return 0; }\n")
+            try:
+                result = subprocess.run(
+                    [self.compiler, f'-fuse-ld={name}', str(source), '-o', str(Path(temp_dir) / "probe")],
+                    capture_output=True, text=True, timeout=30
+                )
+                supported = result.returncode == 0
+            except Exception as e:
+                self.logger.debug(f"Test -fuse-ld={name} nie powiódł się: {e}")
+
+        self._probe_cache[name] = supported
+        return supported
+
+    def select_linker(self) -> Optional[str]:
+        """Wybiera najszybszy dostępny linker obsługiwany przez kompilator"""
+        installed = self.detect_linkers()
+        for name, _, _ in LINKERS:
+            if name in installed and self.supports_linker(name):
+                return name
+        return None
+
+    def get_lto_link_flags(self, compiler_id: str, linker: Optional[str], jobs: int) -> List[str]:
+        """
+        Flagi linkera dla równoległego LTO
+
+        GCC: -flto=auto dzieli etap LTRANS na partycje i korzysta z jobservera
+        make (przy Ninja - z liczby rdzeni). Clang: CMake buduje ThinLTO,
+        więc przekazujemy tylko liczbę wątków do linkera.
+        """
+        if compiler_id == 'gcc':
+            return ['-flto=auto']
+        if compiler_id == 'clang':
+            if linker == 'lld':
+                return [f'-Wl,--thinlto-jobs={jobs}']
+            if linker in ('mold', 'gold'):
+                return [f'-Wl,-plugin-opt,jobs={jobs}']
+        return []
+
+    def get_cmake_flags(self, cmake_flags: List[str], jobs: int) -> Tuple[List[str], Dict[str, any]]:
+        """
+        Dodaje do flag CMAKE wybór linkera i równoległe LTO
+
+        Returns:
+            Krotka (nowe flagi CMAKE, informacje o wybranym toolchainie)
+        """
+        cmake_version = self.get_cmake_version()
+        compiler_id = self.get_compiler_id()
+        linker = self.select_linker()
+        lto = any(flag == '-DGGML_LTO=ON' for flag in cmake_flags)
+
+        result = list(cmake_flags)
+        link_flags = []
+
+        if linker and cmake_version >= CMAKE_LINKER_TYPE_VERSION:
+            linker_type = next(linker_type for name, _, linker_type in LINKERS if name == linker)
+            result.append(f'-DCMAKE_LINKER_TYPE={linker_type}')
+        elif linker:
+            link_flags.append(f'-fuse-ld={linker}')
+
+        if lto:
+            link_flags.extend(self.get_lto_link_flags(compiler_id, linker, jobs))
+
+        if link_flags:
+            result = self._extend_linker_flags(result, link_flags)
+
+        info = {
+            'compiler': compiler_id,
+            'linker': linker or 'default',
+            'lto': lto,
+            'lto_flags': self.get_lto_link_flags(compiler_id, linker, jobs) if lto else [],
+            'cmake_version': '.'.join(str(part) for part in cmake_version),
+        }
+        self.logger.info(f"Toolchain: {info}")
+        return result, info
+
+    def _extend_linker_flags(self, cmake_flags: List[str], link_flags: List[str]) -> List[str]:
+        """Dopisuje flagi do CMAKE_*_LINKER_FLAGS, zachowując istniejące wartości"""
+        result = list(cmake_flags)
+        for option in LINKER_FLAG_OPTIONS:
+            prefix = f'-D{option}='
+            existing = [flag for flag in result if flag.startswith(prefix)]
+            value = existing[-1][len(prefix):] if existing else ''
+            result = [flag for flag in result if not flag.startswith(prefix)]
+            result.append(prefix + ' '.join(filter(None, [value] + link_flags)))
+        return result
+
+    def select_generator(self) -> Optional[str]:
+        """
+        Wybiera generator CMake: Ninja, jeśli jest zainstalowany
+
+        Returns:
+            'Ninja' lub None (domyślny generator albo ustawiony w CMAKE_GENERATOR)
+        """
+        if os.environ.get('CMAKE_GENERATOR'):
+            return None
+        return 'Ninja' if shutil.which('ninja') else None
+
+    def supports_unity_exclusion(self) -> bool:
+        """Czy CMake obsługuje cmake_language(DEFER) potrzebne do wyłączenia kerneli z unity"""
+        return self.get_cmake_version() >= CMAKE_DEFER_VERSION
+
+    def get_unity_flags(self, build_dir: Path) -> List[str]:
+        """Flagi CMAKE dla unity build z wyłączonymi kernelami CPU"""
+        include_file = Path(build_dir) / UNITY_INCLUDE_FILE
+        include_file.write_text(UNITY_INCLUDE_TEMPLATE)
+        return [
+            '-DCMAKE_UNITY_BUILD=ON',
+            f'-DCMAKE_UNITY_BUILD_BATCH_SIZE={UNITY_BATCH_SIZE}',
+            f'-DCMAKE_PROJECT_INCLUDE={include_file}',
+        ]
+
+    def supports_link_timer(self) -> bool:
+        """Czy CMake obsługuje CMAKE_<LANG>_LINKER_LAUNCHER"""
+        return self.get_cmake_version() >= CMAKE_LINKER_LAUNCHER_VERSION
+
+
+def _version_key(compiler: Dict[str, str]) -> Tuple[int, ...]:
+    """Klucz sortowania kompilatorów po wersji"""
+    return tuple(int(part) for part in re.findall(r'\d+', compiler.get('version', '')))
+
+
+def _write_timer(build_dir: Path, script_name: str, times_name: str) -> Path:
+    """Tworzy launcher dopisujący do times_name linię '<start> <koniec> <cel>' dla każdego wywołania"""
+    build_dir = Path(build_dir)
+    build_dir.mkdir(parents=True, exist_ok=True)
+    script = build_dir / script_name
+    times_file = build_dir / times_name
+
+    script.write_text(f"""#!/bin/sh
+start=$(date +%s.%N)
+"$@"
+status=$?
+end=$(date +%s.%N)
+target=$(printf '%s\\n' "$@" | grep -A1 -x -- '-o' | tail -n 1)
+echo "$start $end ${{target:-?}}" >> "{times_file}"
+exit $status
+""")
+    script.chmod(script.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return script
+
+
+def _read_intervals(times_file: Path) -> List[Tuple[float, float, str]]:
+    """Przedziały zapisane przez launcher: (start, koniec, cel), czasy w sekundach od epoki"""
+    if not times_file.exists():
+        return []
+
+    intervals = []
+    for line in times_file.read_text().splitlines():
+        parts = line.split(maxsplit=2)
+        try:
+            intervals.append((float(parts[0]), float(parts[1]), parts[2] if len(parts) > 2 else '?'))
+        except (IndexError, ValueError):
+            continue
+    return intervals
+
+
+def write_link_timer(build_dir: Path) -> Path:
+    """
+    Tworzy launcher linkera zapisujący czas każdego linkowania
+
+    Każde wywołanie dopisuje do .link_times linię '<start> <koniec> <cel>'.
+    """
+    return _write_timer(build_dir, LINK_TIMER_SCRIPT, LINK_TIMES_FILE)
+
+
+def write_compile_timer(build_dir: Path) -> Path:
+    """
+    Tworzy launcher kompilatora zapisujący czas kompilacji każdego pliku
+
+    Dla generatora Makefile, który nie zapisuje czasów zadań jak .ninja_log.
+    Każde wywołanie dopisuje do .compile_times linię '<start> <koniec> <obiekt>'.
+    """
+    return _write_timer(build_dir, COMPILE_TIMER_SCRIPT, COMPILE_TIMES_FILE)
+
+
+def read_link_intervals(build_dir: Path) -> List[Tuple[float, float, str]]:
+    """Zapisane przez launcher linkowania: (start, koniec, cel), czasy w sekundach od epoki"""
+    return _read_intervals(Path(build_dir) / LINK_TIMES_FILE)
+
+
+def read_compile_intervals(build_dir: Path) -> List[Tuple[float, float, str]]:
+    """Zapisane przez launcher kompilacje: (start, koniec, obiekt), czasy w sekundach od epoki"""
+    return _read_intervals(Path(build_dir) / COMPILE_TIMES_FILE)
+
+
+def read_link_time(build_dir: Path) -> Optional[float]:
+    """
+    Zwraca łączny czas linkowania w sekundach (suma przedziałów, nakładające się liczone raz)
+    """
+    intervals = [(start, end) for start, end, _ in read_link_intervals(build_dir)]
+    if not intervals:
+        return None
+
+    total = 0.0
+    current_start, current_end = None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    total += current_end - current_start
+    return total
+
+
+if __name__ == "__main__":
+    detector = ToolchainDetector()
+    print("=== Toolchain ===")
+    print(f"Kompilator: {detector.compiler} ({detector.get_compiler_id()} {detector.get_compiler_version()})")
+    for compiler in detector.detect_compilers():
+        print(f"  {compiler['name']}: {compiler['family']} {compiler['version']} ({compiler['cc']}, {compiler['cxx']})")
+    print(f"CMake: {'.'.join(str(part) for part in detector.get_cmake_version())}")
+    print(f"Zainstalowane linkery: {detector.detect_linkers() or 'brak'}")
+    print(f"Wybrany linker: {detector.select_linker() or 'domyślny'}")
+    print(f"Generator: {detector.select_generator() or os.environ.get('CMAKE_GENERATOR', 'domyślny')}")
+    flags, info = detector.get_cmake_flags(['-DGGML_LTO=ON'], os.cpu_count() or 1)
+    print("Flagi CMAKE:")
+    for flag in flags:
+        print(f"  {flag}")
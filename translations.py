@@ -103,6 +103,18 @@ class TranslationManager:
             "logical_cores": "Rdzenie logiczne",
             "avx_support": "Obsługa AVX",
             "avx2_support": "Obsługa AVX2",
+            "microarchitecture": "Mikroarchitektura",
+            "microarch_flags": "Flagi mikroarchitektury",
+            "microarch_unknown": "nierozpoznana",
+            "cpu_variant_predicted": "Wariant backendu CPU (przewidywany)",
+            "cpu_variant_runtime": "Wariant backendu CPU (w czasie działania)",
+            "compilers": "Kompilatory",
+            "host_cores": "Rdzenie hosta (fizyczne / logiczne)",
+            "cgroup_limits": "Limity cgroup",
+            "memory_limit": "pamięć",
+            "virtualization": "Wirtualizacja",
+            "container": "kontener",
+            "none": "brak",
             "suggested_optimizations": "Sugerowane optymalizacje",
             "cmake_flags": "Flagi CMAKE",
             "required_dependencies": "Wymagane zależności",
@@ -170,6 +182,31 @@ class TranslationManager:
             "dependencies_label": "zależności",
             "more_flags": "... i {count} więcej",
             "more_deps": "... i {count} więcej",
+            "march_not_supported": "Kompilator nie obsługuje mikroarchitektury: {march}",
+            "invalid_build_name": "Nazwa buildu musi zaczynać się od 'build': {build_name}",
+            "compiler_not_found": "Nie znaleziono kompilatora: {compiler}",
+            "build_location_not_exists": "Katalog kompilacji nie istnieje: {location}",
+            "bench_model_required": "--compiler compare wymaga istniejącego modelu --bench-model",
+            "no_build_timings_found": "Nie znaleziono buildów z czasami kompilacji w {directory}/llama.cpp",
+            "no_build_timings": "Brak czasów kompilacji w {build_dir} (.ninja_log lub .compile_times)",
+            "report_jobs": "zadania",
+            "report_compile_jobs": "kompilacja plików: {count}",
+            "report_wall_time": "czas kompilacji",
+            "report_job_time": "łączny czas zadań",
+            "report_compile_link": "kompilacja {compile:.1f} s, linkowanie {link:.1f} s",
+            "report_parallelism": "równoległość",
+            "report_parallelism_limit": "limit równoległości (ścieżka krytyczna)",
+            "report_critical_path": "ścieżka krytyczna",
+            "critical_path_graph": "z grafu ninja",
+            "critical_path_schedule": "szacowana z harmonogramu",
+            "slowest_units": "Najwolniejsze pliki",
+            "slowest_targets": "Cele według czasu kompilacji",
+            "profile_comparison": "Porównanie profili",
+            "report_metric": "miara",
+            "report_seconds": "czas (s)",
+            "report_share": "udział",
+            "report_target": "cel",
+            "report_file": "plik",
             
             # Opisy typów sprzętu
             "hardware_rpi5_8gb": "Raspberry Pi 5 8GB - pełne optymalizacje ARM64 z OpenBLAS i RPC",
@@ -182,6 +219,7 @@ class TranslationManager:
             "hardware_x86_linux": "Linux x86_64 - pełne optymalizacje AVX2 z OpenBLAS",
             "hardware_x86_linux_old": "Linux x86_64 (starsze CPU) - optymalizacje AVX bez AVX2",
             "hardware_x86_linux_minimal": "Linux x86_64 (bardzo stare CPU) - minimalne optymalizacje bez AVX",
+            "hardware_portable_max": "Przenośny build - wszystkie warianty backendu CPU wybierane w czasie działania",
             "hardware_no_optimization": "Bez optymalizacji - kompatybilność maksymalna",
             "hardware_unknown": "Nieznany typ sprzętu"
         }
@@ -244,6 +282,18 @@ class TranslationManager:
             "logical_cores": "Logical cores",
             "avx_support": "AVX support",
             "avx2_support": "AVX2 support",
+            "microarchitecture": "Microarchitecture",
+            "microarch_flags": "Microarchitecture flags",
+            "microarch_unknown": "not recognized",
+            "cpu_variant_predicted": "CPU backend variant (predicted)",
+            "cpu_variant_runtime": "CPU backend variant (runtime)",
+            "compilers": "Compilers",
+            "host_cores": "Host cores (physical / logical)",
+            "cgroup_limits": "Cgroup limits",
+            "memory_limit": "memory",
+            "virtualization": "Virtualization",
+            "container": "container",
+            "none": "none",
             "suggested_optimizations": "Suggested optimizations",
             "cmake_flags": "CMAKE flags",
             "required_dependencies": "required dependencies",
@@ -311,6 +361,31 @@ class TranslationManager:
             "dependencies_label": "dependencies",
             "more_flags": "... and {count} more",
             "more_deps": "... and {count} more",
+            "march_not_supported": "Compiler does not support microarchitecture: {march}",
+            "invalid_build_name": "Build name must start with 'build': {build_name}",
+            "compiler_not_found": "Compiler not found: {compiler}",
+            "build_location_not_exists": "Build location does not exist: {location}",
+            "bench_model_required": "--compiler compare requires an existing --bench-model",
+            "no_build_timings_found": "No builds with compile timings found in {directory}/llama.cpp",
+            "no_build_timings": "No compile timings in {build_dir} (.ninja_log or .compile_times)",
+            "report_jobs": "jobs",
+            "report_compile_jobs": "compiled files: {count}",
+            "report_wall_time": "build time",
+            "report_job_time": "total job time",
+            "report_compile_link": "compile {compile:.1f} s, link {link:.1f} s",
+            "report_parallelism": "parallelism",
+            "report_parallelism_limit": "parallelism limit (critical path)",
+            "report_critical_path": "critical path",
+            "critical_path_graph": "from the ninja graph",
+            "critical_path_schedule": "estimated from the schedule",
+            "slowest_units": "Slowest files",
+            "slowest_targets": "Targets by compile time",
+            "profile_comparison": "Profile comparison",
+            "report_metric": "metric",
+            "report_seconds": "time (s)",
+            "report_share": "share",
+            "report_target": "target",
+            "report_file": "file",
             
             # Hardware type descriptions
             "hardware_rpi5_8gb": "Raspberry Pi 5 8GB - full ARM64 optimizations with OpenBLAS and RPC",
@@ -323,6 +398,7 @@ class TranslationManager:
             "hardware_x86_linux": "Linux x86_64 - full AVX2 optimizations with OpenBLAS",
             "hardware_x86_linux_old": "Linux x86_64 (older CPUs) - AVX optimizations without AVX2",
             "hardware_x86_linux_minimal": "Linux x86_64 (very old CPUs) - minimal optimizations without AVX",
+            "hardware_portable_max": "Portable build - all CPU backend variants selected at runtime",
             "hardware_no_optimization": "No optimizations - maximum compatibility",
             "hardware_unknown": "Unknown hardware type"
         }